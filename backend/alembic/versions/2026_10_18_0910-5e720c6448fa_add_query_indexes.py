@@ -0,0 +1,44 @@
+"""add_query_indexes
+
+Revision ID: 5e720c6448fa
+Revises: dba094943a0c
+Create Date: 2026-10-18 09:10:42.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e720c6448fa'
+down_revision: Union[str, Sequence[str], None] = 'dba094943a0c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_columns_position', 'columns', ['position'])
+    op.create_index(
+        'ix_cards_column_id_is_archived_position',
+        'cards',
+        ['column_id', 'is_archived', 'position'],
+    )
+    op.create_index(
+        'ix_cards_is_archived_archived_at',
+        'cards',
+        ['is_archived', sa.text('archived_at DESC')],
+    )
+    op.create_index('ix_cards_due_date', 'cards', ['due_date'])
+    op.create_index('ix_card_tags_tag_id', 'card_tags', ['tag_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_card_tags_tag_id', table_name='card_tags')
+    op.drop_index('ix_cards_due_date', table_name='cards')
+    op.drop_index('ix_cards_is_archived_archived_at', table_name='cards')
+    op.drop_index('ix_cards_column_id_is_archived_position', table_name='cards')
+    op.drop_index('ix_columns_position', table_name='columns')
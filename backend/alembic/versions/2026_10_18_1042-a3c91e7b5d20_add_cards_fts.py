@@ -0,0 +1,67 @@
+"""add_cards_fts
+
+Revision ID: a3c91e7b5d20
+Revises: 5e720c6448fa
+Create Date: 2026-10-18 10:42:17.604193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e7b5d20'
+down_revision: Union[str, Sequence[str], None] = '5e720c6448fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mirrors app/fts.py; kept inline so the migration never drifts with the app
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE cards_fts USING fts5(
+            title, description, content='cards', tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cards_fts_ai AFTER INSERT ON cards BEGIN
+            INSERT INTO cards_fts(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cards_fts_ad AFTER DELETE ON cards BEGIN
+            INSERT INTO cards_fts(cards_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cards_fts_au AFTER UPDATE OF title, description
+        ON cards BEGIN
+            INSERT INTO cards_fts(cards_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+            INSERT INTO cards_fts(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+        """
+    )
+
+    # Backfill the index from existing cards
+    op.execute("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS cards_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS cards_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS cards_fts_ai')
+    op.execute('DROP TABLE IF EXISTS cards_fts')
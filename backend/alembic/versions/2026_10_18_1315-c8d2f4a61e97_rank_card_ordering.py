@@ -0,0 +1,100 @@
+"""rank_card_ordering
+
+Revision ID: c8d2f4a61e97
+Revises: a3c91e7b5d20
+Create Date: 2026-10-18 13:15:06.271830
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f4a61e97'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e7b5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+
+def _sequential_keys(count):
+    """Ascending rank keys a0, a1, ..., az, b00, ... (see app/ranking.py)."""
+    key = 'a0'
+    for _ in range(count):
+        yield key
+        head, digits = key[0], list(key[1:])
+        for i in reversed(range(len(digits))):
+            d = DIGITS.index(digits[i]) + 1
+            if d < len(DIGITS):
+                digits[i] = DIGITS[d]
+                break
+            digits[i] = DIGITS[0]
+        else:
+            head = chr(ord(head) + 1)
+            digits.append(DIGITS[0])
+        key = head + ''.join(digits)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'cards',
+        sa.Column('rank', sa.String(length=255), nullable=False, server_default='a0'),
+    )
+
+    # Number each column's cards in their current order, archived ones included
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            'SELECT id, column_id FROM cards '
+            'ORDER BY column_id, is_archived, position, created_at, id'
+        )
+    ).all()
+    updates = []
+    for _, group in groupby(rows, key=lambda row: row.column_id):
+        ids = [row.id for row in group]
+        updates.extend(
+            {'id': card_id, 'rank': key}
+            for card_id, key in zip(ids, _sequential_keys(len(ids)))
+        )
+    if updates:
+        conn.execute(
+            sa.text('UPDATE cards SET rank = :rank WHERE id = :id'), updates
+        )
+
+    op.drop_index('ix_cards_column_id_is_archived_position', table_name='cards')
+    op.execute('ALTER TABLE cards DROP COLUMN position')
+    op.create_index(
+        'ix_cards_column_id_is_archived_rank',
+        'cards',
+        ['column_id', 'is_archived', 'rank'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'cards',
+        sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        """
+        UPDATE cards SET position = (
+            SELECT count(*) FROM cards AS other
+            WHERE other.column_id = cards.column_id
+              AND other.is_archived = cards.is_archived
+              AND other.rank < cards.rank
+        )
+        """
+    )
+    op.drop_index('ix_cards_column_id_is_archived_rank', table_name='cards')
+    op.execute('ALTER TABLE cards DROP COLUMN rank')
+    op.create_index(
+        'ix_cards_column_id_is_archived_position',
+        'cards',
+        ['column_id', 'is_archived', 'position'],
+    )
@@ -0,0 +1,34 @@
+"""add_board_state
+
+Revision ID: 4b7e0d93a2f6
+Revises: c8d2f4a61e97
+Create Date: 2026-10-18 15:20:33.918452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e0d93a2f6'
+down_revision: Union[str, Sequence[str], None] = 'c8d2f4a61e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    board_state = op.create_table(
+        'board_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(board_state, [{'id': 1, 'version': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('board_state')
@@ -0,0 +1,93 @@
+"""add_changes_log
+
+Revision ID: 9d1f6b2c8e43
+Revises: 4b7e0d93a2f6
+Create Date: 2026-10-18 16:10:52.271840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d1f6b2c8e43'
+down_revision: Union[str, Sequence[str], None] = '4b7e0d93a2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENTITIES = {'card': 'cards', 'column': 'columns', 'tag': 'tags'}
+
+
+def record(entity: str, entity_id: str, deleted: int) -> str:
+    return f"""
+        INSERT INTO changes (entity, entity_id, deleted, seq)
+        VALUES ('{entity}', {entity_id}, {deleted},
+                (SELECT coalesce(max(seq), 0) + 1 FROM changes))
+        ON CONFLICT (entity, entity_id)
+        DO UPDATE SET deleted = excluded.deleted, seq = excluded.seq;
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'changes',
+        sa.Column('entity', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('entity', 'entity_id')
+    )
+    op.create_index('ix_changes_seq', 'changes', ['seq'], unique=True)
+
+    # Existing entities count as changed once, so a first sync returns them all
+    op.execute(
+        """
+        INSERT INTO changes (entity, entity_id, deleted, seq)
+        SELECT entity, id, 0, row_number() OVER (ORDER BY entity, id) FROM (
+            SELECT 'column' AS entity, id FROM columns
+            UNION ALL SELECT 'tag', id FROM tags
+            UNION ALL SELECT 'card', id FROM cards
+        )
+        """
+    )
+
+    # Mirrors app/changes.py; kept inline so the migration never drifts with the app
+    for entity, name in ENTITIES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {name}_changes_ai AFTER INSERT ON {name}
+            BEGIN {record(entity, 'new.id', 0)} END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {name}_changes_au AFTER UPDATE ON {name}
+            BEGIN {record(entity, 'new.id', 0)} END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {name}_changes_ad AFTER DELETE ON {name}
+            BEGIN {record(entity, 'old.id', 1)} END
+            """
+        )
+    for suffix, event, row in (('ai', 'INSERT', 'new'), ('ad', 'DELETE', 'old')):
+        op.execute(
+            f"""
+            CREATE TRIGGER card_tags_changes_{suffix} AFTER {event} ON card_tags
+            WHEN EXISTS (SELECT 1 FROM cards WHERE id = {row}.card_id)
+            BEGIN {record('card', f'{row}.card_id', 0)} END
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in ('card_tags', *ENTITIES.values()):
+        for suffix in ('ai', 'au', 'ad'):
+            op.execute(f'DROP TRIGGER IF EXISTS {name}_changes_{suffix}')
+    op.drop_index('ix_changes_seq', table_name='changes')
+    op.drop_table('changes')
@@ -0,0 +1,38 @@
+"""archive_cursor_index
+
+Revision ID: e2a84c57f1b9
+Revises: 9d1f6b2c8e43
+Create Date: 2026-10-18 17:05:41.603127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a84c57f1b9'
+down_revision: Union[str, Sequence[str], None] = '9d1f6b2c8e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_cards_is_archived_archived_at', table_name='cards')
+    op.create_index(
+        'ix_cards_is_archived_archived_at_id',
+        'cards',
+        ['is_archived', sa.text('archived_at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cards_is_archived_archived_at_id', table_name='cards')
+    op.create_index(
+        'ix_cards_is_archived_archived_at',
+        'cards',
+        ['is_archived', sa.text('archived_at DESC')],
+    )
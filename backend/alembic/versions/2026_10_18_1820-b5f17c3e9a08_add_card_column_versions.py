@@ -0,0 +1,36 @@
+"""add_card_column_versions
+
+Revision ID: b5f17c3e9a08
+Revises: e2a84c57f1b9
+Create Date: 2026-10-18 18:20:12.507316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f17c3e9a08'
+down_revision: Union[str, Sequence[str], None] = 'e2a84c57f1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'cards',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+    op.add_column(
+        'columns',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('columns', 'version')
+    op.drop_column('cards', 'version')
@@ -0,0 +1,55 @@
+"""default_board_settings
+
+Revision ID: f3a6d9e1c274
+Revises: b5f17c3e9a08
+Create Date: 2026-10-18 19:30:08.214736
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d9e1c274'
+down_revision: Union[str, Sequence[str], None] = 'b5f17c3e9a08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /board-settings used to create this row on first use
+    board_settings = sa.table(
+        'board_settings',
+        sa.column('id', sa.String),
+        sa.column('title', sa.String),
+        sa.column('subtitle', sa.String),
+        sa.column('created_at', sa.DateTime),
+        sa.column('updated_at', sa.DateTime),
+    )
+    bind = op.get_bind()
+    if bind.execute(sa.select(sa.func.count()).select_from(board_settings)).scalar():
+        return
+    now = datetime.now(timezone.utc)
+    op.bulk_insert(
+        board_settings,
+        [
+            {
+                'id': str(uuid.uuid4()),
+                'title': 'Development Pipeline',
+                'subtitle': "Manage your team's current tasks and sprint progress.",
+                'created_at': now,
+                'updated_at': now,
+            }
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The row is indistinguishable from one created by the app; keep it
+    pass
@@ -0,0 +1,32 @@
+"""board_state_instance
+
+Revision ID: 7c2e5a9d0b13
+Revises: f3a6d9e1c274
+Create Date: 2026-10-18 20:40:52.407113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d0b13'
+down_revision: Union[str, Sequence[str], None] = 'f3a6d9e1c274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'board_state',
+        sa.Column('instance', sa.String(length=32), nullable=False, server_default=''),
+    )
+    op.execute("UPDATE board_state SET instance = lower(hex(randomblob(16)))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('board_state', 'instance')
@@ -0,0 +1,96 @@
+"""column_card_counts
+
+Revision ID: 1e8b4f6a9c27
+Revises: 7c2e5a9d0b13
+Create Date: 2026-10-18 21:15:27.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e8b4f6a9c27'
+down_revision: Union[str, Sequence[str], None] = '7c2e5a9d0b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECORD_COLUMN = """
+    INSERT INTO changes (entity, entity_id, deleted, seq)
+    VALUES ('column', new.id, 0, (SELECT coalesce(max(seq), 0) + 1 FROM changes))
+    ON CONFLICT (entity, entity_id)
+    DO UPDATE SET deleted = excluded.deleted, seq = excluded.seq;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'columns',
+        sa.Column('card_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        """
+        UPDATE columns SET card_count = (
+            SELECT count(*) FROM cards
+            WHERE cards.column_id = columns.id AND cards.is_archived = 0
+        )
+        """
+    )
+
+    # Mirrors app/card_counts.py; kept inline so the migration never drifts with the app
+    op.execute(
+        """
+        CREATE TRIGGER cards_count_ai AFTER INSERT ON cards
+        WHEN new.is_archived = 0 BEGIN
+            UPDATE columns SET card_count = card_count + 1 WHERE id = new.column_id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cards_count_ad AFTER DELETE ON cards
+        WHEN old.is_archived = 0 BEGIN
+            UPDATE columns SET card_count = card_count - 1 WHERE id = old.column_id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cards_count_au AFTER UPDATE OF column_id, is_archived
+        ON cards
+        WHEN old.column_id IS NOT new.column_id OR old.is_archived IS NOT new.is_archived
+        BEGIN
+            UPDATE columns SET card_count = card_count - 1
+            WHERE id = old.column_id AND old.is_archived = 0;
+            UPDATE columns SET card_count = card_count + 1
+            WHERE id = new.column_id AND new.is_archived = 0;
+        END
+        """
+    )
+
+    # Count updates are not changes to the column (see app/changes.py)
+    op.execute("DROP TRIGGER columns_changes_au")
+    op.execute(
+        f"""
+        CREATE TRIGGER columns_changes_au AFTER UPDATE ON columns
+        WHEN old.card_count IS new.card_count
+        BEGIN {RECORD_COLUMN} END
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER columns_changes_au")
+    op.execute(
+        f"""
+        CREATE TRIGGER columns_changes_au AFTER UPDATE ON columns
+        BEGIN {RECORD_COLUMN} END
+        """
+    )
+    for suffix in ('ai', 'au', 'ad'):
+        op.execute(f"DROP TRIGGER cards_count_{suffix}")
+    op.drop_column('columns', 'card_count')
@@ -0,0 +1,163 @@
+"""In-process cache of serialized board reads.
+
+``GET /api/columns`` answers with the same bytes until a write commits, so
+the encoded body is cached per query, together with the board version it was
+built at. Every write commits through a Session, and a commit that bumped the
+board version invalidates the cache (see ``_committed``), so routes do not
+have to remember to. Entries are also only served for the version they were
+built at, which keeps writes from other workers from being served stale.
+
+Invalidations go through a backend: ``LocalInvalidation`` reaches this
+process only. A deployment with several workers can install a backend that
+relays them over a shared channel (Redis pub/sub, Postgres NOTIFY, ...) so
+every worker frees its entries as soon as anyone writes.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Protocol
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.versioning import VERSION
+
+
+class InvalidationBackend(Protocol):
+    def publish(self) -> None:
+        """Tell every subscribed cache, in any process, that the board changed."""
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` on every invalidation published."""
+
+
+class LocalInvalidation:
+    """Invalidation within this process, for single-worker servers and tests."""
+
+    def __init__(self):
+        self.callbacks: list[Callable[[], None]] = []
+
+    def publish(self) -> None:
+        for callback in self.callbacks:
+            callback()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+
+@dataclass
+class Entry:
+    version: str
+    body: bytes
+    expires: float
+
+
+@dataclass
+class Stats:
+    hits: int = 0
+    misses: int = 0
+    rebuilds: int = 0
+    # Total time spent building the bodies that were cached
+    rebuild_seconds: float = 0.0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            **asdict(self),
+            "hit_rate": self.hits / lookups if lookups else None,
+            "rebuild_seconds_avg": (
+                self.rebuild_seconds / self.rebuilds if self.rebuilds else None
+            ),
+        }
+
+
+class BoardCache:
+    """LRU of encoded bodies, bounded by entries, bytes and age."""
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 60.0,
+        backend: InvalidationBackend | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: OrderedDict[str, Entry] = OrderedDict()
+        self.size = 0
+        self.stats = Stats()
+        self.use_backend(backend or LocalInvalidation())
+
+    def use_backend(self, backend: InvalidationBackend) -> None:
+        self.backend = backend
+        backend.subscribe(self.clear)
+
+    def get(self, key: str, version: str) -> bytes | None:
+        entry = self.entries.get(key)
+        if entry and (entry.version != version or entry.expires <= time.monotonic()):
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.body
+
+    def put(self, key: str, version: str, body: bytes) -> None:
+        if key in self.entries:
+            self._remove(key)
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        self.entries[key] = Entry(version, body, time.monotonic() + self.ttl)
+        self.size += len(body)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+
+    async def get_or_build(
+        self, key: str, version: str, build: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        body = self.get(key, version)
+        if body is None:
+            start = time.perf_counter()
+            body = await build()
+            self.stats.rebuilds += 1
+            self.stats.rebuild_seconds += time.perf_counter() - start
+            self.put(key, version, body)
+        return body
+
+    def invalidate(self) -> None:
+        """Drop the cached bodies here and, through the backend, everywhere."""
+        self.backend.publish()
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+        self.stats.invalidations += 1
+
+    def _remove(self, key: str) -> None:
+        self.size -= len(self.entries.pop(key).body)
+
+    def metrics(self) -> dict:
+        return {
+            **self.stats.as_dict(),
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+
+cache = BoardCache(
+    settings.board_cache_size, settings.board_cache_max_bytes, settings.board_cache_ttl
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    # Set by app.versioning when the transaction wrote to the board
+    if session.info.pop(VERSION, None) is not None:
+        cache.invalidate()
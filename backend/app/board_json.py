@@ -0,0 +1,281 @@
+"""Fast JSON for board reads.
+
+Validating every column, card and tag of a large board through ``ColumnOut``,
+``CardOut`` and ``TagOut`` dominates the cost of ``GET /api/columns``. This
+module reads the same data with Core ``select()`` into plain dicts and
+encodes them directly, with orjson when it is installed. The bytes are the
+same as the Pydantic path's; ``tests/test_board_json.py`` holds it to that.
+"""
+
+import json
+from datetime import datetime, timezone
+
+from fastapi import Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cursors
+from app.models import Card, CardTag, Column, Tag
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Output fields, in the order of the schemas in app/schemas.py
+COLUMN_FIELDS = (
+    Column.id,
+    Column.name,
+    Column.position,
+    Column.is_done_column,
+    Column.created_at,
+    Column.updated_at,
+    Column.version,
+)
+CARD_FIELDS = (
+    Card.id,
+    Card.column_id,
+    Card.title,
+    Card.description,
+    Card.image_url,
+    None,  # position
+    Card.is_archived,
+    Card.archived_at,
+    Card.due_date,
+    Card.created_at,
+    Card.updated_at,
+    Card.version,
+)
+TAG_FIELDS = (Tag.id, Tag.name, Tag.color, Tag.bg_color, Tag.fg_color, Tag.created_at)
+
+
+def _names(fields) -> tuple[str, ...]:
+    return tuple("position" if f is None else f.key for f in fields)
+
+
+COLUMN_NAMES = _names(COLUMN_FIELDS)
+CARD_NAMES = _names(CARD_FIELDS)
+TAG_NAMES = _names(TAG_FIELDS)
+
+# Card keys of each format: full cards embed their tags, compact cards refer
+# to the board's tag table by id
+CARD_KEYS = CARD_NAMES + ("tags",)
+COMPACT_CARD_KEYS = CARD_NAMES + ("tag_ids",)
+
+
+def card_keys(compact: bool = False, fields: set[str] | None = None) -> tuple:
+    """Keys of each card, in schema order; ``fields`` picks some (``id`` always).
+
+    Raises ValueError on names the format does not have.
+    """
+    keys = COMPACT_CARD_KEYS if compact else CARD_KEYS
+    if fields is None:
+        return keys
+    unknown = fields.difference(keys)
+    if unknown:
+        raise ValueError(f"Unknown card fields: {', '.join(sorted(unknown))}")
+    return tuple(key for key in keys if key == "id" or key in fields)
+
+
+async def tags(db: AsyncSession) -> list[dict]:
+    """All tags by name, as ``list[TagOut]`` dicts."""
+    result = await db.execute(select(*TAG_FIELDS).order_by(Tag.name))
+    return [dict(zip(TAG_NAMES, row)) for row in result]
+
+
+ACTIVE = Card.is_archived == False  # noqa: E712
+
+
+def encode_cursor(after: dict) -> str:
+    """Opaque cursor for the cards following ``{"rank", "id", "position"}``."""
+    return cursors.encode(after)
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Inverse of ``encode_cursor``; raises ValueError on anything else."""
+    return cursors.decode(cursor, rank=str, id=str, position=int)
+
+
+def _card_select(keys: tuple) -> tuple[Select, list[str]]:
+    """Active cards with the table columns ``keys`` need, after their column
+    id and rank."""
+    fields = [f for f in CARD_FIELDS if f is not None and f.key in keys]
+    stmt = select(Card.column_id, Card.rank, *fields).where(ACTIVE)
+    return stmt, [f.key for f in fields]
+
+
+def _add_cards(result, names, keys, by_column, start=0) -> tuple[dict, dict]:
+    """Append rows in rank order to their column's list, numbering them from
+    ``start``; returns the cards by id and the cursor after each column's last."""
+    cards, after = {}, {}
+    for column_id, rank, *values in result:
+        cards_of_column = by_column[column_id]
+        position = start + len(cards_of_column)
+        row = dict(zip(names, values), position=position)
+        # Tag lists are filled by _add_tags
+        card = {key: row[key] if key in row else [] for key in keys}
+        cards_of_column.append(card)
+        cards[card["id"]] = card
+        after[column_id] = {"rank": rank, "id": card["id"], "position": position + 1}
+    return cards, after
+
+
+async def _add_tags(db: AsyncSession, cards: dict, keys: tuple, *where) -> None:
+    """Fill the tags (or tag ids) of ``cards``, found through ``where``."""
+    if not cards or not ("tags" in keys or "tag_ids" in keys):
+        return
+    tag_fields = TAG_FIELDS if "tags" in keys else (Tag.id,)
+    result = await db.execute(
+        select(CardTag.card_id, *tag_fields)
+        .join(Tag, Tag.id == CardTag.tag_id)
+        .join(Card, Card.id == CardTag.card_id)
+        .where(*where)
+        .order_by(Tag.name)
+    )
+    if "tags" in keys:
+        for card_id, *values in result:
+            cards[card_id]["tags"].append(dict(zip(TAG_NAMES, values)))
+    else:
+        for card_id, tag_id in result:
+            cards[card_id]["tag_ids"].append(tag_id)
+
+
+async def board(
+    db: AsyncSession,
+    compact: bool = False,
+    fields: set[str] | None = None,
+    limit: int | None = None,
+) -> list[dict] | dict:
+    """Columns with their active cards and tags, as ``list[ColumnOut]`` dicts.
+
+    ``compact`` returns ``{"tags": [...], "columns": [...]}`` instead, with
+    ``tag_ids`` on cards; ``fields`` limits the keys of cards (see
+    ``card_keys``). Only the table columns those keys need are read.
+
+    With ``limit``, columns hold their first ``limit`` cards only, plus their
+    ``card_count`` and the ``next_cursor`` for ``column_cards``; each column
+    is then read with its own bounded query.
+    """
+    keys = card_keys(compact, fields)
+    columns = [
+        dict(zip(COLUMN_NAMES, row))
+        for row in await db.execute(select(*COLUMN_FIELDS).order_by(Column.position))
+    ]
+    for column in columns:
+        column["cards"] = []
+    by_column = {column["id"]: column["cards"] for column in columns}
+    stmt, names = _card_select(keys)
+
+    if limit is None:
+        result = await db.execute(
+            stmt.where(Card.column_id.in_(by_column)).order_by(
+                Card.column_id, Card.rank, Card.id
+            )
+        )
+        cards, _ = _add_cards(result, names, keys, by_column)
+        await _add_tags(db, cards, keys, ACTIVE, Card.column_id.in_(by_column))
+    else:
+        counts = dict(
+            (
+                await db.execute(
+                    select(Card.column_id, func.count())
+                    .where(ACTIVE, Card.column_id.in_(by_column))
+                    .group_by(Card.column_id)
+                )
+            ).all()
+        )
+        cards = {}
+        for column in columns:
+            count = counts.get(column["id"], 0)
+            after = {}
+            if count:
+                result = await db.execute(
+                    stmt.where(Card.column_id == column["id"])
+                    .order_by(Card.rank, Card.id)
+                    .limit(limit)
+                )
+                page, after = _add_cards(result, names, keys, by_column)
+                cards.update(page)
+            column["card_count"] = count
+            column["next_cursor"] = None
+            if count > limit and column["id"] in after:
+                column["next_cursor"] = encode_cursor(after[column["id"]])
+        await _add_tags(db, cards, keys, CardTag.card_id.in_(cards))
+
+    if compact:
+        return {"tags": await tags(db), "columns": columns}
+    return columns
+
+
+async def column_cards(
+    db: AsyncSession,
+    column_id: str,
+    compact: bool = False,
+    fields: set[str] | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> dict:
+    """A page of a column's active cards, as a ``ColumnCardsPage`` dict.
+
+    ``cursor`` is a ``next_cursor`` from ``board`` or from the previous page;
+    cards are found by seeking on ``(rank, id)``, so every page costs the
+    same. Their positions continue from the cursor's.
+    """
+    keys = card_keys(compact, fields)
+    stmt, names = _card_select(keys)
+    stmt = stmt.where(Card.column_id == column_id)
+    start = 0
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Card.rank, Card.id) > (after["rank"], after["id"]))
+        start = after["position"]
+    result = await db.execute(stmt.order_by(Card.rank, Card.id).limit(limit))
+    items = []
+    cards, after = _add_cards(result, names, keys, {column_id: items}, start)
+    await _add_tags(db, cards, keys, CardTag.card_id.in_(cards))
+
+    total = (
+        await db.execute(
+            select(func.count()).where(ACTIVE, Card.column_id == column_id)
+        )
+    ).scalar()
+    next_cursor = None
+    if after and after[column_id]["position"] < total:
+        next_cursor = encode_cursor(after[column_id])
+    return {"items": items, "total": total, "next_cursor": next_cursor}
+
+
+def isoformat(value: datetime) -> str:
+    """A datetime the way Pydantic's JSON mode writes it (UTC as ``Z``)."""
+    text = value.isoformat()
+    if value.utcoffset() == timezone.utc.utcoffset(None):
+        text = text.removesuffix("+00:00") + "Z"
+    return text
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return isoformat(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    """Encode like Pydantic's JSON mode: compact, UTF-8, ISO datetimes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def json_response(content, response: Response | None = None) -> Response:
+    """Encoded ``content``, with the headers dependencies set on ``response``."""
+    return raw_response(dumps(content), response)
+
+
+def raw_response(body: bytes, response: Response | None = None) -> Response:
+    """Already encoded JSON, with the headers dependencies set on ``response``."""
+    raw = Response(body, media_type="application/json")
+    if response is not None:
+        raw.headers.update(response.headers)
+    return raw
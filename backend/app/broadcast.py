@@ -0,0 +1,94 @@
+"""In-process fan-out of board change events to connected clients.
+
+Routers publish an event after each successful commit; every subscriber
+(one per open ``/api/events`` stream) gets it on its own queue. The most
+recent events are kept in a bounded ring buffer so a client that reconnects
+with ``Last-Event-ID`` receives what it missed instead of refetching the
+board, as long as the gap still fits in the buffer.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: str  # JSON
+
+    def encode(self) -> str:
+        """Server-sent event frame."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+
+class Subscription:
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(size)
+        self.lagged = False
+
+    def put(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: end the stream, the client resumes from
+            # the last event it received
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class Broadcaster:
+    def __init__(self, history_size: int, queue_size: int):
+        self.history: deque[Event] = deque(maxlen=history_size)
+        self.subscribers: set[Subscription] = set()
+        self.queue_size = queue_size
+        # Ids restart from the clock so ids from before a restart are never
+        # mistaken for new ones
+        self.last_id = time.time_ns() // 1_000_000
+
+    def publish(self, event_type: str, data: BaseModel | dict[str, Any]) -> Event:
+        if isinstance(data, BaseModel):
+            payload = data.model_dump_json()
+        else:
+            payload = json.dumps(data, separators=(",", ":"), default=str)
+        self.last_id += 1
+        event = Event(self.last_id, event_type, payload)
+        self.history.append(event)
+        for subscription in self.subscribers:
+            subscription.put(event)
+        return event
+
+    def since(self, last_event_id: int) -> list[Event] | None:
+        """Buffered events after ``last_event_id``, or None if some were lost."""
+        if last_event_id >= self.last_id:
+            return [] if last_event_id == self.last_id else None
+        if not self.history or self.history[0].id > last_event_id + 1:
+            return None
+        return [event for event in self.history if event.id > last_event_id]
+
+    @contextmanager
+    def subscribe(self):
+        subscription = Subscription(self.queue_size)
+        self.subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscribers.discard(subscription)
+
+
+broadcaster = Broadcaster(settings.event_history_size, settings.event_queue_size)
+
+
+def publish(event_type: str, data: BaseModel | dict[str, Any]) -> Event:
+    return broadcaster.publish(event_type, data)
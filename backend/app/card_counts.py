@@ -0,0 +1,52 @@
+"""Number of active cards in each column, kept in ``columns.card_count``.
+
+An appended card's position is the number of active cards before it, and
+counting them costs a pass over the column. Triggers on ``cards`` keep the
+count instead, on inserts, deletes and updates that move or archive a card,
+including set-based ones, so appends read one row however long the column.
+"""
+
+from sqlalchemy import DDL, MetaData, event
+
+# Triggers keeping the counts; the column_card_counts migration mirrors them.
+CREATE_STATEMENTS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_count_ai AFTER INSERT ON cards
+    WHEN new.is_archived = 0 BEGIN
+        UPDATE columns SET card_count = card_count + 1 WHERE id = new.column_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_count_ad AFTER DELETE ON cards
+    WHEN old.is_archived = 0 BEGIN
+        UPDATE columns SET card_count = card_count - 1 WHERE id = old.column_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_count_au AFTER UPDATE OF column_id, is_archived
+    ON cards
+    WHEN old.column_id IS NOT new.column_id OR old.is_archived IS NOT new.is_archived
+    BEGIN
+        UPDATE columns SET card_count = card_count - 1
+        WHERE id = old.column_id AND old.is_archived = 0;
+        UPDATE columns SET card_count = card_count + 1
+        WHERE id = new.column_id AND new.is_archived = 0;
+    END
+    """,
+)
+
+# Counts every column again, for loads that ran with the triggers dropped
+RECOUNT = """
+    UPDATE columns SET card_count = (
+        SELECT count(*) FROM cards
+        WHERE cards.column_id = columns.id AND cards.is_archived = 0
+    )
+"""
+
+
+def install(metadata: MetaData) -> None:
+    """Create the triggers once both tables exist (SQLite only)."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(
+            metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
@@ -0,0 +1,160 @@
+"""Card operations shared by the card routes and ``POST /api/batch``.
+
+Each operation validates its input, writes to the session and flushes, but
+never commits: the caller decides whether it is one transaction on its own
+or part of a larger one. Errors are raised as HTTPException before anything
+is written for that operation.
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import concurrency, ranking
+from app.concurrency import Expected
+from app.database import begin_write
+from app.models import Card, CardTag, Column
+from app.schemas import CardCreate, CardMove, CardUpdate
+
+
+async def _get(db: AsyncSession, card_id: str) -> Card:
+    result = await db.execute(select(Card).where(Card.id == card_id))
+    card = result.scalar_one_or_none()
+    if not card:
+        raise HTTPException(404, "Card not found")
+    return card
+
+
+async def create_card(db: AsyncSession, column_id: str, data: CardCreate) -> Card:
+    """Append a new card to a column; sets its ``position``."""
+    result = await db.execute(select(Column.id).where(Column.id == column_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(404, "Column not found")
+
+    rank, position = await ranking.append_slot(db, column_id)
+
+    card = Card(
+        column_id=column_id,
+        title=data.title,
+        description=data.description,
+        image_url=data.image_url,
+        due_date=data.due_date,
+        rank=rank,
+    )
+    db.add(card)
+    await db.flush()
+
+    if data.tag_ids:
+        for tag_id in data.tag_ids:
+            db.add(CardTag(card_id=card.id, tag_id=tag_id))
+    card.position = position
+    return card
+
+
+async def update_card(
+    db: AsyncSession, card_id: str, data: CardUpdate, expected: Expected | None = None
+) -> None:
+    """Write the given fields in one conditional UPDATE (see app.concurrency)."""
+    values = data.model_dump(
+        include={"title", "description", "image_url", "due_date"}, exclude_none=True
+    )
+    values["updated_at"] = datetime.now(timezone.utc)
+    await concurrency.update_versioned(db, Card, card_id, values, expected)
+
+    if data.tag_ids is not None:
+        await db.execute(CardTag.__table__.delete().where(CardTag.card_id == card_id))
+        for tag_id in data.tag_ids:
+            db.add(CardTag(card_id=card_id, tag_id=tag_id))
+    await db.flush()
+
+
+async def move_card(
+    db: AsyncSession, data: CardMove, expected: Expected | None = None
+) -> str:
+    """Give the card a rank at its new place; only the moved card is written.
+
+    Returns the new rank; callers schedule a rebalance when
+    ``ranking.needs_rebalance(rank)``.
+    """
+    try:
+        rank = await ranking.insert_rank(
+            db, data.target_column_id, data.position, data.card_id
+        )
+    except ValueError:
+        # Neighbours share a rank, as unlocked appends could once leave them:
+        # renumber, then retry
+        await ranking.rebalance(db, data.target_column_id)
+        rank = await ranking.insert_rank(
+            db, data.target_column_id, data.position, data.card_id
+        )
+
+    values = {
+        "column_id": data.target_column_id,
+        "rank": rank,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    await concurrency.update_versioned(db, Card, data.card_id, values, expected)
+    return rank
+
+
+async def archive_card(db: AsyncSession, card_id: str) -> None:
+    """Archive in one UPDATE that bumps the version in SQL (see app.concurrency)."""
+    values = {"is_archived": True, "archived_at": datetime.now(timezone.utc)}
+    await concurrency.update_versioned(db, Card, card_id, values)
+
+
+async def restore_card(db: AsyncSession, card_id: str) -> int:
+    """Put an archived card back at the end of its column; returns its position.
+
+    Cards whose column is gone go to the first column. The card is read under
+    the write lock and written in one UPDATE that bumps the version in SQL,
+    so no write in between is lost or shares its version.
+    """
+    await begin_write(db)
+    result = await db.execute(select(Card.column_id).where(Card.id == card_id))
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(404, "Card not found")
+    column_id = row.column_id
+
+    if column_id:
+        col_result = await db.execute(select(Column.id).where(Column.id == column_id))
+        column_id = col_result.scalar_one_or_none()
+
+    if not column_id:
+        first_col = await db.execute(
+            select(Column.id).order_by(Column.position).limit(1)
+        )
+        column_id = first_col.scalar_one_or_none()
+
+    values = {"column_id": column_id, "is_archived": False, "archived_at": None}
+    position = 0
+    if column_id:
+        values["rank"], position = await ranking.append_slot(db, column_id)
+    await concurrency.update_versioned(db, Card, card_id, values)
+    return position
+
+
+async def delete_card(db: AsyncSession, card_id: str) -> None:
+    card = await _get(db, card_id)
+    await db.delete(card)
+    await db.flush()
+
+
+async def load_cards(db: AsyncSession, card_ids: list[str]) -> list[Card]:
+    """Current state of cards, with tags, in the given order; skips deleted ones.
+
+    Positions are left to the caller, who may know them already.
+    """
+    result = await db.execute(
+        select(Card)
+        .where(Card.id.in_(card_ids))
+        .options(selectinload(Card.tags))
+        # Cards already in the session may hold tags from before the write
+        .execution_options(populate_existing=True)
+    )
+    cards = {card.id: card for card in result.scalars()}
+    return [cards[card_id] for card_id in card_ids if card_id in cards]
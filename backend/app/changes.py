@@ -0,0 +1,78 @@
+"""Change log backing incremental sync (``GET /api/changes``).
+
+Triggers on ``cards``, ``columns``, ``tags`` and ``card_tags`` record every
+write in the ``changes`` table, including set-based updates and deletes that
+never load ORM objects. Each entity has at most one row there, stamped with a
+sequence number that grows with every write: a client that has seen
+everything up to some sequence number only needs the rows above it. Deleted
+entities keep their row as a tombstone so clients learn about deletions too.
+
+SQLite runs one writer at a time, so sequence numbers become visible in order
+and a reader never skips a write that commits later with a smaller number.
+"""
+
+from sqlalchemy import DDL, MetaData, event
+
+from app import cursors
+
+# entity name -> table name
+ENTITIES = {"card": "cards", "column": "columns", "tag": "tags"}
+# Updates logged only when this holds: the count triggers of
+# app/card_counts.py write columns.card_count and nothing else
+LOGGED_UPDATES = {"columns": "old.card_count IS new.card_count"}
+
+
+def _record(entity: str, entity_id: str, deleted: int) -> str:
+    return f"""
+        INSERT INTO changes (entity, entity_id, deleted, seq)
+        VALUES ('{entity}', {entity_id}, {deleted},
+                (SELECT coalesce(max(seq), 0) + 1 FROM changes))
+        ON CONFLICT (entity, entity_id)
+        DO UPDATE SET deleted = excluded.deleted, seq = excluded.seq;
+    """
+
+
+def _statements():
+    for entity, name in ENTITIES.items():
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_changes_ai AFTER INSERT ON {name}
+        BEGIN {_record(entity, "new.id", 0)} END
+        """
+        when = f"WHEN {LOGGED_UPDATES[name]}" if name in LOGGED_UPDATES else ""
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_changes_au AFTER UPDATE ON {name}
+        {when} BEGIN {_record(entity, "new.id", 0)} END
+        """
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_changes_ad AFTER DELETE ON {name}
+        BEGIN {_record(entity, "old.id", 1)} END
+        """
+    # Tagging changes the card, unless the card itself is being deleted
+    for suffix, event_name, row in (("ai", "INSERT", "new"), ("ad", "DELETE", "old")):
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS card_tags_changes_{suffix}
+        AFTER {event_name} ON card_tags
+        WHEN EXISTS (SELECT 1 FROM cards WHERE id = {row}.card_id)
+        BEGIN {_record("card", f"{row}.card_id", 0)} END
+        """
+
+
+# Triggers feeding the log; the add_changes migration mirrors them.
+CREATE_STATEMENTS = tuple(_statements())
+
+
+def install(metadata: MetaData) -> None:
+    """Create the triggers once all the tables they watch exist (SQLite only)."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(
+            metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
+
+
+def encode_cursor(seq: int) -> str:
+    return cursors.encode({"seq": seq})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Sequence number in a cursor; raises ValueError if it is not ours."""
+    return cursors.decode(cursor, seq=int)["seq"]
@@ -0,0 +1,78 @@
+"""Optimistic concurrency for cards and columns.
+
+Cards and columns carry a ``version`` that every write to them bumps. A
+client that sends back the version it last read, in ``If-Match`` or as the
+``version`` field of the request body, has its write applied only if nobody
+wrote in between. The check is a condition of the UPDATE itself, so it costs
+no extra query and takes no lock. A stale version is answered with
+``412 Precondition Failed`` when it came in ``If-Match``, ``409 Conflict``
+when it came in the body, and the current version in ``ETag``.
+"""
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base
+
+
+@dataclass(frozen=True)
+class Expected:
+    version: int
+    # Status for a stale version
+    status: int = 409
+
+
+def if_match(request: Request) -> int | None:
+    """Dependency: the version in ``If-Match``, if any."""
+    header = request.headers.get("if-match", "").strip()
+    if not header or header == "*":
+        return None
+    try:
+        return int(header.strip('"'))
+    except ValueError:
+        raise HTTPException(400, "Invalid If-Match")
+
+
+def expected(body_version: int | None, header_version: int | None) -> Expected | None:
+    if header_version is not None:
+        return Expected(header_version, 412)
+    if body_version is not None:
+        return Expected(body_version)
+    return None
+
+
+async def update_versioned(
+    db: AsyncSession,
+    model: type[Base],
+    entity_id: str,
+    values: dict,
+    expected: Expected | None = None,
+) -> int:
+    """Write ``values`` and bump the version in one UPDATE; returns the new version.
+
+    Raises 404 if the row is gone, or the expected status if its version is
+    not the expected one; only then is the row read.
+    """
+    stmt = update(model).where(model.id == entity_id)
+    if expected is not None:
+        stmt = stmt.where(model.version == expected.version)
+    result = await db.execute(
+        stmt.values(**values, version=model.version + 1).returning(model.version)
+    )
+    version = result.scalar_one_or_none()
+    if version is not None:
+        return version
+
+    name = model.__name__
+    result = await db.execute(select(model.version).where(model.id == entity_id))
+    current = result.scalar_one_or_none()
+    if current is None:
+        raise HTTPException(404, f"{name} not found")
+    raise HTTPException(
+        expected.status,
+        f"{name} was changed by someone else (now version {current})",
+        headers={"ETag": f'"{current}"'},
+    )
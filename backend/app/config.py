@@ -38,12 +38,90 @@ class Settings(BaseSettings):
     # Database connection string for SQLAlchemy async engine
     database_url: str = "sqlite+aiosqlite:///./taskflow.db"
 
+    # Connection string for read-only routes, e.g. a replica of a server database.
+    # Unset, SQLite files are opened a second time in read-only mode and other
+    # databases are read through the main connection.
+    read_database_url: str | None = None
+
     # Backend server port for uvicorn
     backend_port: int = 8000
 
     # Frontend dev server port (used for CORS configuration)
     frontend_port: int = 5173
 
+    # Recent change events kept for /api/events clients resuming with Last-Event-ID
+    event_history_size: int = 1000
+
+    # Events queued per /api/events client before a slow client is disconnected
+    event_queue_size: int = 1000
+
+    # Seconds between keepalive comments on idle /api/events streams
+    event_keepalive: float = 15.0
+
+    # SQLite pragmas applied to every new connection; None leaves SQLite's default.
+    # WAL lets readers proceed while a write is in progress, and
+    # synchronous=NORMAL is durable across application crashes in WAL mode
+    # (only a power loss can drop the last commits).
+    sqlite_journal_mode: str | None = "wal"
+    sqlite_synchronous: str | None = "normal"
+    # Page cache per connection; negative values are KiB (64 MiB)
+    sqlite_cache_size: int | None = -65536
+    # Bytes of the database file read through memory mapping (256 MiB)
+    sqlite_mmap_size: int | None = 268435456
+    sqlite_temp_store: str | None = "memory"
+    # Milliseconds a connection waits for a lock before "database is locked"
+    sqlite_busy_timeout: int | None = 5000
+
+    # Seconds between WAL checkpoints run by the app (0 disables them)
+    sqlite_checkpoint_interval: float = 300.0
+    # PASSIVE never blocks; TRUNCATE also shrinks the WAL file but waits for readers
+    sqlite_checkpoint_mode: str = "PASSIVE"
+
+    # Serialize card writes through one writer task that commits queued requests
+    # together (group commit); see app/writer.py
+    write_queue: bool = False
+    # Most requests committed in one transaction by the write queue
+    write_queue_max_group: int = 100
+
+    # Encoded GET /api/columns bodies kept in memory, per query (0 disables
+    # the cache); any write empties it, see app/board_cache.py
+    board_cache_size: int = 32
+    # Bytes the cached bodies may take in total (64 MiB)
+    board_cache_max_bytes: int = 67108864
+    # Seconds a cached body is served at most
+    board_cache_ttl: float = 60.0
+
+    # Read routes whose identical concurrent requests share one run of the
+    # route's queries and encoding; see app/single_flight.py
+    single_flight_routes: list[str] = ["columns", "tags"]
+
+    # Responses kept for retries of mutating requests with an Idempotency-Key,
+    # and for how many seconds; see app/idempotency.py
+    idempotency_cache_size: int = 10000
+    idempotency_ttl: float = 86400.0
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        """Pragmas for new SQLite connections, in the order they are applied."""
+        pragmas = {
+            # busy_timeout first, so the others wait for locks too
+            "busy_timeout": self.sqlite_busy_timeout,
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "cache_size": self.sqlite_cache_size,
+            "mmap_size": self.sqlite_mmap_size,
+            "temp_store": self.sqlite_temp_store,
+        }
+        return {name: value for name, value in pragmas.items() if value is not None}
+
+    @property
+    def sqlite_read_pragmas(self) -> dict[str, str | int]:
+        """Pragmas for read-only connections, which cannot change the journal."""
+        pragmas = dict(self.sqlite_pragmas)
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("synchronous", None)
+        return pragmas
+
     @property
     def cors_origins(self) -> list[str]:
         """CORS allowed origins based on frontend port."""
@@ -0,0 +1,29 @@
+"""Opaque pagination cursors.
+
+A cursor is a small JSON object, base64url-encoded without padding, naming
+the place where the next page starts. Clients only hand it back; anything
+that does not decode to the fields a route expects is rejected alike.
+"""
+
+import base64
+import json
+from collections.abc import Callable
+from typing import Any
+
+
+def encode(position: dict) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode(cursor: str, **fields: Callable[[Any], Any]) -> dict:
+    """Inverse of ``encode``, with each of ``fields`` converted by its callable.
+
+    Raises ValueError if the cursor is not ours or lacks one of the fields.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        return {name: convert(position[name]) for name, convert in fields.items()}
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor") from None
@@ -1,11 +1,102 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import logging
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.engine import URL
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+def apply_pragmas(engine: AsyncEngine, pragmas: dict[str, str | int]) -> None:
+    """Run ``PRAGMA name=value`` on every new connection of an SQLite engine."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+async def begin_write(db: AsyncSession) -> None:
+    """Take SQLite's write lock now, before the reads a write depends on.
+
+    The driver only begins a transaction at the first INSERT, UPDATE or
+    DELETE, so another writer can commit between a read and the write based
+    on it. ``BEGIN IMMEDIATE`` makes other writers wait until this
+    transaction ends. Does nothing once the transaction has written, which
+    already holds the lock, or on other databases.
+    """
+    conn = await db.connection()
+    if conn.dialect.name != "sqlite":
+        return
+    raw = await conn.get_raw_connection()
+    if not raw.driver_connection.in_transaction:
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+async def checkpoint_periodically(
+    engine: AsyncEngine, interval: float, mode: str = "PASSIVE"
+) -> None:
+    """Checkpoint the WAL every ``interval`` seconds, until cancelled.
+
+    SQLite checkpoints on its own once the WAL reaches 1000 pages, but only
+    when a commit happens to cross that mark; this keeps the WAL short after
+    bursts of writes and during long read-only stretches.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")
+        except Exception:
+            logger.exception("WAL checkpoint failed")
+
+
+def read_only_url(database_url: str, replica_url: str | None = None) -> URL | None:
+    """URL for read-only sessions, or None to read through the main engine.
+
+    SQLite files are opened again in read-only mode; in WAL mode those readers
+    never wait for the writer. In-memory databases cannot be shared that way.
+    """
+    if replica_url:
+        return make_url(replica_url)
+    url = make_url(database_url)
+    path = url.database
+    if url.get_backend_name() != "sqlite" or not path or path == ":memory:":
+        return None
+    if url.query.get("mode") == "memory":
+        return None
+    if not path.startswith("file:"):
+        path = f"file:{path}"
+    return url.set(database=path, query={**url.query, "mode": "ro", "uri": "true"})
+
+
 engine = create_async_engine(settings.database_url, echo=False)
+apply_pragmas(engine, settings.sqlite_pragmas)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+_read_url = read_only_url(settings.database_url, settings.read_database_url)
+if _read_url is None:
+    read_engine = engine
+else:
+    read_engine = create_async_engine(_read_url, echo=False)
+    apply_pragmas(read_engine, settings.sqlite_read_pragmas)
+async_read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -14,3 +105,9 @@ class Base(DeclarativeBase):
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+async def get_read_db():
+    """Session for routes that only read; writes through it fail."""
+    async with async_read_session() as session:
+        yield session
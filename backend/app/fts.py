@@ -0,0 +1,94 @@
+"""Full-text search over card titles and descriptions.
+
+Cards are indexed by an SQLite FTS5 virtual table (``cards_fts``) that uses
+``cards`` as its external content table, so the text itself is stored only
+once. Triggers keep the index in sync on insert, delete and on updates that
+touch ``title`` or ``description``; moves and archiving never rewrite it.
+"""
+
+import re
+
+from sqlalchemy import DDL, Table, event, func, literal_column, select, table
+
+# Statements creating the index; the add_cards_fts migration mirrors them.
+CREATE_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+        title, description, content='cards', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ai AFTER INSERT ON cards BEGIN
+        INSERT INTO cards_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ad AFTER DELETE ON cards BEGIN
+        INSERT INTO cards_fts(cards_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_au AFTER UPDATE OF title, description
+    ON cards BEGIN
+        INSERT INTO cards_fts(cards_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO cards_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+)
+
+DROP_STATEMENTS = ("DROP TABLE IF EXISTS cards_fts",)
+
+# Title matches weigh more than description matches in the bm25 score.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SNIPPET_TOKENS = 12
+
+
+def install(cards: Table) -> None:
+    """Create and drop the index alongside the cards table (SQLite only)."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(cards, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in DROP_STATEMENTS:
+        event.listen(cards, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+
+
+cards_fts = table("cards_fts")
+card_rowid = literal_column("cards.rowid")
+
+_TERM = re.compile(r"\w+")
+
+
+def match_expression(q: str) -> str | None:
+    """Turn free text into an FTS5 query where every word is a prefix term.
+
+    Returns None if the text contains nothing searchable.
+    """
+    terms = _TERM.findall(q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_hits(expression: str):
+    """Subquery of matching card rowids with their bm25 rank and a snippet.
+
+    Lower ranks are better matches. Join it to cards on ``card_rowid``.
+    """
+    fts = literal_column("cards_fts")
+    return (
+        select(
+            literal_column("cards_fts.rowid").label("rowid"),
+            func.bm25(fts, TITLE_WEIGHT, DESCRIPTION_WEIGHT).label("rank"),
+            func.snippet(fts, -1, "<mark>", "</mark>", "…", SNIPPET_TOKENS).label(
+                "snippet"
+            ),
+        )
+        .select_from(cards_fts)
+        .where(fts.match(expression))
+        .subquery("hits")
+    )
@@ -0,0 +1,220 @@
+"""``Idempotency-Key`` support for mutating requests.
+
+Clients that time out and retry a POST, PUT, PATCH or DELETE would otherwise
+apply it twice (a second card, a second move). When such a request carries
+an ``Idempotency-Key`` header, its response is kept for a while and a retry
+with the same key gets the stored response back, with
+``Idempotent-Replayed: true``, without running the route again. A retry that
+arrives while the first request is still running waits for its response.
+
+The key is bound to the request it was first used with: reusing it for a
+different method, path or body is a ``422``. Server errors are not kept, so
+a retry after a 5xx runs again. Responses are kept in memory, per worker, in
+an LRU bounded by ``settings.idempotency_cache_size`` and expiring after
+``settings.idempotency_ttl`` seconds.
+
+The body is normally read in full before the route runs, to fingerprint it.
+Routes listed in ``streamed_paths`` (the import) read their body as it
+arrives instead, so it is hashed as it passes through, and a retry hashes
+its own body only once the first request has answered.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+MUTATING = {"POST", "PUT", "PATCH", "DELETE"}
+REPLAYED = (b"idempotent-replayed", b"true")
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+@dataclass
+class Entry:
+    # None while a streamed body is still being read
+    fingerprint: str | None
+    # The response, once the first request finished; None if it is not kept
+    response: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+    expires: float = float("inf")
+
+
+class IdempotencyStore:
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, Entry] = OrderedDict()
+
+    def claim(self, key: str, fingerprint: str | None) -> tuple[Entry, bool]:
+        """The entry for ``key``, and whether this request has to produce it."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires > time.monotonic():
+            self.entries.move_to_end(key)
+            return entry, False
+        entry = self.entries[key] = Entry(fingerprint)
+        self.entries.move_to_end(key)
+        # Evict the least recently used finished entries; running ones stay
+        for old_key in list(self.entries):
+            if len(self.entries) <= self.max_entries:
+                break
+            if self.entries[old_key].response.done():
+                del self.entries[old_key]
+        return entry, True
+
+    def complete(self, key: str, entry: Entry, response: StoredResponse) -> None:
+        entry.expires = time.monotonic() + self.ttl
+        entry.response.set_result(response)
+
+    def release(self, key: str, entry: Entry) -> None:
+        """Forget the key: the request failed and its retry should run again."""
+        if self.entries.get(key) is entry:
+            del self.entries[key]
+        entry.response.set_result(None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+store = IdempotencyStore(settings.idempotency_cache_size, settings.idempotency_ttl)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _hash_body(digest, receive: Receive) -> str:
+    """Feed the rest of the body to ``digest`` without keeping it."""
+    while True:
+        message = await receive()
+        digest.update(message.get("body", b""))
+        if not message.get("more_body"):
+            return digest.hexdigest()
+
+
+async def _send_stored(send: Send, response: StoredResponse, *extra) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": response.headers + list(extra),
+        }
+    )
+    await send({"type": "http.response.body", "body": response.body})
+
+
+def _mismatch() -> StoredResponse:
+    body = json.dumps(
+        {"detail": "Idempotency-Key was used for a different request"}
+    ).encode()
+    return StoredResponse(422, [(b"content-type", b"application/json")], body)
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, streamed_paths: frozenset[str] = frozenset()):
+        self.app = app
+        self.streamed_paths = streamed_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MUTATING:
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get("idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        request = f"{scope['method']} {scope['path']}?{scope['query_string']!r}"
+        digest = hashlib.sha256(request.encode() + b"\n")
+        streamed = scope["path"] in self.streamed_paths
+        if streamed:
+            fingerprint = None
+        else:
+            body = await _read_body(receive)
+            digest.update(body)
+            fingerprint = digest.hexdigest()
+
+        while True:
+            entry, first = store.claim(key, fingerprint)
+            if first:
+                break
+            if not streamed and entry.fingerprint != fingerprint:
+                await _send_stored(send, _mismatch())
+                return
+            response = await asyncio.shield(entry.response)
+            if response is None:
+                # The first request failed and was not kept: try again ourselves
+                continue
+            if streamed and entry.fingerprint != await _hash_body(digest, receive):
+                await _send_stored(send, _mismatch())
+            else:
+                await _send_stored(send, response, REPLAYED)
+            return
+
+        more_body = True
+
+        async def forward_receive() -> Message:
+            nonlocal more_body
+            message = await receive()
+            if message["type"] == "http.request":
+                digest.update(message.get("body", b""))
+                more_body = message.get("more_body", False)
+            return message
+
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            if streamed:
+                await self.app(scope, forward_receive, capture)
+                if more_body:
+                    # The route answered without reading all of its body
+                    await _hash_body(digest, receive)
+                entry.fingerprint = digest.hexdigest()
+            else:
+                await self.app(scope, replay_receive, capture)
+        except BaseException:
+            store.release(key, entry)
+            raise
+        if start is None or start["status"] >= 500:
+            store.release(key, entry)
+            return
+        response = StoredResponse(
+            start["status"], list(start.get("headers", [])), b"".join(chunks)
+        )
+        store.complete(key, entry, response)
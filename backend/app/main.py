@@ -1,14 +1,29 @@
 import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from alembic import command
 from alembic.config import Config
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import writer
 from app.config import settings
-from app.routers import archive, board_settings, cards, columns, search, tags
+from app.database import async_session, checkpoint_periodically, engine
+from app.idempotency import IdempotencyMiddleware
+from app.routers import (
+    archive,
+    batch,
+    board_settings,
+    cards,
+    changes,
+    columns,
+    events,
+    metrics,
+    search,
+    tags,
+    transfer,
+)
 
 
 def run_migrations():
@@ -27,11 +42,34 @@ async def lifespan(app: FastAPI):
     if os.getenv("AUTO_MIGRATE", "true").lower() == "true":
         await asyncio.to_thread(run_migrations)
 
+    checkpoints = None
+    if engine.dialect.name == "sqlite" and settings.sqlite_checkpoint_interval > 0:
+        checkpoints = asyncio.create_task(
+            checkpoint_periodically(
+                engine,
+                settings.sqlite_checkpoint_interval,
+                settings.sqlite_checkpoint_mode,
+            )
+        )
+
+    if settings.write_queue:
+        writer.queue = writer.WriteQueue(async_session, settings.write_queue_max_group)
+        writer.queue.start()
+
     yield
 
+    if writer.queue:
+        await writer.queue.stop()
+        writer.queue = None
+    if checkpoints:
+        checkpoints.cancel()
+        with suppress(asyncio.CancelledError):
+            await checkpoints
+
 
 app = FastAPI(title="tiny-kanban API", lifespan=lifespan)
 
+app.add_middleware(IdempotencyMiddleware, streamed_paths=frozenset({"/api/import"}))
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -46,6 +84,11 @@ app.include_router(tags.router, prefix="/api")
 app.include_router(archive.router, prefix="/api")
 app.include_router(search.router, prefix="/api")
 app.include_router(board_settings.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
+app.include_router(changes.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+app.include_router(transfer.router, prefix="/api")
 
 
 if __name__ == "__main__":
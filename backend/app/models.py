@@ -2,16 +2,22 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    and_,
+    desc,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app import card_counts, changes, fts
 from app.database import Base
 
 
@@ -25,6 +31,7 @@ def _now() -> datetime:
 
 class Column(Base):
     __tablename__ = "columns"
+    __table_args__ = (Index("ix_columns_position", "position"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=_uuid)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -32,14 +39,41 @@ class Column(Base):
     is_done_column: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now, onupdate=_now)
+    # Bumped by every write to the column, see app/concurrency.py
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Active cards in the column, kept by triggers (see app/card_counts.py)
+    card_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     cards: Mapped[list["Card"]] = relationship(
-        back_populates="column", order_by="Card.position"
+        back_populates="column", order_by=lambda: (Card.rank, Card.id)
+    )
+    # The board's view of the column: archived cards are never loaded
+    active_cards: Mapped[list["Card"]] = relationship(
+        primaryjoin=lambda: and_(
+            Column.id == Card.column_id,
+            Card.is_archived == False,  # noqa: E712
+        ),
+        order_by=lambda: (Card.rank, Card.id),
+        viewonly=True,
     )
 
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        # Board reads, appends and moves: active cards of a column in order
+        Index(
+            "ix_cards_column_id_is_archived_rank", "column_id", "is_archived", "rank"
+        ),
+        # Archive listing, newest first, and its (archived_at, id) cursors
+        Index(
+            "ix_cards_is_archived_archived_at_id",
+            "is_archived",
+            desc("archived_at"),
+            desc("id"),
+        ),
+        Index("ix_cards_due_date", "due_date"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=_uuid)
     column_id: Mapped[str | None] = mapped_column(
@@ -48,18 +82,28 @@ class Card(Base):
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     image_url: Mapped[str | None] = mapped_column(String(2000), nullable=True)
-    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Lexicographic sort key within the column, see app/ranking.py
+    rank: Mapped[str] = mapped_column(String(255), nullable=False)
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
     archived_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     due_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now, onupdate=_now)
+    # Bumped by every write to the card, see app/concurrency.py
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
     column: Mapped[Column | None] = relationship(back_populates="cards")
     tags: Mapped[list["Tag"]] = relationship(
-        secondary="card_tags", back_populates="cards"
+        secondary="card_tags", back_populates="cards", order_by="Tag.name"
     )
 
+    # Index among the active cards of the column, derived from ``rank`` when
+    # the card is serialized (see app.ranking.assign_positions)
+    position = 0
+
+
+fts.install(Card.__table__)
+
 
 class Tag(Base):
     __tablename__ = "tags"
@@ -78,7 +122,10 @@ class Tag(Base):
 
 class CardTag(Base):
     __tablename__ = "card_tags"
-    __table_args__ = (UniqueConstraint("card_id", "tag_id"),)
+    __table_args__ = (
+        UniqueConstraint("card_id", "tag_id"),
+        Index("ix_card_tags_tag_id", "tag_id"),
+    )
 
     card_id: Mapped[str] = mapped_column(
         String, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True
@@ -102,3 +149,47 @@ class BoardSettings(Base):
     )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now, onupdate=_now)
+
+
+class BoardState(Base):
+    # Single row; ``version`` is bumped by every transaction that writes.
+    # ``instance`` is new for each database, whose versions start over at 0
+    __tablename__ = "board_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    instance: Mapped[str] = mapped_column(
+        String(32), nullable=False, default=lambda: uuid.uuid4().hex
+    )
+
+
+event.listen(
+    BoardState.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO board_state (id, version, instance)"
+        " VALUES (1, 0, lower(hex(randomblob(16))))"
+    ),
+)
+
+
+@event.listens_for(BoardSettings.__table__, "after_create")
+def _default_board_settings(target, connection, **kw):
+    # Created with the table so reading the settings never has to write
+    connection.execute(target.insert())
+
+
+class Change(Base):
+    # Latest write to each card, column and tag, filled by triggers (see
+    # app/changes.py); deleted entities stay as tombstones
+    __tablename__ = "changes"
+    __table_args__ = (Index("ix_changes_seq", "seq", unique=True),)
+
+    entity: Mapped[str] = mapped_column(String(20), primary_key=True)
+    entity_id: Mapped[str] = mapped_column(String, primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+changes.install(Base.metadata)
+card_counts.install(Base.metadata)
@@ -0,0 +1,322 @@
+"""Lexicographic rank keys for ordering cards within a column.
+
+Cards are ordered by ``Card.rank``, a base-62 string compared byte by byte.
+Moving a card only rewrites its own rank: a key strictly between its new
+neighbours can always be generated without touching them. Keys follow the
+fractional-indexing scheme: a variable-length integer part (whose first
+character encodes its length) followed by an optional fraction that never
+ends in ``0``. Appending increments the integer part, so keys stay short for
+cards added at the end; repeated inserts at the same spot grow the fraction,
+and columns whose keys get too long are rebalanced in the background.
+
+The integer ``position`` exposed by the API is derived from the ranks: it is
+the card's index among the active cards of its column.
+"""
+
+import operator
+from functools import reduce
+
+from sqlalchemy import Integer, String, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import aliased
+
+from app import writer
+from app.database import begin_write
+from app.models import Card, Column
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+FIRST_KEY = "a0"
+SMALLEST_INTEGER = "A" + DIGITS[0] * 26
+
+# Keys longer than this trigger a background rebalance of their column
+MAX_KEY_LENGTH = 32
+
+# Digits in the fractions appended by set-based bulk appends (62**4 cards)
+BULK_SUFFIX_WIDTH = 4
+
+# assign_positions numbers whole columns at once beyond this many cards
+WINDOW_THRESHOLD = 50
+
+
+# --- Key generation ---
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid rank key head: {head!r}")
+
+
+def _split(key: str) -> tuple[str, str]:
+    """Split a key into its integer part and its fraction."""
+    if not key:
+        raise ValueError("Empty rank key")
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"Invalid rank key: {key!r}")
+    integer, fraction = key[:length], key[length:]
+    if fraction.endswith(DIGITS[0]) or key == SMALLEST_INTEGER:
+        raise ValueError(f"Invalid rank key: {key!r}")
+    return integer, fraction
+
+
+def _increment(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d < len(DIGITS):
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = DIGITS[0]
+    if head == "Z":
+        return "a" + DIGITS[0]
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    """Fraction strictly between fractions ``a`` and ``b`` (None: unbounded)."""
+    if b is not None:
+        # Keep the common prefix (``a`` is implicitly padded with zeros)
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a: str | None, b: str | None) -> str:
+    """Return a key sorting strictly after ``a`` and before ``b``.
+
+    Either bound may be None to mean the start or end of the column. Raises
+    ValueError if a bound is malformed or ``a`` does not sort before ``b``.
+    """
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Rank {a!r} does not sort before {b!r}")
+    if a is None:
+        if b is None:
+            return FIRST_KEY
+        integer_b, fraction_b = _split(b)
+        if integer_b == SMALLEST_INTEGER:
+            return integer_b + _midpoint("", fraction_b)
+        if integer_b < b:
+            return integer_b
+        key = _decrement(integer_b)
+        if key is None:
+            raise ValueError("Cannot generate a rank before the smallest key")
+        return key
+
+    integer_a, fraction_a = _split(a)
+    if b is None:
+        key = _increment(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if key is None else key
+
+    integer_b, fraction_b = _split(b)
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    key = _increment(integer_a)
+    if key is not None and key < b:
+        return key
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_after(a: str | None, count: int) -> list[str]:
+    """Return ``count`` ascending keys that all sort after ``a``."""
+    keys = []
+    for _ in range(count):
+        a = key_between(a, None)
+        keys.append(a)
+    return keys
+
+
+def append_suffix(n):
+    """SQL expression for the fraction appending the ``n``-th card (from 1).
+
+    ``key || append_suffix(n)`` sorts after ``key`` and in ``n`` order: the
+    suffix is ``n`` in fixed-width base 62 plus a final non-zero digit, so
+    the result is still a valid key.
+    """
+    digits = []
+    for power in reversed(range(BULK_SUFFIX_WIDTH)):
+        digit = n.op("/", return_type=Integer)(len(DIGITS) ** power).op(
+            "%", return_type=Integer
+        )(len(DIGITS))
+        digits.append(func.substr(DIGITS, digit + 1, 1, type_=String))
+    return reduce(operator.add, digits) + DIGITS[len(DIGITS) // 2]
+
+
+# --- Database helpers ---
+
+
+def _active_in(column_id: str):
+    return (
+        Card.column_id == column_id,
+        Card.is_archived == False,  # noqa: E712
+    )
+
+
+async def append_slot(db: AsyncSession, column_id: str) -> tuple[str, int]:
+    """Rank and position for a card appended to the end of a column.
+
+    Takes the write lock first, so concurrent appends each see the others'
+    cards and get distinct ranks. ``MAX(rank)`` is read from the end of the
+    column's index and the position from ``columns.card_count``; counting the
+    cards instead would visit all of them.
+    """
+    await begin_write(db)
+    last = select(func.max(Card.rank)).where(*_active_in(column_id))
+    if db.get_bind().dialect.name == "sqlite":
+        count = select(Column.card_count).where(Column.id == column_id)
+    else:
+        # The count triggers are SQLite only
+        count = select(func.count()).where(*_active_in(column_id))
+    result = await db.execute(select(last.scalar_subquery(), count.scalar_subquery()))
+    last, count = result.one()
+    return key_between(last, None), count or 0
+
+
+async def insert_rank(
+    db: AsyncSession, column_id: str, position: int, card_id: str
+) -> str:
+    """Rank placing ``card_id`` at ``position`` among the other active cards.
+
+    Takes the write lock first, like ``append_slot``.
+    """
+    await begin_write(db)
+    others = (
+        select(Card.rank)
+        .where(*_active_in(column_id), Card.id != card_id)
+        .order_by(Card.rank)
+    )
+    if position <= 0:
+        before = None
+        after = (await db.execute(others.limit(1))).scalar_one_or_none()
+    else:
+        result = await db.execute(others.offset(position - 1).limit(2))
+        neighbours = result.scalars().all()
+        if neighbours:
+            before = neighbours[0]
+            after = neighbours[1] if len(neighbours) > 1 else None
+        else:
+            # Past the end: append after the last card
+            before = (
+                await db.execute(
+                    select(func.max(Card.rank)).where(
+                        *_active_in(column_id), Card.id != card_id
+                    )
+                )
+            ).scalar()
+            after = None
+    return key_between(before, after)
+
+
+async def assign_positions(db: AsyncSession, cards: list[Card]) -> None:
+    """Set ``position`` on active cards from their rank, in one statement.
+
+    A few cards are each counted against their column's index; many cards
+    are numbered by one window over the columns they belong to.
+    """
+    active = [card for card in cards if card.column_id and not card.is_archived]
+    if not active:
+        return
+    if len(active) > WINDOW_THRESHOLD:
+        position = func.row_number().over(
+            partition_by=Card.column_id, order_by=(Card.rank, Card.id)
+        )
+        stmt = select(Card.id, position - 1).where(
+            Card.column_id.in_({card.column_id for card in active}),
+            Card.is_archived == False,  # noqa: E712
+        )
+    else:
+        other = aliased(Card)
+        preceding = (
+            select(func.count())
+            .where(
+                other.column_id == Card.column_id,
+                other.is_archived == False,  # noqa: E712
+                # The board's order: ties on rank, if any, go by id
+                tuple_(other.rank, other.id) < tuple_(Card.rank, Card.id),
+            )
+            .scalar_subquery()
+        )
+        stmt = select(Card.id, preceding).where(Card.id.in_([c.id for c in active]))
+    positions = dict((await db.execute(stmt)).all())
+    for card in active:
+        card.position = positions.get(card.id, 0)
+
+
+def number(cards: list[Card]) -> list[Card]:
+    """Set ``position`` on a column's active cards, already in rank order."""
+    for i, card in enumerate(cards):
+        card.position = i
+    return cards
+
+
+async def rebalance(db: AsyncSession, column_id: str) -> None:
+    """Rewrite the ranks of a column's active cards as short, evenly spaced keys.
+
+    The write lock is taken before the order is read, so a move committed in
+    between cannot be overwritten with the old order.
+    """
+    await begin_write(db)
+    result = await db.execute(
+        select(Card.id).where(*_active_in(column_id)).order_by(Card.rank, Card.id)
+    )
+    ids = result.scalars().all()
+    if ids:
+        await db.execute(
+            update(Card),
+            [
+                {"id": card_id, "rank": key}
+                for card_id, key in zip(ids, keys_after(None, len(ids)))
+            ],
+        )
+
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) > MAX_KEY_LENGTH
+
+
+async def rebalance_in_background(bind: AsyncEngine, column_id: str) -> None:
+    """Background task: rebalance a column through ``app.writer``.
+
+    The request's session is closed by the time this runs, so it gets its own.
+    """
+    async with AsyncSession(bind, expire_on_commit=False) as db:
+        await writer.write(db, lambda db: rebalance(db, column_id))
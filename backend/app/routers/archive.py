@@ -1,14 +1,73 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import delete, func, select
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, exists, func, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from app.database import get_db
+from app import broadcast, cursors, fts, ranking, versioning
+from app.database import get_db, get_read_db
 from app.models import Card, CardTag, Column
-from app.schemas import ArchivePage, CardOut
+from app.schemas import ArchivePage, CardOut, CardSearchOut, RestoreAllResult
 
 router = APIRouter(tags=["archive"])
 
+# Restored cards are loaded back for the response this many at a time
+RESTORE_LOAD_BATCH = 500
+
+
+def _decode_cursor(cursor: str) -> dict:
+    """Offset cursors page search results, (archived_at, id) ones the rest."""
+    for fields in (
+        {"offset": int},
+        {"archived_at": datetime.fromisoformat, "id": str},
+    ):
+        try:
+            return cursors.decode(cursor, **fields)
+        except ValueError:
+            pass
+    raise HTTPException(400, "Invalid cursor")
+
+
+# Archive sizes by query, valid for a single database and board version;
+# the least recently used are dropped beyond TOTALS_CACHE_SIZE queries, and
+# all of them after TOTALS_TTL seconds, in case the file was swapped under
+# us (a restored backup reuses its instance id and versions)
+TOTALS_CACHE_SIZE = 256
+TOTALS_TTL = 60.0
+_totals: OrderedDict[str | None, int] = OrderedDict()
+_totals_key: tuple[str | None, int] | None = None
+_totals_expires = 0.0
+
+
+def clear_totals() -> None:
+    global _totals_key
+    _totals.clear()
+    _totals_key = None
+
+
+async def _archive_total(db: AsyncSession, base, q: str | None) -> int:
+    """Count the archive, or reuse the count if nothing was written since."""
+    global _totals_key, _totals_expires
+    # Read the version first: a count cached under an outdated version is
+    # never looked up again
+    key = await versioning.current_instance(db)
+    now = time.monotonic()
+    if key != _totals_key or now >= _totals_expires:
+        clear_totals()
+        _totals_key = key
+        _totals_expires = now + TOTALS_TTL
+    if q in _totals:
+        _totals.move_to_end(q)
+        return _totals[q]
+    count_q = select(func.count()).select_from(base.subquery())
+    _totals[q] = total = (await db.execute(count_q)).scalar()
+    while len(_totals) > TOTALS_CACHE_SIZE:
+        _totals.popitem(last=False)
+    return total
+
 
 @router.get("/archive", response_model=ArchivePage)
 async def list_archive(
@@ -16,55 +75,164 @@ async def list_archive(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     recent_limit: int | None = Query(None, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    """Archived cards, newest first (best match first when searching).
+
+    Pages are addressed either by ``page`` or by the ``next_cursor`` of the
+    previous page; cursors cost the same however deep the page is.
+    """
     base = select(Card).where(Card.is_archived == True)  # noqa: E712
+    # Ties on archived_at are broken by id, which makes (archived_at, id) a key
+    order_by = [Card.archived_at.desc(), Card.id.desc()]
+    hits = None
     if q:
-        base = base.where(Card.title.ilike(f"%{q}%"))
+        expression = fts.match_expression(q)
+        if not expression:
+            return ArchivePage(items=[], total=0, page=page, page_size=page_size)
+        hits = fts.search_hits(expression)
+        base = base.join(hits, fts.card_rowid == hits.c.rowid)
+        order_by.insert(0, hits.c.rank)
 
-    count_q = select(func.count()).select_from(base.subquery())
-    total = (await db.execute(count_q)).scalar()
+    total = await _archive_total(db, base, q) if include_total else None
 
-    items_q = base.options(selectinload(Card.tags)).order_by(Card.archived_at.desc())
+    items_q = base.options(selectinload(Card.tags)).order_by(*order_by)
+    if hits is not None:
+        items_q = items_q.add_columns(hits.c.snippet)
 
     # If recent_limit is set, ignore pagination and return only N most recent items
+    offset = None
     if recent_limit:
         items_q = items_q.limit(recent_limit)
     else:
-        items_q = items_q.offset((page - 1) * page_size).limit(page_size)
+        if cursor:
+            position = _decode_cursor(cursor)
+            if "offset" in position:
+                # Search results are ordered by relevance, which is no key
+                offset = position["offset"]
+            else:
+                items_q = items_q.where(
+                    tuple_(Card.archived_at, Card.id)
+                    < tuple_(position["archived_at"], position["id"])
+                )
+        else:
+            offset = (page - 1) * page_size
+        if offset:
+            items_q = items_q.offset(offset)
+        # One extra row tells whether there is a next page
+        items_q = items_q.limit(page_size + 1)
 
     result = await db.execute(items_q)
-    items = result.scalars().all()
-    return ArchivePage(items=items, total=total, page=page, page_size=page_size)
-
+    rows = result.all()
+    next_cursor = None
+    if not recent_limit and len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1][0]
+        if hits is not None:
+            next_cursor = cursors.encode({"offset": (offset or 0) + page_size})
+        else:
+            next_cursor = cursors.encode(
+                {"archived_at": last.archived_at.isoformat(), "id": last.id}
+            )
 
-@router.post("/archive/restore-all", response_model=list[CardOut])
-async def restore_all(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Card)
-        .where(Card.is_archived == True)  # noqa: E712
-        .options(selectinload(Card.tags))
+    items = []
+    for row in rows:
+        item = CardSearchOut.model_validate(row[0])
+        if hits is not None:
+            item.snippet = row.snippet
+        items.append(item)
+    return ArchivePage(
+        items=items,
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
     )
-    cards = result.scalars().all()
 
-    first_col_result = await db.execute(
-        select(Column).order_by(Column.position).limit(1)
+
+@router.post("/archive/restore-all", response_model=list[CardOut] | RestoreAllResult)
+async def restore_all(
+    count_only: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+):
+    """Restore every archived card to the end of its column, set-based."""
+    archived = Card.is_archived == True  # noqa: E712
+
+    # Cards whose column is gone (or never set) go to the first column
+    first_col = select(Column.id).order_by(Column.position).limit(1).scalar_subquery()
+    await db.execute(
+        update(Card)
+        .where(
+            archived,
+            or_(
+                Card.column_id.is_(None),
+                ~exists().where(Column.id == Card.column_id),
+            ),
+        )
+        .values(column_id=first_col)
     )
-    first_col = first_col_result.scalar_one_or_none()
 
-    for card in cards:
-        if card.column_id:
-            col_check = await db.execute(
-                select(Column).where(Column.id == card.column_id)
+    # Append them after each column's last active card, oldest archived first.
+    # Ranks are written while the cards are still archived so the per-column
+    # maximum only ever sees the cards that were active before the restore.
+    numbered = (
+        select(
+            Card.id,
+            Card.column_id,
+            func.row_number()
+            .over(
+                partition_by=Card.column_id,
+                order_by=(Card.archived_at, Card.rank, Card.id),
             )
-            if not col_check.scalar_one_or_none():
-                card.column_id = first_col.id if first_col else None
-        elif first_col:
-            card.column_id = first_col.id
-        card.is_archived = False
-        card.archived_at = None
+            .label("n"),
+        )
+        .where(archived, Card.column_id.is_not(None))
+        .subquery()
+    )
+    active = aliased(Card)
+    last_rank = (
+        select(func.max(active.rank))
+        .where(
+            active.column_id == numbered.c.column_id,
+            active.is_archived == False,  # noqa: E712
+        )
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(Card)
+        .where(Card.id == numbered.c.id)
+        .values(
+            rank=func.coalesce(last_rank, ranking.FIRST_KEY)
+            + ranking.append_suffix(numbered.c.n)
+        )
+    )
 
+    result = await db.execute(
+        update(Card)
+        .where(archived)
+        .values(is_archived=False, archived_at=None, version=Card.version + 1)
+        .returning(Card.id)
+    )
+    restored_ids = result.scalars().all()
     await db.commit()
+    # Possibly thousands of cards: clients refetch the board instead
+    broadcast.publish("archive.restored", {"restored": len(restored_ids)})
+
+    if count_only:
+        return RestoreAllResult(restored=len(restored_ids))
+
+    cards = []
+    for i in range(0, len(restored_ids), RESTORE_LOAD_BATCH):
+        result = await db.execute(
+            select(Card)
+            .where(Card.id.in_(restored_ids[i : i + RESTORE_LOAD_BATCH]))
+            .options(selectinload(Card.tags))
+            .order_by(Card.column_id, Card.rank)
+        )
+        cards.extend(result.scalars().all())
+    await ranking.assign_positions(db, cards)
     return cards
 
 
@@ -74,3 +242,4 @@ async def clear_archive(db: AsyncSession = Depends(get_db)):
     await db.execute(delete(CardTag).where(CardTag.card_id.in_(archived_ids)))
     await db.execute(delete(Card).where(Card.is_archived == True))  # noqa: E712
     await db.commit()
+    broadcast.publish("archive.cleared", {})
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import broadcast, card_ops, concurrency, ranking, writer
+from app.database import get_db
+from app.schemas import BatchRequest, BatchResponse, BatchResult, CardOut
+
+router = APIRouter(tags=["batch"])
+
+# Event published for each kind of operation
+EVENTS = {
+    "create": "card.created",
+    "update": "card.updated",
+    "move": "card.moved",
+    "archive": "card.archived",
+    "delete": "card.deleted",
+}
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(
+    data: BatchRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply card operations in order, all in one transaction.
+
+    If any operation fails nothing is written, and the error says which one.
+    """
+
+    async def apply(db: AsyncSession) -> tuple[list[str], set[str]]:
+        card_ids, rebalance = [], set()
+        for index, operation in enumerate(data.operations):
+            try:
+                if operation.op == "create":
+                    card = await card_ops.create_card(
+                        db, operation.column_id, operation.data
+                    )
+                    card_ids.append(card.id)
+                elif operation.op == "update":
+                    await card_ops.update_card(
+                        db,
+                        operation.card_id,
+                        operation.data,
+                        concurrency.expected(operation.data.version, None),
+                    )
+                    card_ids.append(operation.card_id)
+                elif operation.op == "move":
+                    rank = await card_ops.move_card(
+                        db, operation, concurrency.expected(operation.version, None)
+                    )
+                    if ranking.needs_rebalance(rank):
+                        rebalance.add(operation.target_column_id)
+                    card_ids.append(operation.card_id)
+                elif operation.op == "archive":
+                    await card_ops.archive_card(db, operation.card_id)
+                    card_ids.append(operation.card_id)
+                else:
+                    await card_ops.delete_card(db, operation.card_id)
+                    card_ids.append(operation.card_id)
+            except HTTPException as exc:
+                raise HTTPException(
+                    exc.status_code,
+                    {"index": index, "op": operation.op, "detail": exc.detail},
+                )
+        return card_ids, rebalance
+
+    card_ids, rebalance = await writer.write(db, apply)
+
+    for column_id in rebalance:
+        background_tasks.add_task(ranking.rebalance_in_background, db.bind, column_id)
+
+    cards = await card_ops.load_cards(db, list(dict.fromkeys(card_ids)))
+    await ranking.assign_positions(db, cards)
+    final = {card.id: CardOut.model_validate(card) for card in cards}
+
+    results = []
+    for operation, card_id in zip(data.operations, card_ids):
+        card = final.get(card_id)
+        results.append(BatchResult(op=operation.op, card_id=card_id, card=card))
+        if operation.op == "delete":
+            broadcast.publish(EVENTS["delete"], {"id": card_id})
+        elif card is not None:
+            broadcast.publish(EVENTS[operation.op], card)
+    return BatchResponse(results=results)
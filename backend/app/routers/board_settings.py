@@ -1,26 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app import broadcast
+from app.database import get_db, get_read_db
 from app.models import BoardSettings
 from app.schemas import BoardSettingsOut, BoardSettingsUpdate
+from app.versioning import board_etag, current, etag
 
 router = APIRouter(tags=["board_settings"])
 
 
-@router.get("/board-settings", response_model=BoardSettingsOut)
-async def get_board_settings(db: AsyncSession = Depends(get_db)):
-    """Get board settings. Creates default settings if none exist."""
+@router.get(
+    "/board-settings",
+    response_model=BoardSettingsOut,
+    dependencies=[Depends(board_etag)],
+)
+async def get_board_settings(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db),
+):
+    """Get board settings.
+
+    The default settings are created with the table; if the row is missing
+    anyway it is created here, and the ETag moves to the version that wrote it.
+    """
     result = await db.execute(select(BoardSettings))
     settings = result.scalar_one_or_none()
 
     if not settings:
-        # Create default settings
         settings = BoardSettings()
-        db.add(settings)
-        await db.commit()
-        await db.refresh(settings)
+        write_db.add(settings)
+        await write_db.commit()
+        await write_db.refresh(settings)
+        response.headers["ETag"] = etag(await current(write_db))
 
     return settings
 
@@ -45,4 +59,7 @@ async def update_board_settings(
 
     await db.commit()
     await db.refresh(settings)
+    broadcast.publish(
+        "board_settings.updated", BoardSettingsOut.model_validate(settings)
+    )
     return settings
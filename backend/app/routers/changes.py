@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import changes, ranking
+from app.database import get_read_db
+from app.models import Card, Change, Column, Tag
+from app.schemas import ChangesPage, Deletion
+
+router = APIRouter(tags=["changes"])
+
+
+@router.get("/changes", response_model=ChangesPage)
+async def list_changes(
+    since: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Cards, columns and tags written since ``since``, oldest change first.
+
+    Without a cursor every entity is returned. Each entity appears once with
+    its current state, or in ``deleted`` if it is gone.
+    """
+    after = 0
+    if since:
+        try:
+            after = changes.decode_cursor(since)
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+
+    result = await db.execute(
+        select(Change).where(Change.seq > after).order_by(Change.seq).limit(limit + 1)
+    )
+    rows = result.scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    deleted = [
+        Deletion(entity=row.entity, id=row.entity_id) for row in rows if row.deleted
+    ]
+    live: dict[str, list[str]] = {entity: [] for entity in changes.ENTITIES}
+    for row in rows:
+        if not row.deleted:
+            live[row.entity].append(row.entity_id)
+
+    # Entities written again since the log was read come back in their newer
+    # state now and once more on the next page, which clients apply idempotently
+    cards = []
+    if live["card"]:
+        result = await db.execute(
+            select(Card)
+            .where(Card.id.in_(live["card"]))
+            .options(selectinload(Card.tags))
+        )
+        order = {card_id: i for i, card_id in enumerate(live["card"])}
+        cards = sorted(result.scalars().all(), key=lambda card: order[card.id])
+        await ranking.assign_positions(db, cards)
+    columns = []
+    if live["column"]:
+        result = await db.execute(select(Column).where(Column.id.in_(live["column"])))
+        columns = result.scalars().all()
+    tags = []
+    if live["tag"]:
+        result = await db.execute(select(Tag).where(Tag.id.in_(live["tag"])))
+        tags = result.scalars().all()
+
+    return ChangesPage(
+        cards=cards,
+        columns=columns,
+        tags=tags,
+        deleted=deleted,
+        cursor=changes.encode_cursor(rows[-1].seq if rows else after),
+        has_more=has_more,
+    )
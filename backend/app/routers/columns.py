@@ -1,65 +1,157 @@
 from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, update
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app import (
+    board_cache,
+    board_json,
+    broadcast,
+    concurrency,
+    ranking,
+    single_flight,
+)
+from app.database import get_db, get_read_db
 from app.models import Card, Column
-from app.schemas import ColumnCreate, ColumnOut, ColumnReorder, ColumnUpdate
+from app.schemas import (
+    ColumnCardsPage,
+    ColumnCreate,
+    ColumnOut,
+    ColumnPreviewOut,
+    ColumnReorder,
+    ColumnUpdate,
+    CompactBoardOut,
+)
+from app.versioning import board_etag
 
 router = APIRouter(tags=["columns"])
 
 
-@router.get("/columns", response_model=list[ColumnOut])
-async def list_columns(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Column)
-        .options(selectinload(Column.cards).selectinload(Card.tags))
-        .order_by(Column.position)
-    )
-    columns = result.scalars().all()
-    for col in columns:
-        col.cards = [c for c in col.cards if not c.is_archived]
-    return columns
+CardFormat = Literal["full", "compact"]
+
+
+def _card_fields(fields: str | None) -> set[str] | None:
+    if fields is None:
+        return None
+    return {name.strip() for name in fields.split(",") if name.strip()}
+
+
+@router.get(
+    "/columns",
+    response_model=list[ColumnOut] | list[ColumnPreviewOut] | CompactBoardOut,
+)
+async def list_columns(
+    response: Response,
+    format: CardFormat = Query("full"),
+    fields: str | None = Query(None),
+    card_limit: int | None = Query(None, ge=1, le=1000),
+    version: str = Depends(board_etag),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The board: columns in order with their active cards.
+
+    ``format=compact`` returns the tags once, in a top-level table, and
+    ``tag_ids`` on cards. ``fields`` is a comma-separated list of the card
+    fields to return, e.g. ``id,title,position``. ``card_limit`` returns only
+    the first cards of each column, with ``card_count`` and a ``next_cursor``
+    for ``GET /columns/{id}/cards``.
+    """
+    selected = _card_fields(fields)
+
+    async def build() -> bytes:
+        board = await board_json.board(db, format == "compact", selected, card_limit)
+        # Same bytes as the response models, without building ORM objects
+        return board_json.dumps(board)
+
+    fields_key = None if selected is None else ",".join(sorted(selected))
+    key = f"columns:{format}:{fields_key}:{card_limit}"
+    try:
+        body = await single_flight.coalesce(
+            "columns",
+            (key, version),
+            lambda: board_cache.cache.get_or_build(key, version, build),
+        )
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    return board_json.raw_response(body, response)
+
+
+@router.get(
+    "/columns/{column_id}/cards",
+    response_model=ColumnCardsPage,
+    dependencies=[Depends(board_etag)],
+)
+async def list_column_cards(
+    column_id: str,
+    response: Response,
+    cursor: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    format: CardFormat = Query("full"),
+    fields: str | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """A page of a column's active cards, in order; pass ``next_cursor`` back
+    as ``cursor`` for the next one. ``format`` and ``fields`` work as for
+    ``GET /columns`` (compact cards refer to ``GET /tags``)."""
+    result = await db.execute(select(Column.id).where(Column.id == column_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(404, "Column not found")
+    try:
+        page = await board_json.column_cards(
+            db, column_id, format == "compact", _card_fields(fields), cursor, limit
+        )
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    return board_json.json_response(page, response)
 
 
 @router.post("/columns", response_model=ColumnOut, status_code=201)
 async def create_column(data: ColumnCreate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Column))
-    max_pos = len(result.scalars().all())
-    col = Column(name=data.name, position=max_pos, is_done_column=data.is_done_column)
+    result = await db.execute(select(func.max(Column.position)))
+    last = result.scalar()
+    col = Column(
+        name=data.name,
+        position=0 if last is None else last + 1,
+        is_done_column=data.is_done_column,
+    )
     db.add(col)
     await db.commit()
     await db.refresh(col)
     result = await db.execute(
         select(Column)
         .where(Column.id == col.id)
-        .options(selectinload(Column.cards).selectinload(Card.tags))
+        .options(selectinload(Column.active_cards).selectinload(Card.tags))
     )
-    return result.scalar_one()
+    col = result.scalar_one()
+    broadcast.publish("column.created", ColumnOut.model_validate(col))
+    return col
 
 
 @router.patch("/columns/{column_id}", response_model=ColumnOut)
 async def update_column(
-    column_id: str, data: ColumnUpdate, db: AsyncSession = Depends(get_db)
+    column_id: str,
+    data: ColumnUpdate,
+    if_match: int | None = Depends(concurrency.if_match),
+    db: AsyncSession = Depends(get_db),
 ):
+    values = data.model_dump(include={"name", "is_done_column"}, exclude_none=True)
+    values["updated_at"] = datetime.now(timezone.utc)
+    await concurrency.update_versioned(
+        db, Column, column_id, values, concurrency.expected(data.version, if_match)
+    )
+    await db.commit()
     result = await db.execute(
         select(Column)
         .where(Column.id == column_id)
-        .options(selectinload(Column.cards).selectinload(Card.tags))
+        .options(selectinload(Column.active_cards).selectinload(Card.tags))
+        .execution_options(populate_existing=True)
     )
-    col = result.scalar_one_or_none()
-    if not col:
-        raise HTTPException(404, "Column not found")
-    if data.name is not None:
-        col.name = data.name
-    if data.is_done_column is not None:
-        col.is_done_column = data.is_done_column
-    col.updated_at = datetime.now(timezone.utc)
-    await db.commit()
-    await db.refresh(col)
+    col = result.scalar_one()
+    ranking.number(col.active_cards)
+    broadcast.publish("column.updated", ColumnOut.model_validate(col))
     return col
 
 
@@ -73,23 +165,30 @@ async def delete_column(column_id: str, db: AsyncSession = Depends(get_db)):
     await db.execute(
         update(Card)
         .where(Card.column_id == column_id, Card.is_archived == False)  # noqa: E712
-        .values(is_archived=True, archived_at=now)
+        .values(is_archived=True, archived_at=now, version=Card.version + 1)
     )
     await db.delete(col)
     await db.commit()
+    # Its active cards were archived along with it
+    broadcast.publish("column.deleted", {"id": column_id})
 
 
 @router.put("/columns/reorder", response_model=list[ColumnOut])
 async def reorder_columns(data: ColumnReorder, db: AsyncSession = Depends(get_db)):
     for i, col_id in enumerate(data.column_ids):
-        await db.execute(update(Column).where(Column.id == col_id).values(position=i))
+        await db.execute(
+            update(Column)
+            .where(Column.id == col_id)
+            .values(position=i, version=Column.version + 1)
+        )
     await db.commit()
+    broadcast.publish("columns.reordered", {"column_ids": data.column_ids})
     result = await db.execute(
         select(Column)
-        .options(selectinload(Column.cards).selectinload(Card.tags))
+        .options(selectinload(Column.active_cards).selectinload(Card.tags))
         .order_by(Column.position)
     )
     columns = result.scalars().all()
     for col in columns:
-        col.cards = [c for c in col.cards if not c.is_archived]
+        ranking.number(col.active_cards)
     return columns
@@ -0,0 +1,52 @@
+import asyncio
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+
+from app.broadcast import Event, broadcaster
+from app.config import settings
+
+router = APIRouter(tags=["events"])
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RECONNECT_DELAY = 3000
+
+
+async def event_stream(last_event_id: str | None = None):
+    """Server-sent events: missed events first, then live ones as they come."""
+    with broadcaster.subscribe() as subscription:
+        # Subscribed before reading the buffer, so nothing falls in between
+        missed: list[Event] | None = []
+        if last_event_id is not None:
+            try:
+                missed = broadcaster.since(int(last_event_id))
+            except ValueError:
+                missed = None
+
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+        if missed is None:
+            # The gap is no longer buffered: the client has to refetch the board
+            yield Event(broadcaster.last_id, "reset", "{}").encode()
+        for event in missed or []:
+            yield event.encode()
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.event_keepalive
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield event.encode()
+
+
+@router.get("/events")
+async def stream_events(last_event_id: str | None = Header(None)):
+    return StreamingResponse(
+        event_stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+from app import board_cache, single_flight
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Counters of the in-process caches and request coalescing, for this worker."""
+    return {
+        "board_cache": board_cache.cache.metrics(),
+        "single_flight": single_flight.flights.metrics(),
+    }
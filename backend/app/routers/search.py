@@ -3,28 +3,36 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app import fts, ranking
+from app.database import get_read_db
 from app.models import Card
-from app.schemas import CardOut
+from app.schemas import CardSearchOut
 
 router = APIRouter(tags=["search"])
 
 
-@router.get("/search", response_model=list[CardOut])
+@router.get("/search", response_model=list[CardSearchOut])
 async def search_cards(
     q: str = Query("", min_length=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    if not q:
+    expression = fts.match_expression(q)
+    if not expression:
         return []
+    hits = fts.search_hits(expression)
     result = await db.execute(
-        select(Card)
-        .where(
-            Card.is_archived == False,  # noqa: E712
-            Card.title.ilike(f"%{q}%"),
-        )
+        select(Card, hits.c.snippet)
+        .join(hits, fts.card_rowid == hits.c.rowid)
+        .where(Card.is_archived == False)  # noqa: E712
         .options(selectinload(Card.tags))
-        .order_by(Card.position)
+        .order_by(hits.c.rank)
         .limit(50)
     )
-    return result.scalars().all()
+    rows = result.all()
+    await ranking.assign_positions(db, [card for card, _ in rows])
+    items = []
+    for card, snippet in rows:
+        item = CardSearchOut.model_validate(card)
+        item.snippet = snippet
+        items.append(item)
+    return items
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app import board_json, broadcast, single_flight
+from app.database import get_db, get_read_db
 from app.models import Tag
 from app.schemas import TagCreate, TagOut
+from app.versioning import board_etag
 
 router = APIRouter(tags=["tags"])
 
 
 @router.get("/tags", response_model=list[TagOut])
-async def list_tags(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Tag).order_by(Tag.name))
-    return result.scalars().all()
+async def list_tags(
+    response: Response,
+    version: str = Depends(board_etag),
+    db: AsyncSession = Depends(get_read_db),
+):
+    async def build() -> bytes:
+        return board_json.dumps(await board_json.tags(db))
+
+    body = await single_flight.coalesce("tags", version, build)
+    return board_json.raw_response(body, response)
 
 
 @router.post("/tags", response_model=TagOut, status_code=201)
@@ -29,6 +38,7 @@ async def create_tag(data: TagCreate, db: AsyncSession = Depends(get_db)):
     db.add(tag)
     await db.commit()
     await db.refresh(tag)
+    broadcast.publish("tag.created", TagOut.model_validate(tag))
     return tag
 
 
@@ -40,3 +50,4 @@ async def delete_tag(tag_id: str, db: AsyncSession = Depends(get_db)):
         raise HTTPException(404, "Tag not found")
     await db.delete(tag)
     await db.commit()
+    broadcast.publish("tag.deleted", {"id": tag_id})
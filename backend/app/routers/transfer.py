@@ -0,0 +1,494 @@
+import csv
+import io
+import uuid
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import bindparam, func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import broadcast, ranking, writer
+from app.board_json import (
+    ACTIVE,
+    CARD_FIELDS,
+    CARD_NAMES,
+    COLUMN_FIELDS,
+    COLUMN_NAMES,
+    TAG_FIELDS,
+    TAG_NAMES,
+    dumps,
+    isoformat,
+)
+from app.database import begin_write, get_db, get_read_db
+from app.models import Card, CardTag, Column, Tag
+from app.schemas import (
+    ImportColumn,
+    ImportLineError,
+    ImportRecord,
+    ImportResult,
+    ImportTag,
+)
+from app.versioning import board_etag, current, etag
+
+router = APIRouter(tags=["transfer"])
+
+# Cards fetched from the cursor, and their tags looked up, this many at a time
+EXPORT_BATCH = 1000
+# Cards written per import transaction
+IMPORT_BATCH = 5000
+# Insert triggers whose work an import does once per batch instead
+BATCH_TRIGGERS = (
+    "cards_fts_ai",
+    "cards_changes_ai",
+    "cards_count_ai",
+    "card_tags_changes_ai",
+)
+# Line errors listed in an import's result; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+INCLUDE = ("active", "archived")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# CSV rows are cards; tag names are joined into one cell
+CSV_HEADER = CARD_NAMES + ("tags",)
+CSV_TAG_SEPARATOR = "; "
+
+_card_fields = [f for f in CARD_FIELDS if f is not None]
+_record = TypeAdapter(ImportRecord)
+
+
+async def _snapshot(db: AsyncSession) -> None:
+    """Read everything that follows in one transaction.
+
+    The SQLite driver only opens transactions for writes, so each SELECT
+    would otherwise see the database as of its own start.
+    """
+    conn = await db.connection()
+    if conn.dialect.name == "sqlite":
+        await conn.exec_driver_sql("BEGIN")
+
+
+def _include(value: str) -> tuple[str, ...]:
+    parts = {part.strip() for part in value.split(",") if part.strip()}
+    unknown = parts.difference(INCLUDE)
+    if unknown or not parts:
+        raise HTTPException(
+            400, f"include takes a comma-separated list of {', '.join(INCLUDE)}"
+        )
+    return tuple(part for part in INCLUDE if part in parts)
+
+
+async def _card_batches(db: AsyncSession, include: tuple[str, ...]):
+    """Lists of card dicts, with tag names, streamed from the database.
+
+    Active cards come column by column in board order, numbered, from one
+    cursor per column so that each reads the rank index in order; archived
+    ones come newest first, without a position.
+    """
+    stmt = select(*_card_fields)
+    names = [f.key for f in _card_fields]
+    queries = []
+    if "active" in include:
+        active = stmt.where(ACTIVE).order_by(Card.rank, Card.id)
+        column_ids = await db.scalars(select(Column.id).order_by(Column.position))
+        queries += [active.where(Card.column_id == cid) for cid in column_ids]
+        queries.append(active.where(Card.column_id.is_(None)))
+    if "archived" in include:
+        archived = stmt.where(Card.is_archived == True)  # noqa: E712
+        queries.append(archived.order_by(Card.archived_at.desc(), Card.id.desc()))
+
+    # Rows come through Core, skipping the ORM's result processing
+    conn = await db.connection()
+    for query in queries:
+        position = 0
+        result = await conn.stream(query.execution_options(yield_per=EXPORT_BATCH))
+        async for rows in result.partitions():
+            cards = {}
+            for row in rows:
+                card = dict(zip(names, row))
+                card["position"] = None
+                if not card["is_archived"]:
+                    card["position"] = position
+                    position += 1
+                card = {name: card[name] for name in CARD_NAMES}
+                card["tags"] = []
+                cards[card["id"]] = card
+            tags = await conn.execute(
+                select(CardTag.card_id, Tag.name)
+                .join(Tag, Tag.id == CardTag.tag_id)
+                .where(CardTag.card_id.in_(cards))
+                .order_by(Tag.name)
+            )
+            for card_id, name in tags:
+                cards[card_id]["tags"].append(name)
+            yield list(cards.values())
+
+
+async def _ndjson(db: AsyncSession, include: tuple[str, ...]):
+    columns = await db.execute(select(*COLUMN_FIELDS).order_by(Column.position))
+    yield b"".join(
+        dumps({"type": "column", **dict(zip(COLUMN_NAMES, row))}) + b"\n"
+        for row in columns
+    )
+    tags = await db.execute(select(*TAG_FIELDS).order_by(Tag.name))
+    yield b"".join(
+        dumps({"type": "tag", **dict(zip(TAG_NAMES, row))}) + b"\n" for row in tags
+    )
+    async for cards in _card_batches(db, include):
+        yield b"".join(dumps({"type": "card", **card}) + b"\n" for card in cards)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return isoformat(value)
+    return value
+
+
+async def _csv(db: AsyncSession, include: tuple[str, ...]):
+    buffer = io.StringIO()
+    out = csv.writer(buffer)
+    out.writerow(CSV_HEADER)
+    async for cards in _card_batches(db, include):
+        for card in cards:
+            card["tags"] = CSV_TAG_SEPARATOR.join(card["tags"])
+            out.writerow([_csv_value(card[name]) for name in CSV_HEADER])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get("/export", dependencies=[Depends(board_etag)])
+async def export_board(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    include: str = Query("active,archived"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The whole board, streamed; memory use does not grow with its size.
+
+    ``ndjson`` writes one record per line, each with a ``type``: the columns,
+    then the tags, then the cards, whose ``tags`` are tag names. ``csv``
+    writes the cards only, tag names joined by ``"; "``. ``include`` picks
+    active and/or archived cards. Everything is read in the same transaction
+    as the version in ``ETag``, so the export is a consistent snapshot.
+    """
+    parts = _include(include)
+    await _snapshot(db)
+    version = etag(await current(db))
+    body = _ndjson(db, parts) if format == "ndjson" else _csv(db, parts)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "ETag": version,
+            "Content-Disposition": f'attachment; filename="board.{format}"',
+        },
+    )
+
+
+async def _lines(chunks):
+    """Numbered lines of a streamed body, as its chunks arrive."""
+    number, rest = 0, b""
+    async for chunk in chunks:
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            number += 1
+            yield number, line
+    if rest:
+        yield number + 1, rest
+
+
+def _validation_message(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+async def _insert_cards(db: AsyncSession, cards: list[dict], links: list[dict]) -> None:
+    """Insert a batch of cards and their tag links, indexed and logged.
+
+    On SQLite the search index, change log and card count triggers, which
+    would run once per row, are dropped for the inserts and put back before
+    the transaction ends; one statement each then indexes, logs and counts
+    the whole batch. DDL is
+    transactional there, so no other writer ever sees the triggers missing.
+    """
+    conn = await db.connection()
+    if conn.dialect.name != "sqlite":
+        await db.execute(insert(Card.__table__), cards)
+        if links:
+            await db.execute(insert(CardTag.__table__), links)
+        return
+
+    # Without a transaction the DROPs would commit on their own
+    await begin_write(db)
+    triggers = (
+        await conn.execute(
+            text(
+                "SELECT name, sql FROM sqlite_master"
+                " WHERE type = 'trigger' AND name IN :names"
+            ).bindparams(bindparam("names", BATCH_TRIGGERS, expanding=True))
+        )
+    ).all()
+    for name, _ in triggers:
+        await conn.exec_driver_sql(f"DROP TRIGGER {name}")
+
+    # New rows get rowids above every existing one
+    last = await db.scalar(
+        select(func.coalesce(func.max(literal_column("rowid")), 0)).select_from(Card)
+    )
+    await db.execute(insert(Card.__table__), cards)
+    if links:
+        await db.execute(insert(CardTag.__table__), links)
+    await conn.execute(
+        text("""
+            INSERT INTO cards_fts(rowid, title, description)
+            SELECT rowid, title, description FROM cards WHERE rowid > :last
+            """),
+        {"last": last},
+    )
+    await conn.execute(
+        text("""
+            INSERT INTO changes (entity, entity_id, deleted, seq)
+            SELECT 'card', id, 0,
+                   (SELECT coalesce(max(seq), 0) FROM changes)
+                   + row_number() OVER (ORDER BY rowid)
+            FROM cards WHERE rowid > :last
+            ON CONFLICT (entity, entity_id)
+            DO UPDATE SET deleted = 0, seq = excluded.seq
+            """),
+        {"last": last},
+    )
+    await conn.execute(
+        text("""
+            UPDATE columns SET card_count = card_count + added.n
+            FROM (
+                SELECT column_id, count(*) AS n FROM cards
+                WHERE rowid > :last AND is_archived = 0 GROUP BY column_id
+            ) AS added
+            WHERE columns.id = added.column_id
+            """),
+        {"last": last},
+    )
+
+    for _, sql in triggers:
+        await conn.exec_driver_sql(sql)
+
+
+class Importer:
+    """One import: where the file's ids landed, and the rows waiting to be written.
+
+    Columns and tags are resolved as their lines arrive, against the board
+    and against earlier lines, so cards can refer to them right away. Cards
+    are written ``IMPORT_BATCH`` at a time, each batch in one transaction.
+    """
+
+    def __init__(self):
+        # File column id -> board column id (existing columns map to themselves)
+        self.columns: dict[str, str] = {}
+        # Tag name -> id, for the board's tags and the ones being created
+        self.tags: dict[str, str] = {}
+        self.tag_ids: set[str] = set()
+        self.next_position = 0
+        self.pending_columns: list[dict] = []
+        self.pending_tags: list[dict] = []
+        # (line, card row, tag ids)
+        self.pending_cards: list[tuple[int, dict, list[str]]] = []
+        self.lines = 0
+        self.created = {"columns": 0, "tags": 0, "cards": 0}
+        self.error_count = 0
+        self.errors: list[ImportLineError] = []
+
+    async def load(self, db: AsyncSession) -> None:
+        for column_id, position in await db.execute(select(Column.id, Column.position)):
+            self.columns[column_id] = column_id
+            self.next_position = max(self.next_position, position + 1)
+        for tag_id, name in await db.execute(select(Tag.id, Tag.name)):
+            self.tags[name] = tag_id
+            self.tag_ids.add(tag_id)
+
+    def error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportLineError(line=line, error=message))
+
+    def _tag(self, name: str, record: ImportTag | None = None) -> str:
+        """Id of the tag called ``name``, creating it if there is none."""
+        if name in self.tags:
+            return self.tags[name]
+        tag_id = record.id if record else None
+        if tag_id is None or tag_id in self.tag_ids:
+            tag_id = str(uuid.uuid4())
+        tag = {"id": tag_id, "name": name}
+        if record:
+            tag.update(record.model_dump(include={"color", "bg_color", "fg_color"}))
+        self.pending_tags.append(tag)
+        self.tags[name] = tag["id"]
+        self.tag_ids.add(tag["id"])
+        return tag["id"]
+
+    def add(self, line: int, raw: bytes) -> None:
+        self.lines = line
+        if not raw.strip():
+            return
+        try:
+            record = _record.validate_json(raw)
+        except ValidationError as exc:
+            self.error(line, _validation_message(exc))
+            return
+
+        if isinstance(record, ImportColumn):
+            if record.id in self.columns:
+                # Already on the board (or earlier in the file): cards join it
+                return
+            column_id = record.id or str(uuid.uuid4())
+            self.pending_columns.append(
+                {
+                    "id": column_id,
+                    "name": record.name,
+                    "position": self.next_position,
+                    "is_done_column": record.is_done_column,
+                }
+            )
+            self.next_position += 1
+            self.columns[column_id] = column_id
+        elif isinstance(record, ImportTag):
+            self._tag(record.name, record)
+        else:
+            column_id = None
+            if record.column_id is not None:
+                column_id = self.columns.get(record.column_id)
+                if column_id is None:
+                    self.error(line, f"Unknown column {record.column_id!r}")
+                    return
+            elif not record.is_archived:
+                self.error(line, "column_id is required for active cards")
+                return
+            now = datetime.now(timezone.utc)
+            card = record.model_dump(
+                include={
+                    "title",
+                    "description",
+                    "image_url",
+                    "due_date",
+                    "is_archived",
+                    "archived_at",
+                }
+            )
+            card.update(
+                id=record.id or str(uuid.uuid4()),
+                column_id=column_id,
+                created_at=record.created_at or now,
+                updated_at=now,
+            )
+            if not record.is_archived:
+                card["archived_at"] = None
+            elif card["archived_at"] is None:
+                card["archived_at"] = now
+            tag_ids = [self._tag(name) for name in dict.fromkeys(record.tags)]
+            self.pending_cards.append((line, card, tag_ids))
+
+    @property
+    def full(self) -> bool:
+        return len(self.pending_cards) >= IMPORT_BATCH
+
+    async def flush(self, db: AsyncSession) -> None:
+        """Write the pending rows in one transaction."""
+        columns, tags, cards = (
+            self.pending_columns,
+            self.pending_tags,
+            self.pending_cards,
+        )
+        self.pending_columns, self.pending_tags, self.pending_cards = [], [], []
+        if not (columns or tags or cards):
+            return
+
+        async def apply(db: AsyncSession) -> tuple[int, list[tuple[int, str]]]:
+            # Runs again from scratch if a write queue group is retried
+            if columns:
+                await db.execute(insert(Column), columns)
+            if tags:
+                await db.execute(insert(Tag), tags)
+            if not cards:
+                return 0, []
+
+            ids = [card["id"] for _, card, _ in cards]
+            taken = set(await db.scalars(select(Card.id).where(Card.id.in_(ids))))
+            errors, seen, rows, links = [], set(), [], []
+            for line, card, tag_ids in cards:
+                if card["id"] in taken or card["id"] in seen:
+                    errors.append((line, f"Card {card['id']!r} already exists"))
+                    continue
+                seen.add(card["id"])
+                rows.append(card)
+                links += [{"card_id": card["id"], "tag_id": t} for t in tag_ids]
+
+            # Cards go after each column's last active card, in file order
+            column_ids = {card["column_id"] for card in rows} - {None}
+            last = dict(
+                (
+                    await db.execute(
+                        select(Card.column_id, func.max(Card.rank))
+                        .where(ACTIVE, Card.column_id.in_(column_ids))
+                        .group_by(Card.column_id)
+                    )
+                ).all()
+            )
+            ranked = []
+            for card in rows:
+                rank = ranking.key_between(last.get(card["column_id"]), None)
+                last[card["column_id"]] = rank
+                ranked.append({**card, "rank": rank})
+            if ranked:
+                await _insert_cards(db, ranked, links)
+            return len(ranked), errors
+
+        created, errors = await writer.write(db, apply)
+        self.created["columns"] += len(columns)
+        self.created["tags"] += len(tags)
+        self.created["cards"] += created
+        for line, message in errors:
+            self.error(line, message)
+        broadcast.publish("import.progress", {"lines": self.lines, **self.created})
+
+    def result(self) -> ImportResult:
+        return ImportResult(
+            lines=self.lines,
+            **self.created,
+            error_count=self.error_count,
+            errors=sorted(self.errors, key=lambda error: error.line),
+        )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_board(request: Request, db: AsyncSession = Depends(get_db)):
+    """Add the columns, tags and cards of an NDJSON dump to the board.
+
+    The body is read and parsed line by line as it arrives, in the format
+    ``GET /export?format=ndjson`` writes; cards are written in batches, each
+    in one transaction, appended to their columns in file order. Lines that
+    cannot be imported are skipped and reported with their line number;
+    batches already written stay written. ``import.progress`` events report
+    each batch as it is committed.
+    """
+    importer = Importer()
+    await importer.load(db)
+    async for line, raw in _lines(request.stream()):
+        importer.add(line, raw)
+        if importer.full:
+            await importer.flush(db)
+    await importer.flush(db)
+    result = importer.result()
+    broadcast.publish(
+        "board.imported",
+        {"columns": result.columns, "tags": result.tags, "cards": result.cards},
+    )
+    return result
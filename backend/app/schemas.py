@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 
 # --- Tags ---
 
@@ -40,6 +41,8 @@ class CardUpdate(BaseModel):
     image_url: str | None = None
     due_date: datetime | None = None
     tag_ids: list[str] | None = None
+    # Apply only if the card is still at this version (else 409)
+    version: int | None = None
 
 
 class CardOut(BaseModel):
@@ -54,15 +57,23 @@ class CardOut(BaseModel):
     due_date: datetime | None
     created_at: datetime
     updated_at: datetime
+    version: int
     tags: list[TagOut] = []
 
     model_config = {"from_attributes": True}
 
 
+class CardSearchOut(CardOut):
+    # Best matching fragment with hits wrapped in <mark>; None outside searches
+    snippet: str | None = None
+
+
 class CardMove(BaseModel):
     card_id: str
     target_column_id: str
     position: int
+    # Apply only if the card is still at this version (else 409)
+    version: int | None = None
 
 
 # --- Columns ---
@@ -76,20 +87,68 @@ class ColumnCreate(BaseModel):
 class ColumnUpdate(BaseModel):
     name: str | None = None
     is_done_column: bool | None = None
+    # Apply only if the column is still at this version (else 409)
+    version: int | None = None
 
 
-class ColumnOut(BaseModel):
+class ColumnSummaryOut(BaseModel):
     id: str
     name: str
     position: int
     is_done_column: bool
     created_at: datetime
     updated_at: datetime
-    cards: list[CardOut] = []
+    version: int
 
     model_config = {"from_attributes": True}
 
 
+class ColumnOut(ColumnSummaryOut):
+    # Read from Column.active_cards when validating ORM columns
+    cards: list[CardOut] = Field(
+        [], validation_alias=AliasChoices("active_cards", "cards")
+    )
+
+
+class ColumnPreviewOut(ColumnOut):
+    # With ``?card_limit=``: ``cards`` holds the first ones of ``card_count``
+    card_count: int
+    next_cursor: str | None
+
+
+class ColumnCardsPage(BaseModel):
+    items: list[CardOut]
+    total: int
+    next_cursor: str | None
+
+
+class CompactCardOut(BaseModel):
+    # Fields not listed in ``?fields=`` are left out, except ``id``
+    id: str
+    column_id: str | None
+    title: str
+    description: str | None
+    image_url: str | None
+    position: int
+    is_archived: bool
+    archived_at: datetime | None
+    due_date: datetime | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+    tag_ids: list[str] = []
+
+
+class CompactColumnOut(ColumnSummaryOut):
+    cards: list[CompactCardOut] = []
+
+
+class CompactBoardOut(BaseModel):
+    # Every tag once; cards refer to them by id
+    tags: list[TagOut]
+    columns: list[CompactColumnOut]
+
+
 class ColumnReorder(BaseModel):
     column_ids: list[str]
 
@@ -104,10 +163,142 @@ class ArchiveQuery(BaseModel):
 
 
 class ArchivePage(BaseModel):
-    items: list[CardOut]
-    total: int
+    items: list[CardSearchOut]
+    # None when include_total is false
+    total: int | None
     page: int
     page_size: int
+    # Pass back as ``cursor`` for the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class RestoreAllResult(BaseModel):
+    restored: int
+
+
+# --- Changes ---
+
+
+class Deletion(BaseModel):
+    entity: str  # "card", "column" or "tag"
+    id: str
+
+
+class ChangesPage(BaseModel):
+    cards: list[CardOut]
+    columns: list[ColumnSummaryOut]
+    tags: list[TagOut]
+    deleted: list[Deletion]
+    # Pass back as ``since`` to get the changes after this page
+    cursor: str
+    has_more: bool
+
+
+# --- Batch ---
+
+
+class BatchCreate(BaseModel):
+    op: Literal["create"]
+    column_id: str
+    data: CardCreate
+
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    card_id: str
+    data: CardUpdate
+
+
+class BatchMove(CardMove):
+    op: Literal["move"]
+
+
+class BatchArchive(BaseModel):
+    op: Literal["archive"]
+    card_id: str
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    card_id: str
+
+
+BatchOperation = Annotated[
+    BatchCreate | BatchUpdate | BatchMove | BatchArchive | BatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(max_length=1000)
+
+
+class BatchResult(BaseModel):
+    op: str
+    card_id: str
+    # State after the whole batch; None once the card is deleted
+    card: CardOut | None
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchResult]
+
+
+# --- Import ---
+
+
+class ImportColumn(BaseModel):
+    type: Literal["column"]
+    # Cards refer to the column by this id; a new one is made if omitted
+    id: str | None = None
+    name: str
+    is_done_column: bool = False
+
+
+class ImportTag(BaseModel):
+    type: Literal["tag"]
+    id: str | None = None
+    name: str
+    color: str = "blue"
+    bg_color: str | None = None
+    fg_color: str | None = None
+
+
+class ImportCard(BaseModel):
+    type: Literal["card"]
+    id: str | None = None
+    # Id of a column earlier in the file or already on the board
+    column_id: str | None = None
+    title: str
+    description: str | None = None
+    image_url: str | None = None
+    due_date: datetime | None = None
+    is_archived: bool = False
+    archived_at: datetime | None = None
+    created_at: datetime | None = None
+    # Tag names; tags that do not exist yet are created
+    tags: list[str] = []
+
+
+ImportRecord = Annotated[
+    ImportColumn | ImportTag | ImportCard, Field(discriminator="type")
+]
+
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    lines: int
+    # Rows created
+    columns: int
+    tags: int
+    cards: int
+    error_count: int
+    # The first errors found, by line
+    errors: list[ImportLineError]
 
 
 # --- Board Settings ---
@@ -7,21 +7,58 @@ Usage:
   python -m app.seed --force            # Skip confirmation (DANGEROUS!)
   SEED_DB=seed.db python -m app.seed    # Use a different database file
 
+Bulk mode generates a board of any size instead of the demo cards, e.g. a
+million cards for a staging database:
+  SEED_DB=staging.db python -m app.seed --force --bulk --columns 10 --cards 100000
+  # --optimize runs VACUUM and ANALYZE once the board is in
+  SEED_DB=staging.db python -m app.seed --force --bulk --optimize
+
 For safety, consider using a separate database:
   SEED_DB=demo.db python -m app.seed --force
 """
 
+import argparse
 import asyncio
 import os
+import random
 import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import Connection, func, insert, select, text, update
 
+from app import card_counts, ranking
 from app.database import Base, async_session, engine
-from app.models import Card, CardTag, Column, Tag
+from app.models import BoardState, Card, CardTag, Change, Column, Tag
+
+WORDS = (
+    "api auth backlog billing bug cache deploy design docs export fix flaky "
+    "import index invoice login metrics migrate mobile onboarding outage "
+    "payment perf refactor release report search security signup sync test "
+    "timeout upgrade webhook"
+).split()
+COLORS = ["blue", "red", "green", "amber", "purple", "slate"]
+# Rows per executemany in bulk mode
+BATCH = 10000
+# Card columns the bulk mode fills, in the order of its row tuples
+CARD_KEYS = (
+    "id",
+    "column_id",
+    "title",
+    "description",
+    "rank",
+    "is_archived",
+    "archived_at",
+    "created_at",
+    "updated_at",
+    "version",
+)
 
 
-def confirm_seed():
+def confirm_seed(force: bool = False):
     """Ask user for confirmation before seeding."""
-    if "--force" in sys.argv:
+    if force:
         return True
 
     db_path = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./taskflow.db")
@@ -69,35 +106,35 @@ async def seed():
                 column_id="col-todo",
                 title="Design System Update",
                 description="Update the design system with new components and tokens.",
-                position=0,
+                rank="a0",
             ),
             Card(
                 id="card-2",
                 column_id="col-todo",
                 title="User Research Interviews",
                 description="Conduct user research interviews for the new feature.",
-                position=1,
+                rank="a1",
             ),
             Card(
                 id="card-3",
                 column_id="col-inprogress",
                 title="API Integration",
                 description="Integrate the new API endpoints with the frontend.",
-                position=0,
+                rank="a0",
             ),
             Card(
                 id="card-4",
                 column_id="col-inprogress",
                 title="Component Library Cleanup",
                 description="Clean up and document the component library.",
-                position=1,
+                rank="a1",
             ),
             Card(
                 id="card-5",
                 column_id="col-done",
                 title="Setup AWS Pipeline",
                 description="Set up the CI/CD pipeline on AWS.",
-                position=0,
+                rank="a0",
             ),
         ]
         db.add_all(cards)
@@ -122,7 +159,7 @@ async def seed():
                 column_id="col-todo",
                 title="Design System Refresh",
                 description="Refresh the design system.",
-                position=0,
+                rank="a0",
                 is_archived=True,
                 archived_at=datetime(2023, 10, 12, tzinfo=timezone.utc),
             ),
@@ -131,7 +168,7 @@ async def seed():
                 column_id="col-inprogress",
                 title="API Documentation Draft",
                 description="Draft API documentation.",
-                position=0,
+                rank="a0",
                 is_archived=True,
                 archived_at=datetime(2023, 10, 10, tzinfo=timezone.utc),
             ),
@@ -140,7 +177,7 @@ async def seed():
                 column_id="col-done",
                 title="Q3 Performance Analysis",
                 description="Analyze Q3 performance metrics.",
-                position=0,
+                rank="a0",
                 is_archived=True,
                 archived_at=datetime(2023, 10, 8, tzinfo=timezone.utc),
             ),
@@ -159,9 +196,255 @@ async def seed():
         print("Database seeded successfully!")
 
 
+@dataclass(frozen=True)
+class BoardSize:
+    columns: int = 5
+    cards_per_column: int = 1000
+    tags: int = 20
+    # Share of each column's cards that are archived
+    archive_ratio: float = 0.5
+    tags_per_card: int = 2
+    seed: int = 0
+
+    @property
+    def cards(self) -> int:
+        return self.columns * self.cards_per_column
+
+    def card_id(self, column: int, index: int) -> str:
+        # Zero-padded, so ids sort in insertion order and the index on them
+        # is only ever appended to
+        width = len(str(max(self.cards_per_column - 1, 0)))
+        return f"card-{column}-{index:0{width}d}"
+
+
+def _batched(rows, size: int = BATCH):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _storage_format(conn: Connection, column):
+    """How SQLAlchemy stores values of ``column`` on this connection's dialect."""
+    impl = column.type.dialect_impl(conn.dialect)
+    return impl.bind_processor(conn.dialect) or (lambda value: value)
+
+
+def _executemany(conn: Connection, table, keys: tuple[str, ...], rows) -> None:
+    """Insert tuples of ``keys`` values, in batches, with the driver's executemany.
+
+    The statement is Core's INSERT for those columns, compiled once; rows
+    are already in storage form, which skips SQLAlchemy's per-row parameter
+    processing, the bulk of the cost for millions of small rows.
+    """
+    compiled = insert(table).compile(dialect=conn.dialect, column_keys=list(keys))
+    for batch in _batched(rows):
+        conn.exec_driver_sql(str(compiled), batch)
+
+
+def _insert_board(conn: Connection, size: BoardSize) -> None:
+    rng = random.Random(size.seed)
+    tags = [
+        {"id": f"tag-{t}", "name": f"Tag {t}", "color": COLORS[t % len(COLORS)]}
+        for t in range(size.tags)
+    ]
+    columns = [
+        {
+            "id": f"col-{c}",
+            "name": f"Column {c}",
+            "position": c,
+            "is_done_column": c == size.columns - 1,
+        }
+        for c in range(size.columns)
+    ]
+    # An empty list would insert one row of defaults
+    if tags:
+        conn.execute(insert(Tag), tags)
+    if columns:
+        conn.execute(insert(Column), columns)
+
+    # Text, timestamps and tags are drawn from pools built once, so the
+    # per-card work stays a few lookups
+    titles = [" ".join(rng.choices(WORDS, k=3)).capitalize() for _ in range(1024)]
+    descriptions = [" ".join(rng.choices(WORDS, k=20)) for _ in range(1024)]
+    # Every column gets the same ranks and archive times, so generate them once
+    ranks = ranking.keys_after(None, size.cards_per_column)
+    stamp = _storage_format(conn, Card.__table__.c.created_at)
+    start = datetime(2026, 1, 1)
+    archived_at = [
+        stamp(start + timedelta(minutes=i)) for i in range(size.cards_per_column)
+    ]
+    created = stamp(start)
+    tags_per_card = min(size.tags_per_card, size.tags)
+
+    card_ids = [
+        [size.card_id(c, i) for i in range(size.cards_per_column)]
+        for c in range(size.columns)
+    ]
+    # Runs of consecutive tags from each first tag: distinct, and cheap to pick
+    tag_runs = [
+        [f"tag-{t % size.tags}" for t in range(first, first + tags_per_card)]
+        for first in range(size.tags)
+    ]
+
+    def cards():
+        for c in range(size.columns):
+            column_id = f"col-{c}"
+            for i, rank in enumerate(ranks):
+                archived = rng.random() < size.archive_ratio
+                yield (
+                    card_ids[c][i],
+                    column_id,
+                    f"{rng.choice(titles)} {i}",
+                    rng.choice(descriptions),
+                    rank,
+                    int(archived),
+                    archived_at[i] if archived else None,
+                    created,
+                    created,
+                    1,
+                )
+
+    def card_tags():
+        if not tag_runs:
+            return
+        for ids in card_ids:
+            for card_id in ids:
+                for tag_id in rng.choice(tag_runs):
+                    yield (card_id, tag_id)
+
+    _executemany(conn, Card.__table__, CARD_KEYS, cards())
+    _executemany(conn, CardTag.__table__, ("card_id", "tag_id"), card_tags())
+
+
+def _log_changes(conn: Connection) -> None:
+    """Record the reload in the change log, set-based.
+
+    Every entity logged so far is marked deleted and every new one written,
+    all with sequence numbers above any a client has seen.
+    """
+    top = conn.execute(select(func.coalesce(func.max(Change.seq), 0))).scalar_one()
+    # Shifting every seq by the maximum keeps them unique along the way
+    conn.execute(update(Change).values(deleted=True, seq=Change.seq + top))
+    for entity, table_name in (
+        ("card", "cards"),
+        ("column", "columns"),
+        ("tag", "tags"),
+    ):
+        conn.execute(
+            text(f"""
+                INSERT INTO changes (entity, entity_id, deleted, seq)
+                SELECT :entity, id, 0,
+                       (SELECT coalesce(max(seq), 0) FROM changes)
+                       + row_number() OVER (ORDER BY rowid)
+                FROM {table_name} WHERE true
+                ON CONFLICT (entity, entity_id)
+                DO UPDATE SET deleted = 0, seq = excluded.seq
+                """),
+            {"entity": entity},
+        )
+
+
+def bulk_seed(conn: Connection, size: BoardSize, optimize: bool = False) -> None:
+    """Replace all columns, cards and tags with a generated board of ``size``.
+
+    Rows go in through Core executemany in batches of ``BATCH``, in one
+    transaction, with foreign key checks off. The search index, change log
+    and card count triggers are dropped for the load, which would otherwise
+    run once per row, and put back afterwards; the index is then rebuilt,
+    the change log written and the cards counted in a few set-based
+    statements. ``optimize`` runs
+    ``VACUUM`` and ``ANALYZE`` once the data is in. ``conn`` must not be in
+    a transaction.
+    """
+    Base.metadata.create_all(conn)
+    conn.commit()
+
+    foreign_keys = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+    conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    # The driver would only begin at the first INSERT, after the DROPs
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+    triggers = conn.execute(
+        text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+    ).all()
+    for name, _ in triggers:
+        conn.exec_driver_sql(f"DROP TRIGGER {name}")
+
+    # Without triggers, SQLite empties whole tables without visiting rows
+    for model in [CardTag, Card, Tag, Column]:
+        conn.execute(model.__table__.delete())
+    _insert_board(conn, size)
+    conn.exec_driver_sql("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+    _log_changes(conn)
+    conn.exec_driver_sql(card_counts.RECOUNT)
+    conn.execute(update(BoardState).values(version=BoardState.version + 1))
+
+    for _, sql in triggers:
+        conn.exec_driver_sql(sql)
+    conn.commit()
+    conn.exec_driver_sql(f"PRAGMA foreign_keys={foreign_keys}")
+
+    if optimize:
+        conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("ANALYZE")
+        # VACUUM rewrote the whole file through the WAL; give that space back
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.commit()
+
+
+async def seed_bulk(size: BoardSize, optimize: bool = False) -> None:
+    async with engine.connect() as conn:
+        await conn.run_sync(bulk_seed, size, optimize)
+    print(f"Database seeded with {size.cards} cards!")
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = BoardSize()
+    parser.add_argument("--columns", type=int, default=defaults.columns)
+    parser.add_argument(
+        "--cards",
+        type=int,
+        default=defaults.cards_per_column,
+        help="cards per column, archived ones included",
+    )
+    parser.add_argument("--tags", type=int, default=defaults.tags)
+    parser.add_argument(
+        "--archived",
+        type=float,
+        default=defaults.archive_ratio,
+        help="share of cards that are archived",
+    )
+    parser.add_argument("--tags-per-card", type=int, default=defaults.tags_per_card)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def size_from(args: argparse.Namespace) -> BoardSize:
+    return BoardSize(
+        columns=args.columns,
+        cards_per_column=args.cards,
+        tags=args.tags,
+        archive_ratio=args.archived,
+        tags_per_card=args.tags_per_card,
+        seed=args.seed,
+    )
+
+
 if __name__ == "__main__":
-    if not confirm_seed():
+    parser = argparse.ArgumentParser(description="Seed the database.")
+    parser.add_argument("--force", action="store_true", help="skip confirmation")
+    parser.add_argument(
+        "--bulk", action="store_true", help="generate a board of the given size"
+    )
+    parser.add_argument(
+        "--optimize", action="store_true", help="VACUUM and ANALYZE after --bulk"
+    )
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    if not confirm_seed(args.force):
         print("❌ Seeding cancelled.")
         sys.exit(0)
 
-    asyncio.run(seed())
+    if args.bulk:
+        asyncio.run(seed_bulk(size_from(args), args.optimize))
+    else:
+        asyncio.run(seed())
@@ -0,0 +1,81 @@
+"""Coalescing of identical concurrent reads (single flight).
+
+When many clients refresh at once (after a deploy, or when SSE clients
+reconnect together) they send the same read at the same moment. The first
+request for a key runs it; requests for the same key arriving while it is in
+flight wait for its result instead of running the same queries again. Keys
+include the board version the request saw, so a request never gets a body
+older than its own ETag.
+
+If the request running the work is cancelled (its client went away), one of
+the waiting requests runs it again for the others.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    # Failures reach the requests that share them; don't log them as unhandled
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    def __init__(self):
+        self.flights: dict[Hashable, asyncio.Future] = {}
+        # Requests that ran the work, and requests that shared someone's
+        self.leaders = 0
+        self.followers = 0
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        while (flight := self.flights.get(key)) is not None:
+            self.followers += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    # This request was cancelled, not the one it waited for
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve)
+        self.flights[key] = future
+        self.leaders += 1
+        try:
+            result = await work()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self.flights.get(key) is future:
+                del self.flights[key]
+
+    def metrics(self) -> dict:
+        return {
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "in_flight": len(self.flights),
+        }
+
+
+flights = SingleFlight()
+
+
+async def coalesce(route: str, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+    """Run ``work``, shared with concurrent requests for the same route and key
+    if the route is listed in ``settings.single_flight_routes``."""
+    if route not in settings.single_flight_routes:
+        return await work()
+    return await flights.run((route, key), work)
@@ -0,0 +1,103 @@
+"""Board-wide version counter and ETag support for board reads.
+
+Every transaction that writes anything bumps ``board_state.version`` right
+before it commits, so the version changes whenever the board may have
+changed. Read endpoints expose it as a strong ETag and answer
+``304 Not Modified`` when the client already holds the current version,
+which costs a single-row lookup instead of a board query.
+"""
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.models import BoardState
+
+_DIRTY = "board_dirty"
+VERSION = "board_version"
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info[_DIRTY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[_DIRTY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump(session):
+    # Commit flushes pending changes only after this hook, so check them too
+    pending = session.new or session.dirty or session.deleted
+    if not (session.info.pop(_DIRTY, False) or pending):
+        return
+    result = session.execute(
+        update(BoardState)
+        .where(BoardState.id == 1)
+        .values(version=BoardState.version + 1)
+        .returning(BoardState.version)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        version = 1
+        session.execute(insert(BoardState).values(id=1, version=version))
+    # The bump itself marked the session dirty again
+    session.info.pop(_DIRTY, None)
+    # The version this transaction committed; app.board_cache takes it on commit
+    session.info[VERSION] = version
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop(_DIRTY, None)
+
+
+async def current(db: AsyncSession) -> int:
+    result = await db.execute(select(BoardState.version).where(BoardState.id == 1))
+    return result.scalar_one_or_none() or 0
+
+
+async def current_instance(db: AsyncSession) -> tuple[str | None, int]:
+    """The database's instance id and version: together, a key for its state.
+
+    Versions alone repeat across databases, which all start at 0.
+    """
+    result = await db.execute(
+        select(BoardState.instance, BoardState.version).where(BoardState.id == 1)
+    )
+    row = result.one_or_none()
+    return (row.instance, row.version) if row else (None, 0)
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _if_none_match(request: Request) -> set[str]:
+    header = request.headers.get("if-none-match", "")
+    # If-None-Match uses weak comparison, so W/"3" matches "3"
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag}
+
+
+async def board_etag(
+    request: Request, response: Response, db: AsyncSession = Depends(get_read_db)
+) -> str:
+    """Tag the response with the board version, or answer 304 if unchanged."""
+    tag = etag(await current(db))
+    client_tags = _if_none_match(request)
+    if tag in client_tags or "*" in client_tags:
+        raise HTTPException(304, headers={"ETag": tag})
+    response.headers["ETag"] = tag
+    # Let browsers keep the body but revalidate it on every use
+    response.headers["Cache-Control"] = "no-cache"
+    return tag
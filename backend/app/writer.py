@@ -0,0 +1,112 @@
+"""Optional single-writer queue with group commit.
+
+SQLite runs one write transaction at a time, so concurrent requests that each
+commit on their own mostly wait for the database lock, and every commit pays
+for its own fsync. With ``settings.write_queue`` enabled, write routes hand
+their work to one writer task instead: it takes every job waiting in the
+queue, runs them one after another in a single transaction, commits once and
+resolves each request with its own job's result.
+
+A job is an async function of a session that writes without committing (see
+``app.card_ops``). If one job raises, the group is rolled back, that job's
+request gets the exception, and the others are run again without it, so one
+bad request never fails its neighbours. Jobs must therefore be safe to run
+again from scratch, and side effects such as publishing events belong after
+``write`` returns, not inside the job.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Job = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteQueue:
+    def __init__(self, sessions: async_sessionmaker, max_group: int = 100):
+        self.sessions = sessions
+        self.max_group = max_group
+        self.queue: asyncio.Queue[tuple[Job, asyncio.Future]] = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Finish the queued jobs, then stop the writer."""
+        await self.queue.join()
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, job: Job[T]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((job, future))
+        return await future
+
+    async def _drain(self) -> None:
+        while True:
+            group = [await self.queue.get()]
+            while len(group) < self.max_group and not self.queue.empty():
+                group.append(self.queue.get_nowait())
+            try:
+                await self._commit_group(group)
+            except Exception as exc:
+                # Commit itself failed: nothing was written for anyone
+                logger.exception("Group commit failed")
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in group:
+                    self.queue.task_done()
+
+    async def _commit_group(self, group: list[tuple[Job, asyncio.Future]]) -> None:
+        while group:
+            results = []
+            async with self.sessions() as db:
+                for job, future in group:
+                    if future.cancelled():
+                        continue
+                    try:
+                        results.append((future, await job(db)))
+                    except Exception as exc:
+                        await db.rollback()
+                        # Its caller may have been cancelled meanwhile
+                        if not future.done():
+                            future.set_exception(exc)
+                        # Run the rest again, in a fresh transaction
+                        group = [(j, f) for j, f in group if f is not future]
+                        break
+                else:
+                    await db.commit()
+                    for future, result in results:
+                        if not future.done():
+                            future.set_result(result)
+                    return
+
+
+# Set by the app's lifespan when settings.write_queue is enabled
+queue: WriteQueue | None = None
+
+
+async def write(db: AsyncSession, job: Job[T]) -> T:
+    """Run ``job`` and commit it: in ``db``, or through the write queue if enabled.
+
+    With the queue the job runs in the writer's session; objects it returns are
+    detached, so reload what the response needs through ``db``.
+    """
+    if queue is None:
+        result = await job(db)
+        await db.commit()
+        return result
+    return await queue.submit(job)
@@ -0,0 +1,303 @@
+"""Latency and throughput of the API on a synthetic large board.
+
+Each scenario sends real requests to the app in-process through httpx's
+``ASGITransport``, the way the tests do, against a database file generated
+by ``benchmarks.generate``. Read scenarios and moves run ``--ops`` times on
+one copy of the board; restore-all and clear change the whole archive, so
+each runs once on a fresh copy. Results are p50/p99 latency and ops/s per
+scenario.
+
+``--save results.json`` stores a run, with the machine it ran on;
+``--baseline results.json`` compares this run to a stored one and exits with
+status 1 when a scenario's p50 got slower by more than ``--tolerance``.
+
+``--runs N`` runs the whole suite N times and keeps, for each scenario, the
+run with the median p50, which evens out a noisy machine.
+
+``benchmarks/baseline.json`` holds the agreed numbers, for the default board
+size (5 columns of 1000 cards, half of them archived), saved with
+``--runs 5``. Latencies depend on the machine, so compare on one like the
+one it names, or save a baseline of your own from the commit you start
+from. Refresh the committed one when a change moves the numbers on purpose.
+
+Usage:
+  python -m benchmarks.api --runs 3 --baseline benchmarks/baseline.json
+  python -m benchmarks.api --runs 5 --save benchmarks/baseline.json
+  python -m benchmarks.api --cards 5000 --save mine.json
+  python -m benchmarks.api --cards 5000 --baseline mine.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import board_cache
+from app.config import settings
+from app.database import apply_pragmas, get_db, get_read_db, read_only_url
+from app.main import app
+from app.seed import WORDS, BoardSize, add_size_arguments, size_from
+from benchmarks.generate import generate_file
+
+Scenario = Callable[[AsyncClient, BoardSize, random.Random], Awaitable[None]]
+
+
+async def board(client: AsyncClient, size: BoardSize, rng: random.Random) -> None:
+    (await client.get("/api/columns")).raise_for_status()
+
+
+async def board_uncached(client, size, rng) -> None:
+    board_cache.cache.clear()
+    (await client.get("/api/columns")).raise_for_status()
+
+
+async def board_compact(client, size, rng) -> None:
+    board_cache.cache.clear()
+    params = {"format": "compact", "card_limit": 50}
+    (await client.get("/api/columns", params=params)).raise_for_status()
+
+
+async def move(client, size, rng) -> None:
+    # Cards that were archived answer 404, which still costs the lookup
+    column = rng.randrange(size.columns)
+    resp = await client.put(
+        "/api/cards/move",
+        json={
+            "card_id": size.card_id(
+                rng.randrange(size.columns), rng.randrange(size.cards_per_column)
+            ),
+            "target_column_id": f"col-{column}",
+            "position": rng.randrange(10),
+        },
+    )
+    if resp.status_code != 404:
+        resp.raise_for_status()
+
+
+async def search(client, size, rng) -> None:
+    params = {"q": rng.choice(WORDS)}
+    (await client.get("/api/search", params=params)).raise_for_status()
+
+
+async def archive_pages(client, size, rng) -> None:
+    # The first page and the four after it, by cursor
+    params = {"page_size": 50, "include_total": False}
+    for _ in range(5):
+        page = (await client.get("/api/archive", params=params)).json()
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+
+async def restore_all(client, size, rng) -> None:
+    resp = await client.post("/api/archive/restore-all", params={"count_only": True})
+    resp.raise_for_status()
+
+
+async def clear(client, size, rng) -> None:
+    (await client.post("/api/archive/clear")).raise_for_status()
+
+
+REPEATED: dict[str, Scenario] = {
+    "board": board,
+    "board_uncached": board_uncached,
+    "board_compact": board_compact,
+    "search": search,
+    "archive_pages": archive_pages,
+    "move": move,
+}
+ONCE: dict[str, Scenario] = {"restore_all": restore_all, "clear": clear}
+
+
+def summary(latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        "ops": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "ops_per_s": round(len(latencies) / sum(latencies), 1),
+    }
+
+
+class Board:
+    """The app, routed to one copy of the generated database."""
+
+    def __init__(self, path: Path):
+        url = f"sqlite+aiosqlite:///{path}"
+        self.engine = create_async_engine(url)
+        apply_pragmas(self.engine, settings.sqlite_pragmas)
+        self.read_engine = create_async_engine(read_only_url(url))
+        apply_pragmas(self.read_engine, settings.sqlite_read_pragmas)
+
+    async def __aenter__(self) -> AsyncClient:
+        sessions = async_sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        read_sessions = async_sessionmaker(
+            self.read_engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        async def db():
+            async with sessions() as session:
+                yield session
+
+        async def read_db():
+            async with read_sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = db
+        app.dependency_overrides[get_read_db] = read_db
+        board_cache.cache.clear()
+        self.client = AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        )
+        return self.client
+
+    async def __aexit__(self, *exc) -> None:
+        await self.client.aclose()
+        app.dependency_overrides.clear()
+        await self.read_engine.dispose()
+        await self.engine.dispose()
+
+
+async def measure(
+    client: AsyncClient, scenario: Scenario, size: BoardSize, ops: int
+) -> list[float]:
+    rng = random.Random(size.seed)
+    latencies = []
+    for _ in range(ops):
+        start = time.perf_counter()
+        await scenario(client, size, rng)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run(args, size: BoardSize, names: list[str]) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / "template.db"
+        start = time.perf_counter()
+        generate_file(str(template), size)
+        print(f"generated {size} in {time.perf_counter() - start:.1f} s")
+
+        shared = Path(tmp) / "shared.db"
+        shutil.copy(template, shared)
+        async with Board(shared) as client:
+            for name in names:
+                if name in REPEATED:
+                    latencies = await measure(client, REPEATED[name], size, args.ops)
+                    results[name] = summary(latencies)
+        for name in names:
+            if name in ONCE:
+                copy = Path(tmp) / f"{name}.db"
+                shutil.copy(template, copy)
+                async with Board(copy) as client:
+                    latencies = await measure(client, ONCE[name], size, 1)
+                results[name] = summary(latencies)
+    return results
+
+
+def median_run(runs: list[dict]) -> dict:
+    """Each scenario's result from the run where its p50 was the median."""
+    results = {}
+    for name in runs[0]:
+        ordered = sorted((run[name] for run in runs), key=lambda r: r["p50_ms"])
+        results[name] = ordered[len(ordered) // 2]
+    return results
+
+
+def report(results: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """Print the results; returns the scenarios that regressed."""
+    regressions = []
+    print(f"{'scenario':16} {'ops':>5} {'p50 ms':>10} {'p99 ms':>10} {'ops/s':>9}")
+    for name, result in results.items():
+        line = (
+            f"{name:16} {result['ops']:5} {result['p50_ms']:10.2f}"
+            f" {result['p99_ms']:10.2f} {result['ops_per_s']:9.1f}"
+        )
+        before = (baseline or {}).get(name)
+        if before:
+            change = result["p50_ms"] / before["p50_ms"] - 1
+            line += f"  p50 {change:+.0%} vs baseline"
+            if change > tolerance:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def machine() -> dict:
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_size_arguments(parser)
+    parser.add_argument("--ops", type=int, default=50, help="runs per scenario")
+    parser.add_argument(
+        "--runs", type=int, default=1, help="suite runs; reports the median run"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[*REPEATED, *ONCE],
+        help="run only these (repeatable)",
+    )
+    parser.add_argument("--save", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="p50 slowdown over the baseline reported as a regression",
+    )
+    args = parser.parse_args()
+    size = size_from(args)
+
+    baseline = None
+    if args.baseline:
+        saved = json.loads(args.baseline.read_text())
+        if saved["size"] != asdict(size):
+            print(f"baseline was run on another board: {saved['size']}")
+        if saved.get("machine", machine()) != machine():
+            print(f"baseline was run on another machine: {saved['machine']}")
+        baseline = saved["results"]
+
+    names = args.scenario or [*REPEATED, *ONCE]
+    results = median_run(
+        [asyncio.run(run(args, size, names)) for _ in range(args.runs)]
+    )
+    regressions = report(results, baseline, args.tolerance)
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {"size": asdict(size), "machine": machine(), "results": results},
+                indent=2,
+            )
+            + "\n"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
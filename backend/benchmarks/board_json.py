@@ -0,0 +1,156 @@
+"""Time the board read: ORM objects and Pydantic models vs Core rows and orjson.
+
+The first two paths read the same seeded database and produce the same bytes;
+the first builds ORM columns and cards and validates them through the response
+models, as ``GET /api/columns`` did before ``app.board_json``. The others are
+the ``format=compact`` and ``fields=`` variants. Timings cover the queries and
+the encoding, not the HTTP layer.
+
+Usage:
+  python -m benchmarks.board_json
+  python -m benchmarks.board_json --columns 10 --cards 500 --repeat 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app import board_json, ranking
+from app.database import Base
+from app.models import Card, CardTag, Column, Tag
+from app.schemas import ColumnOut
+
+BOARD = TypeAdapter(list[ColumnOut])
+
+
+async def seed(sessions: async_sessionmaker, columns: int, cards: int) -> None:
+    async with sessions() as db:
+        await db.execute(
+            insert(Tag),
+            [
+                {"id": f"tag-{t}", "name": f"Tag {t}", "bg_color": "#aabbcc"}
+                for t in range(8)
+            ],
+        )
+        for c in range(columns):
+            await db.execute(
+                insert(Column).values(id=f"col-{c}", name=f"C{c}", position=c)
+            )
+            keys = ranking.keys_after(None, cards)
+            await db.execute(
+                insert(Card),
+                [
+                    {
+                        "id": f"card-{c}-{i}",
+                        "column_id": f"col-{c}",
+                        "title": f"Card {i}",
+                        "description": "Some words about the card " * 4,
+                        "rank": k,
+                        # One in ten is archived, filtered out of the board
+                        "is_archived": i % 10 == 9,
+                    }
+                    for i, k in enumerate(keys)
+                ],
+            )
+            await db.execute(
+                insert(CardTag),
+                [
+                    {"card_id": f"card-{c}-{i}", "tag_id": f"tag-{(i + t) % 8}"}
+                    for i in range(cards)
+                    for t in range(i % 3)
+                ],
+            )
+        await db.commit()
+
+
+async def pydantic_path(db: AsyncSession) -> bytes:
+    result = await db.execute(
+        select(Column)
+        .options(selectinload(Column.active_cards).selectinload(Card.tags))
+        .order_by(Column.position)
+    )
+    columns = result.scalars().all()
+    for col in columns:
+        ranking.number(col.active_cards)
+    return BOARD.dump_json(BOARD.validate_python(columns, from_attributes=True))
+
+
+async def fast_path(db: AsyncSession) -> bytes:
+    return board_json.dumps(await board_json.board(db))
+
+
+async def compact_path(db: AsyncSession) -> bytes:
+    return board_json.dumps(await board_json.board(db, compact=True))
+
+
+async def sparse_path(db: AsyncSession) -> bytes:
+    fields = {"title", "position", "tag_ids"}
+    return board_json.dumps(await board_json.board(db, True, fields))
+
+
+PATHS = {
+    "pydantic": pydantic_path,
+    "fast": fast_path,
+    "compact": compact_path,
+    "sparse": sparse_path,
+}
+
+
+async def measure(
+    sessions: async_sessionmaker, path, repeat: int
+) -> tuple[list[float], int]:
+    timings = []
+    for _ in range(repeat):
+        # A fresh session per read, as a request gets
+        async with sessions() as db:
+            start = time.perf_counter()
+            body = await path(db)
+            timings.append(time.perf_counter() - start)
+    return timings, len(body)
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(sessions, args.columns, args.cards)
+
+        async with sessions() as db:
+            body = await fast_path(db)
+        async with sessions() as db:
+            assert body == await pydantic_path(db), "paths disagree"
+
+        encoder = "orjson" if board_json.orjson else "json"
+        print(f"{args.columns} columns x {args.cards} cards, encoder {encoder}")
+        baseline = None
+        for name, path in PATHS.items():
+            timings, size = await measure(sessions, path, args.repeat)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(
+                f"  {name:8}  {size / 1024:6.0f} KiB  p50 {median * 1000:8.2f} ms"
+                f"  min {min(timings) * 1000:8.2f} ms  x{baseline / median:.1f}"
+            )
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=400, help="cards per column")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
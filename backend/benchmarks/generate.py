@@ -0,0 +1,36 @@
+"""Generate a synthetic board of any size into a database file.
+
+The board comes from the seeder's bulk mode (``app.seed.bulk_seed``): the
+app's own tables, filled with batched Core inserts. The same arguments and
+``seed`` always produce the same board. Ids are ``col-{c}``, ``tag-{t}``
+and ``BoardSize.card_id(c, i)``.
+
+Usage:
+  python -m benchmarks.generate board.db
+  python -m benchmarks.generate board.db --columns 10 --cards 10000 --archived 0.5
+"""
+
+import argparse
+
+from sqlalchemy import create_engine
+
+from app.seed import BoardSize, add_size_arguments, bulk_seed, size_from
+
+
+def generate_file(path: str, size: BoardSize) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        bulk_seed(conn, size)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="database file to create")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    generate_file(args.path, size_from(args))
+
+
+if __name__ == "__main__":
+    main()
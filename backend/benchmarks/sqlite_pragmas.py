@@ -0,0 +1,184 @@
+"""Concurrent reads and writes on one database file, per SQLite pragma profile.
+
+Reader processes load the board the way ``GET /api/columns`` does (columns,
+their active cards in rank order, and the cards' tags) while writer
+processes rename random cards and bump the board version, one transaction
+each, which also fires the search index and change log triggers. Workers are
+separate processes with their own connections, so they contend on SQLite's
+locks rather than on the GIL. Each profile gets a fresh database file, so the
+numbers compare like with like.
+
+Usage:
+  python -m benchmarks.sqlite_pragmas
+  python -m benchmarks.sqlite_pragmas --seconds 10 --readers 8 --writers 4
+"""
+
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+
+from app import ranking
+from app.config import settings
+from app.database import Base
+from app.models import Card, CardTag, Column, Tag
+
+PROFILES = {
+    # What connections got before pragmas were configurable: SQLite's
+    # defaults (rollback journal, synchronous=FULL) and the driver's 5 s timeout
+    "default": {"busy_timeout": 5000},
+    "tuned": settings.sqlite_pragmas,
+}
+
+READ_COLUMNS = "SELECT id FROM columns ORDER BY position"
+READ_CARDS = """
+    SELECT * FROM cards
+    WHERE column_id = ? AND is_archived = 0 ORDER BY rank
+"""
+READ_TAGS = """
+    SELECT card_tags.card_id, tags.* FROM tags
+    JOIN card_tags ON tags.id = card_tags.tag_id
+    WHERE card_tags.card_id IN (SELECT id FROM cards WHERE column_id = ?)
+"""
+WRITE_CARD = "UPDATE cards SET title = ?, updated_at = datetime('now') WHERE id = ?"
+BUMP_VERSION = "UPDATE board_state SET version = version + 1 WHERE id = 1"
+
+
+def connect(path: str, pragmas: dict) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=0)
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def seed(path: str, pragmas: dict, columns: int, cards_per_column: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for name, value in pragmas.items():
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+        Base.metadata.create_all(conn)
+        conn.execute(
+            insert(Tag), [{"id": f"tag-{t}", "name": f"T{t}"} for t in range(5)]
+        )
+        for c in range(columns):
+            conn.execute(insert(Column).values(id=f"col-{c}", name=f"C{c}", position=c))
+            keys = ranking.keys_after(None, cards_per_column)
+            conn.execute(
+                insert(Card),
+                [
+                    {
+                        "id": f"card-{c}-{i}",
+                        "column_id": f"col-{c}",
+                        "title": "Card",
+                        "rank": k,
+                    }
+                    for i, k in enumerate(keys)
+                ],
+            )
+            conn.execute(
+                insert(CardTag),
+                [
+                    {"card_id": f"card-{c}-{i}", "tag_id": f"tag-{i % 5}"}
+                    for i in range(cards_per_column)
+                ],
+            )
+    engine.dispose()
+
+
+def read(conn: sqlite3.Connection, rng: random.Random, cards: int) -> None:
+    for (column_id,) in conn.execute(READ_COLUMNS).fetchall():
+        conn.execute(READ_CARDS, (column_id,)).fetchall()
+        conn.execute(READ_TAGS, (column_id,)).fetchall()
+
+
+def write(conn: sqlite3.Connection, rng: random.Random, cards: int) -> None:
+    card_id = f"card-{rng.randrange(5)}-{rng.randrange(cards)}"
+    try:
+        conn.execute(WRITE_CARD, (f"Renamed {rng.random()}", card_id))
+        conn.execute(BUMP_VERSION)
+        conn.commit()
+    except sqlite3.OperationalError:
+        conn.rollback()
+        raise
+
+
+def worker(kind, path, pragmas, cards, deadline, seed_value, results):
+    conn = connect(path, pragmas)
+    rng = random.Random(seed_value)
+    operation = read if kind == "read" else write
+    latencies, errors = [], 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            operation(conn, rng, cards)
+        except sqlite3.OperationalError:  # database is locked
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+    conn.close()
+    results.put((kind, latencies, errors))
+
+
+def summary(name: str, latencies: list[float], errors: int, seconds: float) -> str:
+    if not latencies:
+        return f"  {name:6} no successful operations, {errors} errors"
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (
+        f"  {name:6} {len(latencies) / seconds:9.1f} ops/s"
+        f"  p50 {statistics.median(latencies) * 1000:7.2f} ms"
+        f"  p99 {p99 * 1000:7.2f} ms  errors {errors}"
+    )
+
+
+def run_profile(name: str, pragmas: dict, args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        seed(path, pragmas, 5, args.cards)
+
+        results = multiprocessing.Queue()
+        deadline = time.time() + args.seconds
+        kinds = ["read"] * args.readers + ["write"] * args.writers
+        processes = [
+            multiprocessing.Process(
+                target=worker,
+                args=(kind, path, pragmas, args.cards, deadline, i, results),
+            )
+            for i, kind in enumerate(kinds)
+        ]
+        for process in processes:
+            process.start()
+        totals = {"read": ([], 0), "write": ([], 0)}
+        for _ in processes:
+            kind, latencies, errors = results.get()
+            all_latencies, all_errors = totals[kind]
+            totals[kind] = (all_latencies + latencies, all_errors + errors)
+        for process in processes:
+            process.join()
+
+    print(f"{name}: {pragmas}")
+    print(summary("reads", *totals["read"], args.seconds))
+    print(summary("writes", *totals["write"], args.seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--cards", type=int, default=200, help="cards per column")
+    parser.add_argument("--profile", choices=PROFILES, action="append")
+    args = parser.parse_args()
+
+    for name in args.profile or PROFILES:
+        run_profile(name, PROFILES[name], args)
+
+
+if __name__ == "__main__":
+    main()
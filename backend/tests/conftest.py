@@ -1,9 +1,14 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
-from app.database import Base, get_db
+from app import board_cache, idempotency
+from app.config import settings
+from app.database import Base, apply_pragmas, get_db, get_read_db, read_only_url
 from app.main import app
+from app.routers import archive
 
 TEST_DB_URL = "sqlite+aiosqlite://"
 
@@ -17,19 +22,95 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 
 @pytest.fixture(autouse=True)
 async def setup_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # In-memory state outlives the database: versions start over with each one,
+    # so cached bodies and stored responses would be served across tests
+    board_cache.cache.clear()
+    idempotency.store.clear()
+    archive.clear_totals()
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+async def file_database(tmp_path):
+    """Route the app to a database file, read through a read-only connection.
+
+    For tests needing concurrent connections, which the in-memory database
+    shares as one. Yields the sessionmaker for writes.
+    """
+    url = f"sqlite+aiosqlite:///{tmp_path / 'board.db'}"
+    write_engine = create_async_engine(url)
+    apply_pragmas(write_engine, settings.sqlite_pragmas)
+    read_engine = create_async_engine(read_only_url(url))
+    apply_pragmas(read_engine, settings.sqlite_read_pragmas)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(
+        write_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    read_sessions = async_sessionmaker(
+        read_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def file_db():
+        async with sessions() as session:
+            yield session
+
+    async def read_file_db():
+        async with read_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = file_db
+    app.dependency_overrides[get_read_db] = read_file_db
+    yield sessions
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    await read_engine.dispose()
+    await write_engine.dispose()
+
+
 @pytest.fixture
 async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+class QueryCounter:
+    """Statements sent to the test database and ORM rows loaded from it."""
+
+    def __init__(self):
+        self.statements: list[tuple[str, tuple]] = []
+        self.loaded = 0
+
+    def reset(self):
+        self.statements.clear()
+        self.loaded = 0
+
+    def count(self, prefix: str = "") -> int:
+        return sum(1 for sql, _ in self.statements if sql.lstrip().startswith(prefix))
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append((statement, parameters))
+
+    def on_load(session, instance):
+        counter.loaded += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    event.listen(Session, "loaded_as_persistent", on_load)
+    yield counter
+    event.remove(Session, "loaded_as_persistent", on_load)
+    event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
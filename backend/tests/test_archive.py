@@ -1,5 +1,12 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+
+from app import versioning
+from app.database import Base
+from app.models import BoardState, Card
+from app.routers import archive
+from tests.conftest import QueryCounter, TestSession, engine
 
 
 @pytest.fixture
@@ -57,6 +64,57 @@ async def test_restore_all(client: AsyncClient, archived_cards: list[str]):
     assert archive.json()["total"] == 0
 
 
+@pytest.mark.anyio
+async def test_restore_all_appends_per_column(client: AsyncClient, col_id: str):
+    other = (await client.post("/api/columns", json={"name": "Doing"})).json()["id"]
+    ids = {}
+    for col, titles in ((col_id, ["A", "B", "C"]), (other, ["X", "Y"])):
+        for title in titles:
+            card = await client.post(f"/api/columns/{col}/cards", json={"title": title})
+            ids[title] = card.json()["id"]
+    for title in ("A", "C", "X", "Y"):
+        await client.post(f"/api/cards/{ids[title]}/archive")
+    await client.post(f"/api/columns/{other}/cards", json={"title": "Z"})
+    # Cards of a deleted column land in the first column
+    await client.delete(f"/api/columns/{other}")
+
+    resp = await client.post("/api/archive/restore-all")
+    assert resp.status_code == 200
+    restored = {c["title"]: (c["column_id"], c["position"]) for c in resp.json()}
+    assert restored == {
+        "A": (col_id, 1),
+        "C": (col_id, 2),
+        "X": (col_id, 3),
+        "Y": (col_id, 4),
+        "Z": (col_id, 5),
+    }
+
+    board = (await client.get("/api/columns")).json()
+    assert [c["title"] for c in board[0]["cards"]] == ["B", "A", "C", "X", "Y", "Z"]
+
+
+@pytest.mark.anyio
+async def test_restore_all_count_only(
+    client: AsyncClient, col_id: str, query_counter: QueryCounter
+):
+    for i in range(30):
+        card = (
+            await client.post(
+                f"/api/columns/{col_id}/cards", json={"title": f"Card {i}"}
+            )
+        ).json()
+        await client.post(f"/api/cards/{card['id']}/archive")
+
+    query_counter.reset()
+    resp = await client.post("/api/archive/restore-all", params={"count_only": True})
+    assert resp.json() == {"restored": 30}
+    # No per-card statements: three set-based UPDATEs and the version bump
+    assert len(query_counter.statements) == 4
+
+    board = (await client.get("/api/columns")).json()
+    assert [c["title"] for c in board[0]["cards"]] == [f"Card {i}" for i in range(30)]
+
+
 @pytest.mark.anyio
 async def test_clear_archive(client: AsyncClient, archived_cards: list[str]):
     resp = await client.post("/api/archive/clear")
@@ -90,3 +148,124 @@ async def test_recent_limit(client: AsyncClient, col_id: str):
     data = resp.json()
     assert data["total"] == 25  # Total is still 25
     assert len(data["items"]) == 10  # But only 10 items returned
+
+
+@pytest.mark.anyio
+async def test_archive_cursor_pagination(
+    client: AsyncClient, col_id: str, query_counter: QueryCounter
+):
+    for i in range(25):
+        card = (
+            await client.post(f"/api/columns/{col_id}/cards", json={"title": f"{i}"})
+        ).json()
+        await client.post(f"/api/cards/{card['id']}/archive")
+    expected = [
+        c["id"]
+        for c in (await client.get("/api/archive", params={"page_size": 100})).json()[
+            "items"
+        ]
+    ]
+
+    seen, cursor, statements = [], None, []
+    while True:
+        params = {"page_size": 10, "include_total": False}
+        if cursor:
+            params["cursor"] = cursor
+        query_counter.reset()
+        page = (await client.get("/api/archive", params=params)).json()
+        statements.append(query_counter.statements[0])
+        assert page["total"] is None
+        seen += [c["id"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected
+    # Later pages seek past the previous one instead of skipping rows
+    assert all(params[-1] == 0 for _, params in statements)
+    assert all("(cards.archived_at, cards.id) <" in sql for sql, _ in statements[1:])
+    assert len(statements) == 3
+
+
+@pytest.mark.anyio
+async def test_archive_total_is_cached_until_a_write(
+    client: AsyncClient, archived_cards: list[str], query_counter: QueryCounter
+):
+    assert (await client.get("/api/archive")).json()["total"] == 3
+    query_counter.reset()
+    assert (await client.get("/api/archive")).json()["total"] == 3
+    assert not any("count(" in sql for sql, _ in query_counter.statements)
+
+    await client.post(f"/api/cards/{archived_cards[0]}/restore")
+    assert (await client.get("/api/archive")).json()["total"] == 2
+
+
+@pytest.mark.anyio
+async def test_archive_search_cursor(client: AsyncClient, col_id: str):
+    for i in range(3):
+        card = (
+            await client.post(
+                f"/api/columns/{col_id}/cards", json={"title": f"Report {i}"}
+            )
+        ).json()
+        await client.post(f"/api/cards/{card['id']}/archive")
+
+    first = (
+        await client.get("/api/archive", params={"q": "report", "page_size": 2})
+    ).json()
+    assert len(first["items"]) == 2
+    rest = (
+        await client.get(
+            "/api/archive",
+            params={"q": "report", "page_size": 2, "cursor": first["next_cursor"]},
+        )
+    ).json()
+    assert len(rest["items"]) == 1
+    assert rest["next_cursor"] is None
+    titles = {c["title"] for c in first["items"] + rest["items"]}
+    assert titles == {"Report 0", "Report 1", "Report 2"}
+
+
+@pytest.mark.anyio
+async def test_archive_invalid_cursor(client: AsyncClient):
+    resp = await client.get("/api/archive", params={"cursor": "bogus"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_archive_totals_cache_is_bounded(
+    client: AsyncClient, archived_cards: list[str], monkeypatch
+):
+    monkeypatch.setattr(archive, "TOTALS_CACHE_SIZE", 2)
+    for q in ("alpha", "beta"):
+        await client.get("/api/archive", params={"q": q})
+    assert list(archive._totals) == ["alpha", "beta"]
+    await client.get("/api/archive", params={"q": "alpha"})
+    await client.get("/api/archive")
+    # beta was used least recently
+    assert list(archive._totals) == ["alpha", None]
+
+
+@pytest.mark.anyio
+async def test_archive_total_is_not_reused_by_a_new_database(
+    client: AsyncClient, archived_cards: list[str]
+):
+    assert (await client.get("/api/archive")).json()["total"] == 3
+    async with TestSession() as db:
+        version = await versioning.current(db)
+
+    # A fresh database that happens to reach the same version
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    col_id = (await client.post("/api/columns", json={"name": "To Do"})).json()["id"]
+    async with TestSession() as db:
+        db.add_all(
+            Card(column_id=col_id, title=f"Card {i}", rank=f"a{i}", is_archived=True)
+            for i in range(5)
+        )
+        await db.commit()
+    async with engine.begin() as conn:
+        await conn.execute(update(BoardState).values(version=version))
+
+    page = (await client.get("/api/archive")).json()
+    assert (len(page["items"]), page["total"]) == (5, 5)
@@ -0,0 +1,130 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import QueryCounter
+
+
+@pytest.fixture
+async def columns(client: AsyncClient):
+    todo = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    done = (await client.post("/api/columns", json={"name": "Done"})).json()
+    return todo["id"], done["id"]
+
+
+@pytest.mark.anyio
+async def test_batch_applies_operations_in_order(
+    client: AsyncClient, columns, query_counter: QueryCounter
+):
+    todo, done = columns
+    existing = (
+        await client.post(f"/api/columns/{todo}/cards", json={"title": "Old"})
+    ).json()
+    tag = (await client.post("/api/tags", json={"name": "Bug"})).json()
+
+    query_counter.reset()
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"op": "create", "column_id": todo, "data": {"title": "A"}},
+                {"op": "create", "column_id": todo, "data": {"title": "B"}},
+                {
+                    "op": "update",
+                    "card_id": existing["id"],
+                    "data": {"title": "Renamed", "tag_ids": [tag["id"]]},
+                },
+                {
+                    "op": "move",
+                    "card_id": existing["id"],
+                    "target_column_id": done,
+                    "position": 0,
+                },
+                {"op": "archive", "card_id": existing["id"]},
+                {"op": "delete", "card_id": existing["id"]},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["op"] for r in results] == [
+        "create",
+        "create",
+        "update",
+        "move",
+        "archive",
+        "delete",
+    ]
+    a, b = results[0]["card"], results[1]["card"]
+    assert (a["title"], a["position"], b["title"], b["position"]) == ("A", 0, "B", 1)
+    # Results hold the state after the batch, and the card ended up deleted
+    assert all(r["card"] is None for r in results[2:])
+    assert {r["card_id"] for r in results[2:]} == {existing["id"]}
+    # One transaction: the board version is bumped once
+    assert query_counter.count("UPDATE board_state") == 1
+
+    board = (await client.get("/api/columns")).json()
+    assert [[c["title"] for c in col["cards"]] for col in board] == [["A", "B"], []]
+
+
+@pytest.mark.anyio
+async def test_batch_returns_updated_tags(client: AsyncClient, columns):
+    todo, _ = columns
+    tag = (await client.post("/api/tags", json={"name": "Bug"})).json()
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"op": "create", "column_id": todo, "data": {"title": "A"}},
+            ]
+        },
+    )
+    card_id = resp.json()["results"][0]["card_id"]
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"op": "update", "card_id": card_id, "data": {"tag_ids": [tag["id"]]}},
+                {
+                    "op": "move",
+                    "card_id": card_id,
+                    "target_column_id": todo,
+                    "position": 0,
+                },
+            ]
+        },
+    )
+    results = resp.json()["results"]
+    assert [[t["name"] for t in r["card"]["tags"]] for r in results] == [
+        ["Bug"],
+        ["Bug"],
+    ]
+
+
+@pytest.mark.anyio
+async def test_failed_operation_rolls_back_the_batch(client: AsyncClient, columns):
+    todo, _ = columns
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"op": "create", "column_id": todo, "data": {"title": "A"}},
+                {"op": "archive", "card_id": "missing"},
+            ]
+        },
+    )
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == {
+        "index": 1,
+        "op": "archive",
+        "detail": "Card not found",
+    }
+    board = (await client.get("/api/columns")).json()
+    assert all(col["cards"] == [] for col in board)
+
+
+@pytest.mark.anyio
+async def test_unknown_operation_is_rejected(client: AsyncClient):
+    resp = await client.post(
+        "/api/batch", json={"operations": [{"op": "explode", "card_id": "x"}]}
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,99 @@
+import pytest
+from httpx import AsyncClient
+
+from app import board_cache
+from app.board_cache import BoardCache, LocalInvalidation
+from tests.conftest import QueryCounter
+
+
+@pytest.fixture
+async def column(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+    return col["id"]
+
+
+@pytest.mark.anyio
+async def test_board_is_served_from_cache(
+    client: AsyncClient, column, query_counter: QueryCounter
+):
+    before = board_cache.cache.metrics()
+    first = await client.get("/api/columns")
+    query_counter.reset()
+    second = await client.get("/api/columns")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    # Only the board version is read
+    assert query_counter.count("SELECT") == 1
+
+    metrics = (await client.get("/api/metrics")).json()["board_cache"]
+    assert metrics["hits"] - before["hits"] == 1
+    assert metrics["rebuilds"] - before["rebuilds"] == 1
+    assert metrics["entries"] == 1
+    assert 0 < metrics["hit_rate"] <= 1 and metrics["rebuild_seconds_avg"] > 0
+
+
+@pytest.mark.anyio
+async def test_queries_are_cached_separately(client: AsyncClient, column):
+    full = await client.get("/api/columns")
+    compact = await client.get("/api/columns", params={"format": "compact"})
+    assert compact.content != full.content
+    again = await client.get("/api/columns", params={"format": "compact"})
+    assert again.content == compact.content
+    assert len(board_cache.cache.entries) == 2
+
+
+@pytest.mark.anyio
+async def test_every_write_invalidates(client: AsyncClient, column):
+    card = (await client.get("/api/columns")).json()[0]["cards"][0]["id"]
+    writes = [
+        ("POST", f"/api/columns/{column}/cards", {"title": "B"}),
+        ("PATCH", f"/api/cards/{card}", {"title": "Renamed"}),
+        ("POST", "/api/tags", {"name": "Bug"}),
+        ("PATCH", f"/api/columns/{column}", {"name": "Doing"}),
+        ("POST", f"/api/cards/{card}/archive", None),
+        ("POST", "/api/archive/restore-all", None),
+        ("PATCH", "/api/board-settings", {"title": "Roadmap"}),
+        ("POST", "/api/columns", {"name": "Done"}),
+    ]
+    for method, url, body in writes:
+        before = await client.get("/api/columns")
+        resp = await client.request(method, url, json=body)
+        assert resp.status_code < 300, (url, resp.text)
+        after = await client.get("/api/columns")
+        assert after.headers["etag"] != before.headers["etag"], url
+        board_cache.cache.clear()
+        fresh = await client.get("/api/columns")
+        assert after.content == fresh.content, url
+
+
+@pytest.mark.anyio
+async def test_cache_limits():
+    cache = BoardCache(max_entries=2, max_bytes=10, ttl=60)
+    cache.put("a", "1", b"aaaa")
+    cache.put("b", "1", b"bbbb")
+    cache.get("a", "1")
+    cache.put("c", "1", b"cccc")
+    # Least recently used goes first
+    assert list(cache.entries) == ["a", "c"]
+    cache.put("d", "1", b"ddddddd")
+    assert list(cache.entries) == ["d"] and cache.size == 7
+    cache.put("e", "1", b"e" * 11)
+    assert "e" not in cache.entries
+
+    assert cache.get("d", "2") is None
+    assert "d" not in cache.entries
+
+    expiring = BoardCache(ttl=0)
+    expiring.put("a", "1", b"a")
+    assert expiring.get("a", "1") is None
+
+
+@pytest.mark.anyio
+async def test_invalidation_goes_through_the_backend():
+    channel = LocalInvalidation()
+    here, there = BoardCache(backend=channel), BoardCache(backend=channel)
+    there.put("a", "1", b"a")
+    here.invalidate()
+    assert not there.entries
+    assert there.stats.invalidations == 1
@@ -0,0 +1,147 @@
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app import board_json, ranking
+from app.models import Card, Column, Tag
+from app.schemas import ColumnOut, TagOut
+from tests.conftest import TestSession
+
+
+async def pydantic_board() -> bytes:
+    """``GET /api/columns`` through ORM columns and the response models."""
+    async with TestSession() as db:
+        result = await db.execute(
+            select(Column)
+            .options(selectinload(Column.active_cards).selectinload(Card.tags))
+            .order_by(Column.position)
+        )
+        columns = result.scalars().all()
+        for col in columns:
+            ranking.number(col.active_cards)
+        adapter = TypeAdapter(list[ColumnOut])
+        return adapter.dump_json(adapter.validate_python(columns, from_attributes=True))
+
+
+@pytest.fixture
+async def board(client: AsyncClient):
+    todo = (await client.post("/api/columns", json={"name": "To Do"})).json()["id"]
+    await client.post("/api/columns", json={"name": 'Done "✓"', "is_done_column": True})
+    await client.post("/api/columns", json={"name": "Empty"})
+    bug = (
+        await client.post(
+            "/api/tags", json={"name": "Bug", "bg_color": "#ff0000", "fg_color": None}
+        )
+    ).json()["id"]
+    ux = (await client.post("/api/tags", json={"name": "UX ✨"})).json()["id"]
+    cards = [
+        {"title": "Plain"},
+        {
+            "title": 'Quotes " and \\ backslashes',
+            "description": "Tab\tnewline\nunit\u001fseparator line",
+            "image_url": "https://example.com/a.png?x=1&y=<2>",
+            "due_date": "2026-10-18T12:00:00",
+            "tag_ids": [ux, bug],
+        },
+        {"title": "Émoji 🚀 and 中文", "tag_ids": [bug]},
+        {"title": "Archived", "tag_ids": [bug]},
+    ]
+    ids = []
+    for data in cards:
+        resp = await client.post(f"/api/columns/{todo}/cards", json=data)
+        ids.append(resp.json()["id"])
+    await client.post(f"/api/cards/{ids[-1]}/archive")
+    async with TestSession() as db:
+        # Whole seconds serialize without a fraction
+        await db.execute(
+            update(Card)
+            .where(Card.id == ids[0])
+            .values(created_at=datetime(2026, 1, 2, 3, 4, 5))
+        )
+        await db.commit()
+
+
+@pytest.mark.anyio
+async def test_board_json_matches_schemas(client: AsyncClient, board):
+    resp = await client.get("/api/columns")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.content == await pydantic_board()
+    assert [len(col["cards"]) for col in resp.json()] == [3, 0, 0]
+
+
+@pytest.mark.anyio
+async def test_board_json_without_orjson(client: AsyncClient, board, monkeypatch):
+    monkeypatch.setattr(board_json, "orjson", None)
+    resp = await client.get("/api/columns")
+    assert resp.content == await pydantic_board()
+
+
+@pytest.mark.anyio
+async def test_board_json_keeps_etag(client: AsyncClient, board):
+    resp = await client.get("/api/columns")
+    assert resp.headers["cache-control"] == "no-cache"
+    resp = await client.get(
+        "/api/columns", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert resp.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_compact_board_refers_to_tag_table(client: AsyncClient, board):
+    full = (await client.get("/api/columns")).json()
+    resp = await client.get("/api/columns", params={"format": "compact"})
+    assert resp.status_code == 200
+    compact = resp.json()
+    tags = {tag["id"]: tag for tag in compact["tags"]}
+    assert [tag["name"] for tag in compact["tags"]] == ["Bug", "UX ✨"]
+
+    # Expanding the tag ids gives back the full board
+    for col in compact["columns"]:
+        for card in col["cards"]:
+            card["tags"] = [tags[tag_id] for tag_id in card.pop("tag_ids")]
+    assert compact["columns"] == full
+
+
+@pytest.mark.anyio
+async def test_sparse_card_fields(client: AsyncClient, board, query_counter):
+    query_counter.reset()
+    resp = await client.get(
+        "/api/columns", params={"format": "compact", "fields": "title, position"}
+    )
+    cards = resp.json()["columns"][0]["cards"]
+    assert [list(card) for card in cards] == [["id", "title", "position"]] * 3
+    assert [card["position"] for card in cards] == [0, 1, 2]
+    # Neither the unused columns nor card tags are read
+    sql = " ".join(statement for statement, _ in query_counter.statements)
+    assert "description" not in sql and "card_tags" not in sql
+
+    resp = await client.get("/api/columns", params={"fields": "id,tags"})
+    cards = resp.json()[0]["cards"]
+    assert [[tag["name"] for tag in card["tags"]] for card in cards] == [
+        [],
+        ["Bug", "UX ✨"],
+        ["Bug"],
+    ]
+
+
+@pytest.mark.anyio
+async def test_unknown_card_fields_are_rejected(client: AsyncClient, board):
+    resp = await client.get("/api/columns", params={"fields": "id,tag_ids"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Unknown card fields: tag_ids"
+
+
+@pytest.mark.anyio
+async def test_tags_json_matches_schema(client: AsyncClient, board):
+    async with TestSession() as db:
+        result = await db.execute(select(Tag).order_by(Tag.name))
+        adapter = TypeAdapter(list[TagOut])
+        expected = adapter.dump_json(
+            adapter.validate_python(result.scalars().all(), from_attributes=True)
+        )
+    assert (await client.get("/api/tags")).content == expected
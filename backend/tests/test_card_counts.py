@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy import insert, text
+
+from app import ranking
+from app.models import Card
+from app.seed import BoardSize
+from tests.conftest import TestSession, engine
+from tests.test_query_plans import exercise_routers
+from tests.test_seed import seed
+
+MISCOUNTED = text("""
+    SELECT id FROM columns WHERE card_count != (
+        SELECT count(*) FROM cards
+        WHERE cards.column_id = columns.id AND cards.is_archived = 0
+    )
+""")
+
+
+async def miscounted() -> list[str]:
+    async with engine.connect() as conn:
+        return (await conn.execute(MISCOUNTED)).scalars().all()
+
+
+@pytest.mark.anyio
+async def test_counts_follow_every_write(client: AsyncClient):
+    checked = []
+
+    async def check(response: Response):
+        if response.request.method != "GET":
+            checked.append((response.request.url.path, await miscounted()))
+
+    client.event_hooks["response"].append(check)
+    await exercise_routers(client)
+    assert checked
+    assert [(path, ids) for path, ids in checked if ids] == []
+
+
+@pytest.mark.anyio
+async def test_seed_counts_the_cards():
+    await seed(BoardSize(columns=3, cards_per_column=20, archive_ratio=0.25))
+    assert await miscounted() == []
+
+
+@pytest.mark.anyio
+async def test_append_cost_does_not_grow_with_the_column(client: AsyncClient):
+    short = (await client.post("/api/columns", json={"name": "Short"})).json()["id"]
+    long = (await client.post("/api/columns", json={"name": "Long"})).json()["id"]
+    async with TestSession() as db:
+        await db.execute(
+            insert(Card),
+            [
+                {"column_id": column_id, "title": "x", "rank": rank}
+                for column_id, n in ((short, 1), (long, 2000))
+                for rank in ranking.keys_after(None, n)
+            ],
+        )
+        await db.commit()
+
+    async def steps(column_id: str) -> tuple[int, int]:
+        """SQLite VM instructions an append runs, and the position it gets."""
+        count = 0
+
+        def progress():
+            nonlocal count
+            count += 1
+
+        async with TestSession() as db:
+            conn = await (await db.connection()).get_raw_connection()
+            await conn.driver_connection.set_progress_handler(progress, 1)
+            try:
+                _, position = await ranking.append_slot(db, column_id)
+            finally:
+                await conn.driver_connection.set_progress_handler(None, 1)
+        return count, position
+
+    (short_steps, short_position), (long_steps, long_position) = [
+        await steps(column_id) for column_id in (short, long)
+    ]
+    assert (short_position, long_position) == (1, 2000)
+    assert long_steps == short_steps
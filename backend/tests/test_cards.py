@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from tests.conftest import QueryCounter
+
 
 @pytest.fixture
 async def col_id(client: AsyncClient):
@@ -89,3 +91,43 @@ async def test_card_with_tags(client: AsyncClient, col_id: str):
     ).json()
     assert len(card["tags"]) == 1
     assert card["tags"][0]["name"] == "Bug"
+
+
+@pytest.mark.anyio
+async def test_append_cost_is_independent_of_column_size(
+    client: AsyncClient, col_id: str, query_counter: QueryCounter
+):
+    tag = (await client.post("/api/tags", json={"name": "Bug"})).json()
+    costs = []
+    existing = 0
+    for added in (0, 40):
+        for i in range(added):
+            await client.post(f"/api/columns/{col_id}/cards", json={"title": "x"})
+        existing += added
+
+        query_counter.reset()
+        card = (
+            await client.post(
+                f"/api/columns/{col_id}/cards",
+                json={"title": "New", "tag_ids": [tag["id"]]},
+            )
+        ).json()
+        create = (len(query_counter.statements), query_counter.loaded)
+        assert card["position"] == existing
+
+        await client.post(f"/api/cards/{card['id']}/archive")
+        query_counter.reset()
+        restored = (await client.post(f"/api/cards/{card['id']}/restore")).json()
+        restore = (len(query_counter.statements), query_counter.loaded)
+        assert restored["position"] == existing
+
+        query_counter.reset()
+        await client.post("/api/columns", json={"name": f"After {added}"})
+        create_column = (len(query_counter.statements), query_counter.loaded)
+        costs.append((create, restore, create_column))
+        existing += 1
+
+    # (statements issued, ORM rows loaded): never more than the card and its tag.
+    # Each count includes the board version bump, and appends the BEGIN taking
+    # the write lock.
+    assert costs[0] == costs[1] == ((8, 1), (8, 2), (6, 0))
@@ -0,0 +1,82 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def sync(client: AsyncClient, since: str | None = None, limit: int = 500):
+    params = {"limit": limit}
+    if since:
+        params["since"] = since
+    resp = await client.get("/api/changes", params=params)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.anyio
+async def test_changes_since_cursor(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    tag = (await client.post("/api/tags", json={"name": "Bug"})).json()
+    kept, dropped = [
+        (await client.post(f"/api/columns/{col['id']}/cards", json={"title": t})).json()
+        for t in ("Kept", "Dropped")
+    ]
+
+    full = await sync(client)
+    assert {c["title"] for c in full["cards"]} == {"Kept", "Dropped"}
+    assert [c["name"] for c in full["columns"]] == ["To Do"]
+    assert [t["name"] for t in full["tags"]] == ["Bug"]
+    assert full["deleted"] == []
+    assert not full["has_more"]
+
+    # Nothing new since the last sync
+    assert (await sync(client, full["cursor"]))["cards"] == []
+
+    await client.patch(f"/api/cards/{kept['id']}", json={"tag_ids": [tag["id"]]})
+    await client.delete(f"/api/cards/{dropped['id']}")
+    delta = await sync(client, full["cursor"])
+    assert [(c["id"], [t["name"] for t in c["tags"]]) for c in delta["cards"]] == [
+        (kept["id"], ["Bug"])
+    ]
+    assert delta["columns"] == delta["tags"] == []
+    assert delta["deleted"] == [{"entity": "card", "id": dropped["id"]}]
+
+
+@pytest.mark.anyio
+async def test_set_based_writes_are_logged(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    card = (
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+    ).json()
+    cursor = (await sync(client))["cursor"]
+
+    await client.delete(f"/api/columns/{col['id']}")
+    delta = await sync(client, cursor)
+    assert [(c["id"], c["is_archived"]) for c in delta["cards"]] == [(card["id"], True)]
+    assert delta["deleted"] == [{"entity": "column", "id": col["id"]}]
+
+    await client.post("/api/archive/clear")
+    delta = await sync(client, delta["cursor"])
+    assert delta["cards"] == []
+    assert delta["deleted"] == [{"entity": "card", "id": card["id"]}]
+
+
+@pytest.mark.anyio
+async def test_changes_are_paged(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    for i in range(5):
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": f"{i}"})
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await sync(client, cursor, limit=2)
+        seen += [c["title"] for c in page["cards"]]
+        cursor, pages = page["cursor"], pages + 1
+        if not page["has_more"]:
+            break
+    assert pages == 3
+    assert seen == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.anyio
+async def test_invalid_cursor(client: AsyncClient):
+    resp = await client.get("/api/changes", params={"since": "nope"})
+    assert resp.status_code == 400
@@ -66,3 +66,83 @@ async def test_reorder_columns(client: AsyncClient):
     assert data[0]["name"] == "C"
     assert data[1]["name"] == "A"
     assert data[2]["name"] == "B"
+
+
+@pytest.fixture
+async def long_column(client: AsyncClient):
+    col_id = (await client.post("/api/columns", json={"name": "Done"})).json()["id"]
+    await client.post("/api/columns", json={"name": "Empty"})
+    ids = []
+    for i in range(7):
+        card = await client.post(f"/api/columns/{col_id}/cards", json={"title": f"{i}"})
+        ids.append(card.json()["id"])
+    await client.post(f"/api/cards/{ids[2]}/archive")
+    return col_id
+
+
+@pytest.mark.anyio
+async def test_list_columns_with_card_limit(client: AsyncClient, long_column):
+    resp = await client.get("/api/columns", params={"card_limit": 3})
+    done, empty = resp.json()
+    assert [c["title"] for c in done["cards"]] == ["0", "1", "3"]
+    assert (done["card_count"], empty["card_count"]) == (6, 0)
+    assert done["next_cursor"] and empty["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_column_cards_pages_follow_the_board(
+    client: AsyncClient, long_column, query_counter
+):
+    board = (await client.get("/api/columns", params={"card_limit": 2})).json()
+    cards, cursor = board[0]["cards"], board[0]["next_cursor"]
+    query_counter.reset()
+    while cursor:
+        resp = await client.get(
+            f"/api/columns/{long_column}/cards",
+            params={"cursor": cursor, "limit": 3},
+        )
+        page = resp.json()
+        assert page["total"] == 6
+        cards += page["items"]
+        cursor = page["next_cursor"]
+
+    full = (await client.get("/api/columns")).json()
+    assert cards == full[0]["cards"]
+    assert [c["position"] for c in cards] == list(range(6))
+    # Pages seek and stop instead of reading the whole column
+    pages = [s for s, _ in query_counter.statements if "ORDER BY cards.rank" in s]
+    assert len(pages) == 2 and all("LIMIT" in s for s in pages)
+
+
+@pytest.mark.anyio
+async def test_column_cards_errors(client: AsyncClient, long_column):
+    resp = await client.get("/api/columns/missing/cards")
+    assert resp.status_code == 404
+    resp = await client.get(
+        f"/api/columns/{long_column}/cards", params={"cursor": "nope"}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_serialized_columns_never_load_archived_cards(
+    client: AsyncClient, query_counter
+):
+    col_id = (await client.post("/api/columns", json={"name": "Done"})).json()["id"]
+    ids = []
+    for i in range(21):
+        card = await client.post(f"/api/columns/{col_id}/cards", json={"title": f"{i}"})
+        ids.append(card.json()["id"])
+    for card_id in ids[1:]:
+        await client.post(f"/api/cards/{card_id}/archive")
+
+    query_counter.reset()
+    resp = await client.patch(f"/api/columns/{col_id}", json={"name": "Shipped"})
+    assert [c["title"] for c in resp.json()["cards"]] == ["0"]
+    # The column and its one active card
+    assert query_counter.loaded == 2
+
+    query_counter.reset()
+    resp = await client.put("/api/columns/reorder", json={"column_ids": [col_id]})
+    assert [c["title"] for c in resp.json()[0]["cards"]] == ["0"]
+    assert query_counter.loaded == 2
@@ -0,0 +1,150 @@
+import pytest
+from httpx import AsyncClient
+
+from app import card_ops
+from app.models import Card
+from tests.conftest import QueryCounter, TestSession
+
+
+@pytest.fixture
+async def card(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    return (
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+    ).json()
+
+
+@pytest.mark.anyio
+async def test_writes_bump_versions(client: AsyncClient, card):
+    assert card["version"] == 1
+    resp = await client.patch(f"/api/cards/{card['id']}", json={"title": "B"})
+    assert resp.json()["version"] == 2
+    resp = await client.post(f"/api/cards/{card['id']}/archive")
+    assert resp.json()["version"] == 3
+    resp = await client.post(f"/api/cards/{card['id']}/restore")
+    assert resp.json()["version"] == 4
+
+    col = (await client.get("/api/columns")).json()[0]
+    assert col["version"] == 1 and col["cards"][0]["version"] == 4
+    resp = await client.patch(f"/api/columns/{col['id']}", json={"name": "Doing"})
+    assert resp.json()["version"] == 2
+
+
+@pytest.mark.anyio
+async def test_update_checks_the_version_in_one_statement(
+    client: AsyncClient, card, query_counter: QueryCounter
+):
+    query_counter.reset()
+    resp = await client.patch(
+        f"/api/cards/{card['id']}", json={"title": "B", "version": 1}
+    )
+    assert resp.status_code == 200
+    statements = [sql for sql, _ in query_counter.statements]
+    update = next(i for i, sql in enumerate(statements) if "UPDATE cards" in sql)
+    assert "cards.version = ?" in statements[update]
+    # Nothing read the card before writing it
+    assert not any("FROM cards" in sql for sql in statements[:update])
+
+
+@pytest.mark.anyio
+async def test_stale_versions_are_rejected(client: AsyncClient, card):
+    url = f"/api/cards/{card['id']}"
+    await client.patch(url, json={"title": "First"})
+
+    resp = await client.patch(url, json={"title": "Second", "version": 1})
+    assert resp.status_code == 409
+    assert resp.headers["etag"] == '"2"'
+    resp = await client.patch(
+        url, json={"title": "Second"}, headers={"If-Match": '"1"'}
+    )
+    assert resp.status_code == 412
+    resp = await client.put(
+        "/api/cards/move",
+        json={
+            "card_id": card["id"],
+            "target_column_id": card["column_id"],
+            "position": 0,
+            "version": 1,
+        },
+    )
+    assert resp.status_code == 409
+    board = (await client.get("/api/columns")).json()
+    assert board[0]["cards"][0]["title"] == "First"
+
+    resp = await client.patch(
+        url, json={"title": "Second"}, headers={"If-Match": '"2"'}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Second"
+
+
+@pytest.mark.anyio
+async def test_column_if_match(client: AsyncClient, card):
+    url = f"/api/columns/{card['column_id']}"
+    resp = await client.patch(url, json={"name": "B"}, headers={"If-Match": '"2"'})
+    assert resp.status_code == 412
+    resp = await client.patch(url, json={"name": "B"}, headers={"If-Match": '"1"'})
+    assert resp.status_code == 200
+    resp = await client.patch(url, json={"name": "C"}, headers={"If-Match": "one"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_missing_rows_are_not_conflicts(client: AsyncClient):
+    resp = await client.patch("/api/cards/missing", json={"title": "B", "version": 1})
+    assert resp.status_code == 404
+    resp = await client.patch("/api/columns/missing", json={"name": "B"})
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_batch_conflict_rolls_back(client: AsyncClient, card):
+    resp = await client.post(
+        "/api/batch",
+        json={
+            "operations": [
+                {"op": "update", "card_id": card["id"], "data": {"title": "B"}},
+                {
+                    "op": "update",
+                    "card_id": card["id"],
+                    "data": {"title": "C", "version": 1},
+                },
+            ]
+        },
+    )
+    assert resp.status_code == 409
+    assert resp.json()["detail"]["index"] == 1
+    board = (await client.get("/api/columns")).json()
+    assert board[0]["cards"][0]["version"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("operation", ["archive", "restore"])
+async def test_archive_and_restore_never_reuse_a_version(
+    client: AsyncClient, card, operation: str
+):
+    url = f"/api/cards/{card['id']}"
+    if operation == "restore":
+        await client.post(f"{url}/archive")
+    version = (await client.get("/api/changes")).json()["cards"][0]["version"]
+
+    async with TestSession() as db:
+        # This session read the card before someone else updated it
+        loaded = await db.get(Card, card["id"])
+        assert loaded.version == version
+        resp = await client.patch(
+            url, json={"title": "B"}, headers={"If-Match": f'"{version}"'}
+        )
+        assert resp.json()["version"] == version + 1
+        if operation == "archive":
+            await card_ops.archive_card(db, card["id"])
+        else:
+            await card_ops.restore_card(db, card["id"])
+        await db.commit()
+
+    # The update's version no longer matches: the archive or restore came after
+    resp = await client.patch(
+        url, json={"title": "C"}, headers={"If-Match": f'"{version + 1}"'}
+    )
+    assert resp.status_code == 412
+    assert resp.headers["etag"] == f'"{version + 2}"'
@@ -0,0 +1,26 @@
+import pytest
+
+from app import cursors
+
+
+@pytest.mark.anyio
+async def test_round_trip():
+    cursor = cursors.encode({"seq": 12, "id": "a"})
+    assert "=" not in cursor
+    assert cursors.decode(cursor, seq=int) == {"seq": 12}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        cursors.encode({"other": 1}),
+        cursors.encode({"seq": "twelve"}),
+        cursors.encode({"seq": [1]}),
+        "WzFd",  # a JSON list
+    ],
+)
+async def test_anything_else_is_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        cursors.decode(cursor, seq=int)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import (
+    apply_pragmas,
+    checkpoint_periodically,
+    get_read_db,
+    read_only_url,
+)
+from app.main import app
+from tests.test_query_plans import exercise_routers
+
+
+@pytest.fixture
+async def file_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'board.db'}")
+    apply_pragmas(engine, settings.sqlite_pragmas)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_pragmas_applied_to_new_connections(file_engine):
+    async with file_engine.connect() as conn:
+        values = {
+            name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+            for name in settings.sqlite_pragmas
+        }
+    assert values == {
+        "busy_timeout": 5000,
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": 2,  # MEMORY
+    }
+
+
+@pytest.mark.anyio
+async def test_periodic_checkpoint_empties_the_wal(file_engine, tmp_path):
+    async with file_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x)"))
+        await conn.execute(text("INSERT INTO t VALUES (1)"))
+    wal = tmp_path / "board.db-wal"
+    assert os.path.getsize(wal) > 0
+
+    task = asyncio.create_task(checkpoint_periodically(file_engine, 0.01, "TRUNCATE"))
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if os.path.getsize(wal) == 0:
+                break
+    finally:
+        task.cancel()
+    assert os.path.getsize(wal) == 0
+
+
+@pytest.mark.anyio
+async def test_read_only_url():
+    url = read_only_url("sqlite+aiosqlite:///./taskflow.db")
+    assert (url.database, url.query) == (
+        "file:./taskflow.db",
+        {"mode": "ro", "uri": "true"},
+    )
+    assert read_only_url("sqlite+aiosqlite://") is None
+    assert read_only_url("postgresql+asyncpg://app@primary/board") is None
+    replica = read_only_url(
+        "postgresql+asyncpg://app@primary/board",
+        "postgresql+asyncpg://app@replica/board",
+    )
+    assert replica.host == "replica"
+
+
+@pytest.mark.anyio
+async def test_read_routes_use_read_only_sessions(client: AsyncClient, file_database):
+    # Every route but the writes goes through a connection that cannot write
+    await exercise_routers(client)
+    for path in ("/api/columns", "/api/tags", "/api/board-settings", "/api/archive"):
+        assert (await client.get(path)).status_code == 200
+    assert (await client.get("/api/search", params={"q": "x"})).status_code == 200
+    assert (await client.get("/api/changes")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_read_only_sessions_reject_writes(client: AsyncClient, file_database):
+    async for db in app.dependency_overrides[get_read_db]():
+        with pytest.raises(OperationalError, match="readonly"):
+            await db.execute(text("DELETE FROM cards"))
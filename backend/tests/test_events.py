@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.broadcast import Broadcaster, broadcaster
+from app.routers.events import event_stream
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+@pytest.mark.anyio
+async def test_routers_publish_events(client: AsyncClient):
+    with broadcaster.subscribe() as subscription:
+        col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+        other = (await client.post("/api/columns", json={"name": "Done"})).json()
+        card = (
+            await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+        ).json()
+        await client.patch(f"/api/cards/{card['id']}", json={"title": "B"})
+        await client.put(
+            "/api/cards/move",
+            json={
+                "card_id": card["id"],
+                "target_column_id": other["id"],
+                "position": 0,
+            },
+        )
+        await client.post(f"/api/cards/{card['id']}/archive")
+        await client.put(
+            "/api/columns/reorder", json={"column_ids": [other["id"], col["id"]]}
+        )
+        # Failed writes publish nothing
+        await client.patch("/api/cards/missing", json={"title": "C"})
+        events = drain(subscription)
+
+    assert [e.type for e in events] == [
+        "column.created",
+        "column.created",
+        "card.created",
+        "card.updated",
+        "card.moved",
+        "card.archived",
+        "columns.reordered",
+    ]
+    assert [e.id for e in events] == sorted(e.id for e in events)
+    moved = json.loads(events[4].data)
+    assert (moved["id"], moved["column_id"], moved["title"]) == (
+        card["id"],
+        other["id"],
+        "B",
+    )
+    assert json.loads(events[6].data) == {"column_ids": [other["id"], col["id"]]}
+
+
+@pytest.mark.anyio
+async def test_resume_from_last_event_id():
+    events = Broadcaster(history_size=3, queue_size=10)
+    published = [events.publish("card.deleted", {"id": str(i)}) for i in range(5)]
+
+    assert events.since(published[2].id) == published[3:]
+    assert events.since(published[-1].id) == []
+    # Evicted from the ring buffer, or from an earlier process
+    assert events.since(published[0].id) is None
+    assert events.since(published[-1].id + 1) is None
+
+
+@pytest.mark.anyio
+async def test_event_stream_replays_then_follows():
+    first = broadcaster.publish("tag.created", {"id": "1"})
+    second = broadcaster.publish("tag.deleted", {"id": "1"})
+
+    stream = event_stream(str(first.id))
+    assert await anext(stream) == "retry: 3000\n\n"
+    assert await anext(stream) == (
+        f'id: {second.id}\nevent: tag.deleted\ndata: {{"id":"1"}}\n\n'
+    )
+    live = broadcaster.publish("archive.cleared", {})
+    assert await anext(stream) == live.encode()
+    await stream.aclose()
+    assert not broadcaster.subscribers
+
+
+@pytest.mark.anyio
+async def test_event_stream_resets_unknown_clients():
+    broadcaster.publish("archive.cleared", {})
+    stream = event_stream("1")
+    await anext(stream)
+    assert await anext(stream) == (
+        f"id: {broadcaster.last_id}\nevent: reset\ndata: {{}}\n\n"
+    )
+    await stream.aclose()
+
+
+@pytest.mark.anyio
+async def test_slow_subscriber_is_disconnected():
+    events = Broadcaster(history_size=10, queue_size=2)
+    with events.subscribe() as subscription:
+        for i in range(3):
+            events.publish("card.deleted", {"id": str(i)})
+        assert subscription.lagged
+        assert drain(subscription) == [None]
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message
+
+from app import idempotency
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+@pytest.fixture
+async def column(client: AsyncClient):
+    return (await client.post("/api/columns", json={"name": "To Do"})).json()["id"]
+
+
+async def board_titles(client: AsyncClient) -> list[str]:
+    board = (await client.get("/api/columns")).json()
+    return [card["title"] for col in board for card in col["cards"]]
+
+
+@pytest.mark.anyio
+async def test_retry_replays_the_first_response(client: AsyncClient, column):
+    url = f"/api/columns/{column}/cards"
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post(url, json={"title": "A"}, headers=headers)
+    retry = await client.post(url, json={"title": "A"}, headers=headers)
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert retry.content == first.content
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert await board_titles(client) == ["A"]
+
+    # Without a key, or with another one, the request runs again
+    await client.post(url, json={"title": "A"})
+    await client.post(url, json={"title": "A"}, headers={"Idempotency-Key": "2"})
+    assert await board_titles(client) == ["A", "A", "A"]
+
+
+@pytest.mark.anyio
+async def test_concurrent_requests_with_one_key_run_once(
+    client: AsyncClient, file_database
+):
+    column = (await client.post("/api/columns", json={"name": "To Do"})).json()["id"]
+    url = f"/api/columns/{column}/cards"
+    headers = {"Idempotency-Key": "create-1"}
+    responses = await asyncio.gather(
+        *(client.post(url, json={"title": "A"}, headers=headers) for _ in range(2))
+    )
+    assert [r.status_code for r in responses] == [201, 201]
+    assert responses[0].content == responses[1].content
+    assert sum("idempotent-replayed" in r.headers for r in responses) == 1
+    assert await board_titles(client) == ["A"]
+
+
+@pytest.mark.anyio
+async def test_key_reused_for_another_request(client: AsyncClient, column):
+    url = f"/api/columns/{column}/cards"
+    headers = {"Idempotency-Key": "k"}
+    await client.post(url, json={"title": "A"}, headers=headers)
+    resp = await client.post(url, json={"title": "B"}, headers=headers)
+    assert resp.status_code == 422
+    resp = await client.patch(f"/api/columns/{column}", json={}, headers=headers)
+    assert resp.status_code == 422
+    assert await board_titles(client) == ["A"]
+
+
+@pytest.mark.anyio
+async def test_errors_are_replayed_too(client: AsyncClient):
+    headers = {"Idempotency-Key": "k"}
+    first = await client.post("/api/cards/missing/archive", headers=headers)
+    retry = await client.post("/api/cards/missing/archive", headers=headers)
+    assert (first.status_code, retry.status_code) == (404, 404)
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+@pytest.mark.anyio
+async def test_streamed_bodies_are_not_buffered():
+    chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+    runs = []
+
+    async def app(scope, receive, send):
+        # How many chunks the client had sent when the route saw the first one
+        received = []
+        while True:
+            message = await receive()
+            received.append(sent)
+            if not message["more_body"]:
+                break
+        runs.append(received)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+
+    middleware = IdempotencyMiddleware(app, streamed_paths=frozenset({"/stream"}))
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/stream",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", b"k")],
+    }
+
+    async def call(body: list[bytes]) -> list[Message]:
+        nonlocal sent
+        sent = 0
+        messages = []
+
+        async def receive():
+            nonlocal sent
+            sent += 1
+            more = sent < len(body)
+            return {"type": "http.request", "body": body[sent - 1], "more_body": more}
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware(scope, receive, send)
+        return messages
+
+    sent = 0
+    await call(chunks)
+    assert runs == [[1, 2, 3]]
+    # A retry is hashed chunk by chunk too, and replayed only if it matches
+    replayed = await call(chunks)
+    assert (b"idempotent-replayed", b"true") in replayed[0]["headers"]
+    assert replayed[1]["body"] == b"done"
+    assert (await call([b"a" * 10, b"x"]))[0]["status"] == 422
+    assert len(runs) == 1
+
+
+@pytest.mark.anyio
+async def test_store_is_bounded_and_expires():
+    store = IdempotencyStore(max_entries=2, ttl=60)
+    response = idempotency.StoredResponse(200, [], b"")
+    for key in "abc":
+        entry, first = store.claim(key, key)
+        assert first
+        store.complete(key, entry, response)
+    assert list(store.entries) == ["b", "c"]
+
+    expiring = IdempotencyStore(ttl=0)
+    entry, _ = expiring.claim("a", "a")
+    expiring.complete("a", entry, response)
+    assert expiring.claim("a", "a")[1]
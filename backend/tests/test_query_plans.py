@@ -0,0 +1,87 @@
+import json
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import QueryCounter, engine
+
+# A plan step that walks a whole hot table instead of searching an index
+TABLE_SCAN = re.compile(r"\bSCAN (cards|card_tags)\b")
+
+
+async def exercise_routers(client: AsyncClient):
+    col_a = (await client.post("/api/columns", json={"name": "A"})).json()["id"]
+    col_b = (await client.post("/api/columns", json={"name": "B"})).json()["id"]
+    tag = (await client.post("/api/tags", json={"name": "Bug"})).json()["id"]
+    card = (
+        await client.post(
+            f"/api/columns/{col_a}/cards", json={"title": "One", "tag_ids": [tag]}
+        )
+    ).json()["id"]
+    other = (
+        await client.post(f"/api/columns/{col_a}/cards", json={"title": "Two"})
+    ).json()["id"]
+
+    await client.get("/api/columns")
+    board = (await client.get("/api/columns", params={"card_limit": 1})).json()
+    await client.get(
+        f"/api/columns/{col_a}/cards", params={"cursor": board[0]["next_cursor"]}
+    )
+    await client.put(
+        "/api/cards/move",
+        json={"card_id": card, "target_column_id": col_b, "position": 0},
+    )
+    await client.patch(f"/api/cards/{card}", json={"title": "Uno", "tag_ids": []})
+    await client.get("/api/search", params={"q": "Tw"})
+    cursor = (await client.get("/api/changes")).json()["cursor"]
+    await client.post(f"/api/cards/{card}/archive")
+    await client.get("/api/archive")
+    await client.get("/api/archive", params={"q": "Uno"})
+    await client.post(f"/api/cards/{other}/archive")
+    page = (await client.get("/api/archive", params={"page_size": 1})).json()
+    await client.get(
+        "/api/archive", params={"page_size": 1, "cursor": page["next_cursor"]}
+    )
+    await client.get("/api/export")
+    await client.post(
+        "/api/import",
+        content=json.dumps({"type": "card", "column_id": col_b, "title": "Three"}),
+    )
+    await client.post(f"/api/cards/{other}/restore")
+    await client.post(f"/api/cards/{card}/restore")
+    await client.post(f"/api/cards/{card}/archive")
+    await client.post("/api/archive/restore-all")
+    await client.post(f"/api/cards/{card}/archive")
+    await client.post("/api/archive/clear")
+    await client.delete(f"/api/cards/{other}")
+    await client.delete(f"/api/tags/{tag}")
+    await client.delete(f"/api/columns/{col_a}")
+    await client.put("/api/columns/reorder", json={"column_ids": [col_b]})
+    await client.get("/api/changes", params={"since": cursor})
+
+
+@pytest.mark.anyio
+async def test_router_queries_use_indexes(
+    client: AsyncClient, query_counter: QueryCounter
+):
+    await exercise_routers(client)
+    statements = [
+        (sql, params)
+        for sql, params in query_counter.statements
+        if sql.lstrip().startswith(("SELECT", "UPDATE", "DELETE"))
+        and not isinstance(params, list)
+    ]
+    assert statements
+
+    scans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+            for row in plan:
+                if TABLE_SCAN.search(row.detail):
+                    scans.append((row.detail, " ".join(statement.split())))
+
+    assert not scans, "\n".join(f"{detail}: {sql}" for detail, sql in scans)
@@ -0,0 +1,201 @@
+import asyncio
+import random
+import sqlite3
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select, update
+
+from app import ranking
+from app.models import Card
+from tests.conftest import QueryCounter, TestSession
+
+
+@pytest.mark.anyio
+async def test_key_between_keeps_order():
+    rng = random.Random(7)
+    keys: list[str] = []
+    for _ in range(2000):
+        i = rng.randint(0, len(keys))
+        before = keys[i - 1] if i > 0 else None
+        after = keys[i] if i < len(keys) else None
+        key = ranking.key_between(before, after)
+        assert before is None or before < key
+        assert after is None or key < after
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+
+
+@pytest.mark.anyio
+async def test_appended_keys_stay_short():
+    keys = ranking.keys_after(None, 10_000)
+    assert keys == sorted(keys)
+    assert max(len(k) for k in keys) <= 4
+
+
+@pytest.mark.anyio
+async def test_key_between_rejects_unordered_bounds():
+    with pytest.raises(ValueError):
+        ranking.key_between("a5", "a5")
+
+
+@pytest.fixture
+async def board(client: AsyncClient):
+    cols = []
+    for name in ("A", "B"):
+        col = (await client.post("/api/columns", json={"name": name})).json()
+        cards = []
+        for i in range(4):
+            card = await client.post(
+                f"/api/columns/{col['id']}/cards", json={"title": f"{name}{i}"}
+            )
+            cards.append(card.json()["id"])
+        cols.append((col["id"], cards))
+    return cols
+
+
+async def column_titles(client: AsyncClient):
+    return {
+        col["name"]: [(c["title"], c["position"]) for c in col["cards"]]
+        for col in (await client.get("/api/columns")).json()
+    }
+
+
+@pytest.mark.anyio
+async def test_move_writes_only_the_moved_card(
+    client: AsyncClient, board, query_counter: QueryCounter
+):
+    (col_a, cards_a), (col_b, _) = board
+    query_counter.reset()
+    resp = await client.put(
+        "/api/cards/move",
+        json={"card_id": cards_a[0], "target_column_id": col_b, "position": 2},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["position"] == 2
+    assert query_counter.count("UPDATE cards") == 1
+
+    titles = await column_titles(client)
+    assert titles["A"] == [("A1", 0), ("A2", 1), ("A3", 2)]
+    assert titles["B"] == [("B0", 0), ("B1", 1), ("A0", 2), ("B2", 3), ("B3", 4)]
+
+
+@pytest.mark.anyio
+async def test_move_within_column(client: AsyncClient, board):
+    (col_a, cards_a), _ = board
+    await client.put(
+        "/api/cards/move",
+        json={"card_id": cards_a[0], "target_column_id": col_a, "position": 3},
+    )
+    await client.put(
+        "/api/cards/move",
+        json={"card_id": cards_a[3], "target_column_id": col_a, "position": 0},
+    )
+    titles = await column_titles(client)
+    assert [t for t, _ in titles["A"]] == ["A3", "A1", "A2", "A0"]
+
+
+@pytest.mark.anyio
+async def test_long_keys_rebalance_in_background(
+    client: AsyncClient, board, monkeypatch
+):
+    (col_a, cards_a), _ = board
+    monkeypatch.setattr(ranking, "MAX_KEY_LENGTH", 4)
+    # Keep dropping cards into the same gap, which grows the keys every move
+    for i in range(20):
+        await client.put(
+            "/api/cards/move",
+            json={
+                "card_id": cards_a[i % 2 + 2],
+                "target_column_id": col_a,
+                "position": 1,
+            },
+        )
+
+    async with TestSession() as db:
+        ranks = (
+            await db.execute(select(Card.rank).where(Card.column_id == col_a))
+        ).scalars()
+        assert max(len(r) for r in ranks) <= ranking.MAX_KEY_LENGTH
+    titles = await column_titles(client)
+    assert [p for _, p in titles["A"]] == [0, 1, 2, 3]
+
+
+@pytest.mark.anyio
+async def test_rebalance_locks_before_reading_the_order(
+    client: AsyncClient, file_database, tmp_path
+):
+    col = (await client.post("/api/columns", json={"name": "A"})).json()
+    for title in ("A0", "A1"):
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": title})
+
+    # Another connection tries to move a card right after the order was read
+    attempts = []
+
+    def concurrent_write(conn, cursor, statement, *args):
+        if statement.startswith("SELECT cards.id") and not attempts:
+            other = sqlite3.connect(tmp_path / "board.db", timeout=0)
+            try:
+                other.execute("UPDATE cards SET rank = 'Zz' WHERE title = 'A1'")
+                other.commit()
+                attempts.append("written")
+            except sqlite3.OperationalError:
+                attempts.append("locked")
+            finally:
+                other.close()
+
+    engine = file_database.kw["bind"].sync_engine
+    event.listen(engine, "after_cursor_execute", concurrent_write)
+    try:
+        async with file_database() as db:
+            await ranking.rebalance(db, col["id"])
+            await db.commit()
+    finally:
+        event.remove(engine, "after_cursor_execute", concurrent_write)
+    assert attempts == ["locked"]
+
+
+@pytest.mark.anyio
+async def test_concurrent_appends_get_distinct_ranks(
+    client: AsyncClient, file_database
+):
+    col = (await client.post("/api/columns", json={"name": "A"})).json()
+    responses = await asyncio.gather(
+        *[
+            client.post(f"/api/columns/{col['id']}/cards", json={"title": f"{i}"})
+            for i in range(8)
+        ]
+    )
+    assert sorted(resp.json()["position"] for resp in responses) == list(range(8))
+
+    async with file_database() as db:
+        ranks = (
+            await db.scalars(select(Card.rank).where(Card.column_id == col["id"]))
+        ).all()
+    assert len(set(ranks)) == 8
+    board = (await client.get("/api/columns")).json()
+    assert [card["position"] for card in board[0]["cards"]] == list(range(8))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("threshold", [0, 1000])
+async def test_positions_break_rank_ties_like_the_board(
+    client: AsyncClient, monkeypatch, threshold
+):
+    # Both ways of numbering cards: one window, or a count per card
+    monkeypatch.setattr(ranking, "WINDOW_THRESHOLD", threshold)
+    col = (await client.post("/api/columns", json={"name": "A"})).json()
+    for title in ("A", "B", "C"):
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": title})
+    async with TestSession() as db:
+        await db.execute(update(Card).values(rank="a0"))
+        await db.commit()
+
+    board = (await client.get("/api/columns")).json()
+    ids = [card["id"] for card in board[0]["cards"]]
+    async with TestSession() as db:
+        cards = (await db.scalars(select(Card).where(Card.id.in_(ids)))).all()
+        await ranking.assign_positions(db, cards)
+    assert {card.id: card.position for card in cards} == {
+        card_id: i for i, card_id in enumerate(ids)
+    }
@@ -0,0 +1,72 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.fixture
+async def col_id(client: AsyncClient):
+    resp = await client.post("/api/columns", json={"name": "To Do"})
+    return resp.json()["id"]
+
+
+@pytest.mark.anyio
+async def test_search_prefix_and_description(client: AsyncClient, col_id: str):
+    await client.post(
+        f"/api/columns/{col_id}/cards",
+        json={"title": "Deploy", "description": "Roll out the payments service"},
+    )
+    await client.post(f"/api/columns/{col_id}/cards", json={"title": "Payroll"})
+
+    resp = await client.get("/api/search", params={"q": "pay"})
+    assert resp.status_code == 200
+    titles = [c["title"] for c in resp.json()]
+    # Title hits rank above description hits
+    assert titles == ["Payroll", "Deploy"]
+    snippet = resp.json()[1]["snippet"]
+    assert snippet == "Roll out the <mark>payments</mark> service"
+
+
+@pytest.mark.anyio
+async def test_search_index_follows_updates(client: AsyncClient, col_id: str):
+    card = (
+        await client.post(f"/api/columns/{col_id}/cards", json={"title": "Alpha"})
+    ).json()
+    await client.patch(f"/api/cards/{card['id']}", json={"title": "Beta"})
+
+    assert (await client.get("/api/search", params={"q": "alpha"})).json() == []
+    assert len((await client.get("/api/search", params={"q": "beta"})).json()) == 1
+
+    await client.delete(f"/api/cards/{card['id']}")
+    assert (await client.get("/api/search", params={"q": "beta"})).json() == []
+
+
+@pytest.mark.anyio
+async def test_search_ignores_operators(client: AsyncClient, col_id: str):
+    await client.post(f"/api/columns/{col_id}/cards", json={"title": "Fix NEAR bug"})
+
+    resp = await client.get("/api/search", params={"q": 'near" ('})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+
+    resp = await client.get("/api/search", params={"q": "()*"})
+    assert resp.json() == []
+
+
+@pytest.mark.anyio
+async def test_archive_search_matches_description(client: AsyncClient, col_id: str):
+    card = (
+        await client.post(
+            f"/api/columns/{col_id}/cards",
+            json={"title": "Retro", "description": "Sprint retrospective notes"},
+        )
+    ).json()
+    await client.post(f"/api/columns/{col_id}/cards", json={"title": "Retro live"})
+    await client.post(f"/api/cards/{card['id']}/archive")
+
+    data = (await client.get("/api/archive", params={"q": "retrosp"})).json()
+    assert data["total"] == 1
+    assert data["items"][0]["id"] == card["id"]
+    assert "<mark>retrospective</mark>" in data["items"][0]["snippet"]
+
+    # Active cards never show up in the archive
+    data = (await client.get("/api/archive", params={"q": "live"})).json()
+    assert data["total"] == 0
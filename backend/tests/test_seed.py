@@ -0,0 +1,73 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.seed import BoardSize, bulk_seed
+from tests.conftest import engine
+
+
+async def seed(size: BoardSize):
+    async with engine.connect() as conn:
+        await conn.run_sync(bulk_seed, size)
+
+
+async def triggers() -> set[str]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        )
+        return set(result.scalars())
+
+
+@pytest.mark.anyio
+async def test_bulk_seed(client: AsyncClient):
+    before = await triggers()
+    size = BoardSize(columns=3, cards_per_column=40, tags=5, archive_ratio=0.25)
+    await seed(size)
+
+    board = (await client.get("/api/columns")).json()
+    assert [col["id"] for col in board] == ["col-0", "col-1", "col-2"]
+    active = sum(len(col["cards"]) for col in board)
+    archived = (await client.get("/api/archive")).json()["total"]
+    assert active + archived == size.cards
+    assert 0 < archived < size.cards / 2
+    card = board[0]["cards"][0]
+    assert card["id"].startswith("card-0-")
+    assert [card["position"] for card in board[0]["cards"]] == list(
+        range(len(board[0]["cards"]))
+    )
+    assert all(len(card["tags"]) == 2 for card in board[0]["cards"])
+
+    # The search index was rebuilt and the triggers are back in place
+    hits = (await client.get("/api/search", params={"q": card["title"]})).json()
+    assert card["id"] in {hit["id"] for hit in hits}
+    assert await triggers() == before
+    await client.patch(f"/api/cards/{card['id']}", json={"title": "Renamed"})
+    hits = (await client.get("/api/search", params={"q": "renamed"})).json()
+    assert [hit["id"] for hit in hits] == [card["id"]]
+
+
+@pytest.mark.anyio
+async def test_bulk_seed_replaces_the_board_in_the_change_log(client: AsyncClient):
+    await seed(BoardSize(columns=1, cards_per_column=3, tags=2))
+    first = (await client.get("/api/changes")).json()
+    assert len(first["cards"]) == 3
+    version = (await client.get("/api/columns")).headers["etag"]
+
+    await seed(BoardSize(columns=1, cards_per_column=2, tags=2))
+    delta = (await client.get("/api/changes", params={"since": first["cursor"]})).json()
+    assert len(delta["cards"]) == 2
+    assert delta["deleted"] == [{"entity": "card", "id": "card-0-2"}]
+    assert (await client.get("/api/columns")).headers["etag"] != version
+
+
+@pytest.mark.anyio
+async def test_bulk_seed_without_tags_or_columns(client: AsyncClient):
+    await seed(BoardSize(columns=2, cards_per_column=3, tags=0, archive_ratio=0))
+    board = (await client.get("/api/columns")).json()
+    assert [len(col["cards"]) for col in board] == [3, 3]
+    assert (await client.get("/api/tags")).json() == []
+
+    await seed(BoardSize(columns=0, tags=2))
+    assert (await client.get("/api/columns")).json() == []
+    assert len((await client.get("/api/tags")).json()) == 2
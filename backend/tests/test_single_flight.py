@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app import board_json
+from app.config import settings
+from app.single_flight import SingleFlight
+
+
+@pytest.fixture
+def slow_reads(monkeypatch):
+    """Count board and tag reads, and make them slow enough to overlap."""
+    calls = {"board": 0, "tags": 0}
+
+    def counted(name, read):
+        async def wrapper(*args, **kwargs):
+            calls[name] += 1
+            await asyncio.sleep(0.05)
+            return await read(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(board_json, "board", counted("board", board_json.board))
+    monkeypatch.setattr(board_json, "tags", counted("tags", board_json.tags))
+    return calls
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_reads_share_one_query(
+    client: AsyncClient, file_database, slow_reads
+):
+    await client.post("/api/columns", json={"name": "To Do"})
+    await client.post("/api/tags", json={"name": "Bug"})
+
+    boards = await asyncio.gather(*(client.get("/api/columns") for _ in range(10)))
+    tags = await asyncio.gather(*(client.get("/api/tags") for _ in range(10)))
+    assert slow_reads == {"board": 1, "tags": 1}
+    assert len({resp.content for resp in boards}) == 1
+    assert len({resp.content for resp in tags}) == 1
+    assert {resp.headers["etag"] for resp in boards + tags} == {
+        boards[0].headers["etag"]
+    }
+
+    # Different queries are different flights
+    await asyncio.gather(
+        client.get("/api/columns", params={"format": "compact"}),
+        client.get("/api/columns", params={"fields": "title"}),
+    )
+    assert slow_reads["board"] == 3
+
+
+@pytest.mark.anyio
+async def test_single_flight_is_configured_per_route(
+    client: AsyncClient, file_database, slow_reads, monkeypatch
+):
+    monkeypatch.setattr(settings, "single_flight_routes", ["columns"])
+    await asyncio.gather(*(client.get("/api/tags") for _ in range(3)))
+    assert slow_reads["tags"] == 3
+
+
+@pytest.mark.anyio
+async def test_followers_share_failures_and_take_over_cancelled_work():
+    flights = SingleFlight()
+    runs = 0
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flights.run("k", fail), flights.run("k", fail), return_exceptions=True
+    )
+    assert [str(r) for r in results] == ["boom", "boom"]
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return runs
+
+    leader = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert await follower == 2
+    assert not flights.flights
@@ -0,0 +1,266 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.broadcast import broadcaster
+from app.routers import transfer
+from tests.conftest import QueryCounter
+from tests.test_seed import triggers
+
+
+@pytest.fixture
+async def board(client: AsyncClient):
+    todo = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    done = (await client.post("/api/columns", json={"name": "Done"})).json()
+    bug = (await client.post("/api/tags", json={"name": "Bug"})).json()
+    api = (await client.post("/api/tags", json={"name": "API, v2"})).json()
+    cards = {}
+    for column, title in [(todo, "A"), (todo, "B"), (done, "C"), (todo, "Old")]:
+        resp = await client.post(
+            f"/api/columns/{column['id']}/cards", json={"title": title}
+        )
+        cards[title] = resp.json()
+    await client.patch(
+        f"/api/cards/{cards['B']['id']}", json={"tag_ids": [bug["id"], api["id"]]}
+    )
+    await client.post(f"/api/cards/{cards['Old']['id']}/archive")
+    return {"todo": todo, "done": done, "cards": cards}
+
+
+def records(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.anyio
+async def test_export_ndjson(client: AsyncClient, board):
+    resp = await client.get("/api/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["etag"] == (await client.get("/api/columns")).headers["etag"]
+
+    lines = records(resp.text)
+    assert [(r["type"], r.get("name") or r.get("title")) for r in lines] == [
+        ("column", "To Do"),
+        ("column", "Done"),
+        ("tag", "API, v2"),
+        ("tag", "Bug"),
+        ("card", "A"),
+        ("card", "B"),
+        ("card", "C"),
+        ("card", "Old"),
+    ]
+    cards = {r["title"]: r for r in lines if r["type"] == "card"}
+    assert [cards[t]["position"] for t in "ABC"] == [0, 1, 0]
+    assert cards["B"]["tags"] == ["API, v2", "Bug"]
+    assert cards["Old"]["is_archived"] and cards["Old"]["position"] is None
+    assert cards["A"]["column_id"] == board["todo"]["id"]
+    assert cards["A"]["created_at"] == board["cards"]["A"]["created_at"]
+
+
+@pytest.mark.anyio
+async def test_export_include(client: AsyncClient, board):
+    resp = await client.get("/api/export", params={"include": "archived"})
+    cards = [r["title"] for r in records(resp.text) if r["type"] == "card"]
+    assert cards == ["Old"]
+    resp = await client.get("/api/export", params={"include": "active"})
+    cards = [r["title"] for r in records(resp.text) if r["type"] == "card"]
+    assert cards == ["A", "B", "C"]
+
+    for include in ("", "deleted", "active,deleted"):
+        resp = await client.get("/api/export", params={"include": include})
+        assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_export_csv(client: AsyncClient, board):
+    resp = await client.get("/api/export", params={"format": "csv"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="board.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["title"] for row in rows] == ["A", "B", "C", "Old"]
+    assert rows[1]["tags"] == "API, v2; Bug"
+    assert rows[1]["is_archived"] == "false" and rows[1]["position"] == "1"
+    assert rows[3]["position"] == "" and rows[3]["archived_at"]
+
+
+@pytest.mark.anyio
+async def test_export_looks_up_tags_per_batch(
+    client: AsyncClient, board, monkeypatch, query_counter: QueryCounter
+):
+    monkeypatch.setattr(transfer, "EXPORT_BATCH", 2)
+    query_counter.reset()
+    resp = await client.get("/api/export")
+    assert len([r for r in records(resp.text) if r["type"] == "card"]) == 4
+    tag_lookups = [
+        sql for sql, _ in query_counter.statements if "FROM card_tags" in sql
+    ]
+    # Active cards A, B | C, then archived Old
+    assert len(tag_lookups) == 3
+
+
+@pytest.mark.anyio
+async def test_export_not_modified(client: AsyncClient, board):
+    resp = await client.get("/api/export")
+    resp = await client.get(
+        "/api/export", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert resp.status_code == 304
+
+
+def ndjson(*records) -> bytes:
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+
+@pytest.mark.anyio
+async def test_import(client: AsyncClient):
+    existing = (await client.post("/api/columns", json={"name": "Backlog"})).json()
+    await client.post(f"/api/columns/{existing['id']}/cards", json={"title": "Kept"})
+    bug = (await client.post("/api/tags", json={"name": "Bug"})).json()
+
+    body = ndjson(
+        {"type": "column", "id": "c1", "name": "Imported"},
+        {"type": "tag", "name": "Docs", "color": "green"},
+        {"type": "card", "column_id": "c1", "title": "One", "tags": ["Bug", "New"]},
+        {"type": "card", "column_id": "c1", "title": "Two", "tags": ["Docs"]},
+        {"type": "card", "column_id": existing["id"], "title": "Three"},
+        {
+            "type": "card",
+            "column_id": "c1",
+            "title": "Old",
+            "is_archived": True,
+            "archived_at": "2024-01-02T03:04:05",
+        },
+    )
+    resp = await client.post("/api/import", content=body)
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "lines": 6,
+        "columns": 1,
+        "tags": 2,
+        "cards": 4,
+        "error_count": 0,
+        "errors": [],
+    }
+
+    board = {col["name"]: col for col in (await client.get("/api/columns")).json()}
+    assert list(board) == ["Backlog", "Imported"]
+    assert [c["title"] for c in board["Backlog"]["cards"]] == ["Kept", "Three"]
+    one, two = board["Imported"]["cards"]
+    assert [one["title"], two["title"]] == ["One", "Two"]
+    assert [one["position"], two["position"]] == [0, 1]
+    assert [t["name"] for t in one["tags"]] == ["Bug", "New"]
+    assert one["tags"][0]["id"] == bug["id"]
+    assert two["tags"][0]["color"] == "green"
+    archive = (await client.get("/api/archive")).json()
+    assert [c["title"] for c in archive["items"]] == ["Old"]
+    # Imported cards are searchable like any other
+    hits = (await client.get("/api/search", params={"q": "Two"})).json()
+    assert [hit["id"] for hit in hits] == [two["id"]]
+
+
+@pytest.mark.anyio
+async def test_import_with_an_idempotency_key(client: AsyncClient):
+    body = ndjson(
+        {"type": "column", "id": "c1", "name": "Imported"},
+        {"type": "card", "column_id": "c1", "title": "One"},
+    )
+    headers = {"Idempotency-Key": "import-1"}
+    first = await client.post("/api/import", content=body, headers=headers)
+    retry = await client.post("/api/import", content=body, headers=headers)
+    assert (first.status_code, retry.status_code) == (200, 200)
+    assert retry.content == first.content
+    assert retry.headers["idempotent-replayed"] == "true"
+    board = (await client.get("/api/columns")).json()
+    assert [c["title"] for col in board for c in col["cards"]] == ["One"]
+
+    other = ndjson({"type": "card", "column_id": "c1", "title": "Two"})
+    resp = await client.post("/api/import", content=other, headers=headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_import_reports_bad_lines(client: AsyncClient):
+    body = (
+        ndjson({"type": "column", "id": "c1", "name": "A"})
+        + b"{not json\n\n"
+        + ndjson(
+            {"type": "card", "column_id": "nope", "title": "Lost"},
+            {"type": "card", "column_id": "c1"},
+            {"type": "board", "name": "?"},
+            {"type": "card", "title": "No column"},
+            {"type": "card", "id": "x", "column_id": "c1", "title": "First"},
+            {"type": "card", "id": "x", "column_id": "c1", "title": "Again"},
+        )
+    )
+    result = (await client.post("/api/import", content=body)).json()
+    assert result["cards"] == 1 and result["error_count"] == 6
+    errors = {error["line"]: error["error"] for error in result["errors"]}
+    assert list(errors) == [2, 4, 5, 6, 7, 9]
+    assert errors[4] == "Unknown column 'nope'"
+    assert errors[5].startswith("card.title")
+    assert errors[9] == "Card 'x' already exists"
+
+
+@pytest.mark.anyio
+async def test_import_round_trips_an_export(client: AsyncClient, board):
+    dump = (await client.get("/api/export")).content
+    # Everything is already there: columns are reused, cards are duplicates
+    result = (await client.post("/api/import", content=dump)).json()
+    assert result["columns"] == result["tags"] == result["cards"] == 0
+    assert result["error_count"] == 4
+
+    await client.post("/api/archive/clear")
+    for card in (await client.get("/api/columns")).json()[0]["cards"]:
+        await client.delete(f"/api/cards/{card['id']}")
+    result = (await client.post("/api/import", content=dump)).json()
+    assert result["error_count"] == 1 and result["cards"] == 3
+    assert (await client.get("/api/export")).text.count('"type":"card"') == 4
+
+
+@pytest.mark.anyio
+async def test_import_writes_in_batches(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(transfer, "IMPORT_BATCH", 2)
+    body = ndjson(
+        {"type": "column", "id": "c1", "name": "A"},
+        *({"type": "card", "column_id": "c1", "title": f"{i}"} for i in range(5)),
+    )
+    with broadcaster.subscribe() as subscription:
+        result = (await client.post("/api/import", content=body)).json()
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+    assert result["cards"] == 5
+    progress = [json.loads(e.data) for e in events if e.type == "import.progress"]
+    assert [p["cards"] for p in progress] == [2, 4, 5]
+    assert events[-1].type == "board.imported"
+
+    board = (await client.get("/api/columns")).json()
+    cards = board[0]["cards"]
+    assert [c["title"] for c in cards] == ["0", "1", "2", "3", "4"]
+    assert [c["position"] for c in cards] == list(range(5))
+
+
+@pytest.mark.anyio
+async def test_import_is_logged_and_restores_triggers(client: AsyncClient):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    cursor = (await client.get("/api/changes")).json()["cursor"]
+    before = await triggers()
+
+    body = ndjson(
+        {"type": "card", "id": "a", "column_id": col["id"], "title": "A"},
+        {"type": "card", "id": "b", "column_id": col["id"], "title": "B"},
+    )
+    await client.post("/api/import", content=body)
+    delta = (await client.get("/api/changes", params={"since": cursor})).json()
+    assert [card["id"] for card in delta["cards"]] == ["a", "b"]
+    assert await triggers() == before
+
+    # The triggers work again for ordinary writes
+    await client.patch("/api/cards/a", json={"title": "Renamed"})
+    hits = (await client.get("/api/search", params={"q": "renamed"})).json()
+    assert [hit["id"] for hit in hits] == ["a"]
+    delta = (await client.get("/api/changes", params={"since": delta["cursor"]})).json()
+    assert [card["id"] for card in delta["cards"]] == ["a"]
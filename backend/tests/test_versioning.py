@@ -0,0 +1,79 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+from app.models import BoardSettings
+from tests.conftest import QueryCounter, TestSession
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/api/columns", "/api/tags", "/api/board-settings"])
+async def test_etag_not_modified(client: AsyncClient, path: str):
+    first = await client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    resp = await client.get(path, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+
+@pytest.mark.anyio
+async def test_every_write_changes_the_etag(client: AsyncClient):
+    etags = [(await client.get("/api/columns")).headers["etag"]]
+
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    etags.append((await client.get("/api/columns")).headers["etag"])
+
+    card = (
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+    ).json()
+    etags.append((await client.get("/api/columns")).headers["etag"])
+
+    await client.patch(f"/api/cards/{card['id']}", json={"title": "B"})
+    etags.append((await client.get("/api/columns")).headers["etag"])
+
+    await client.post("/api/tags", json={"name": "Bug"})
+    etags.append((await client.get("/api/columns")).headers["etag"])
+
+    await client.patch("/api/board-settings", json={"title": "Ops"})
+    etags.append((await client.get("/api/columns")).headers["etag"])
+
+    assert len(set(etags)) == len(etags)
+
+    # Reads and failed writes leave it alone
+    await client.get("/api/archive")
+    await client.patch("/api/cards/missing", json={"title": "C"})
+    assert (await client.get("/api/columns")).headers["etag"] == etags[-1]
+
+
+@pytest.mark.anyio
+async def test_not_modified_skips_board_query(
+    client: AsyncClient, query_counter: QueryCounter
+):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    await client.post(f"/api/columns/{col['id']}/cards", json={"title": "A"})
+    etag = (await client.get("/api/columns")).headers["etag"]
+
+    query_counter.reset()
+    resp = await client.get("/api/columns", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert len(query_counter.statements) == 1
+    assert "board_state" in query_counter.statements[0][0]
+
+
+@pytest.mark.anyio
+async def test_recreated_settings_get_a_current_etag(client: AsyncClient):
+    async with TestSession() as db:
+        await db.execute(delete(BoardSettings))
+        await db.commit()
+
+    first = await client.get("/api/board-settings")
+    assert first.json()["title"] == "Development Pipeline"
+    # The ETag is that of the version the row was created in
+    assert first.headers["etag"] == (await client.get("/api/tags")).headers["etag"]
+    resp = await client.get(
+        "/api/board-settings", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert resp.status_code == 304
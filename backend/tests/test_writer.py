@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app import ranking, writer
+from app.models import BoardState
+
+
+@pytest.fixture
+async def write_queue(file_database):
+    writer.queue = writer.WriteQueue(file_database)
+    writer.queue.start()
+    yield writer.queue
+    await writer.queue.stop()
+    writer.queue = None
+
+
+async def board_version(sessions) -> int:
+    async with sessions() as db:
+        return (await db.execute(select(BoardState.version))).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_concurrent_writes_share_commits(
+    client: AsyncClient, file_database, write_queue
+):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    before = await board_version(file_database)
+
+    responses = await asyncio.gather(
+        *[
+            client.post(f"/api/columns/{col['id']}/cards", json={"title": f"{i}"})
+            for i in range(30)
+        ]
+    )
+    assert all(resp.status_code == 201 for resp in responses)
+    assert sorted(resp.json()["position"] for resp in responses) == list(range(30))
+    # Fewer transactions than requests
+    assert await board_version(file_database) - before < 30
+
+    board = (await client.get("/api/columns")).json()
+    assert len(board[0]["cards"]) == 30
+
+
+@pytest.mark.anyio
+async def test_failed_write_leaves_its_group_alone(client: AsyncClient, write_queue):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    requests = [
+        client.post(f"/api/columns/{col['id']}/cards", json={"title": f"{i}"})
+        for i in range(5)
+    ]
+    requests.insert(2, client.patch("/api/cards/missing", json={"title": "x"}))
+
+    responses = await asyncio.gather(*requests)
+    assert [resp.status_code for resp in responses] == [201, 201, 404, 201, 201, 201]
+    board = (await client.get("/api/columns")).json()
+    assert len(board[0]["cards"]) == 5
+
+
+@pytest.mark.anyio
+async def test_job_errors_reach_the_caller(write_queue):
+    async def fail(db):
+        raise ValueError("boom")
+
+    async def succeed(db):
+        return 42
+
+    results = await asyncio.gather(
+        write_queue.submit(fail), write_queue.submit(succeed), return_exceptions=True
+    )
+    assert isinstance(results[0], ValueError)
+    assert results[1] == 42
+
+
+@pytest.mark.anyio
+async def test_failed_job_of_a_cancelled_caller(write_queue):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def fail(db):
+        started.set()
+        await release.wait()
+        raise ValueError("boom")
+
+    async def succeed(db):
+        return 42
+
+    cancelled = asyncio.create_task(write_queue.submit(fail))
+    waiting = asyncio.create_task(write_queue.submit(succeed))
+    await started.wait()
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    # The failure has nobody to go to; the rest of the group still commits
+    assert await waiting == 42
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+@pytest.mark.anyio
+async def test_import_batches_share_groups(client: AsyncClient, write_queue):
+    # Imports swap out row triggers inside their batch; cards created in the
+    # same group must still be indexed
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    body = "".join(
+        json.dumps({"type": "card", "column_id": col["id"], "title": f"imported {i}"})
+        + "\n"
+        for i in range(20)
+    )
+    responses = await asyncio.gather(
+        client.post("/api/import", content=body),
+        *[
+            client.post(f"/api/columns/{col['id']}/cards", json={"title": f"typed {i}"})
+            for i in range(10)
+        ],
+    )
+    assert responses[0].json()["cards"] == 20
+    for query, count in [("imported", 20), ("typed", 10)]:
+        hits = (await client.get("/api/search", params={"q": query})).json()
+        assert len(hits) == count
+
+
+@pytest.mark.anyio
+async def test_background_rebalance_uses_the_queue(
+    client: AsyncClient, file_database, write_queue, monkeypatch
+):
+    col = (await client.post("/api/columns", json={"name": "To Do"})).json()
+    for i in range(3):
+        await client.post(f"/api/columns/{col['id']}/cards", json={"title": f"{i}"})
+
+    jobs = []
+    submit = write_queue.submit
+
+    async def counting_submit(job):
+        jobs.append(job)
+        return await submit(job)
+
+    monkeypatch.setattr(write_queue, "submit", counting_submit)
+    await ranking.rebalance_in_background(file_database.kw["bind"], col["id"])
+    assert len(jobs) == 1
+    board = (await client.get("/api/columns")).json()
+    assert [card["title"] for card in board[0]["cards"]] == ["0", "1", "2"]